@@ -0,0 +1,371 @@
+"""
+Benchmark de vazão e latência do pipeline de OCR.
+
+Reproduz um vídeo gravado (--video) ou um monitor sintético gerado na hora através do
+pipeline real do `TextRecognition` (captura em thread -> OCR -> consumidor), com um layout de
+ROIs fixo, sem câmera e somente em CPU. Reporta quadros/s, ROIs/s, a latência p50/p95/p99
+entre a captura do quadro e o fim do OCR (`capture_to_ocr_ms`), entre a captura do quadro mais
+novo de cada janela e a entrega da leitura aos sinks (`capture_to_reading_ms`) e entre o fim da
+janela de agregação e essa entrega (`window_to_sink_ms`), e grava o resultado em JSON para
+comparar modos do motor e detectar regressões.
+
+Com --compare-onnx, compara o reconhecedor do easyocr (torch) com o modelo int8 no ONNX Runtime
+sobre os mesmos recortes (exportando o modelo se o arquivo não existir): latência por recorte,
+acerto em relação ao texto desenhado (somente no vídeo sintético) e concordância entre os dois.
+
+Uso:
+    python3 engine/benchmark.py --engine-mode detect recognize --output bench.json
+    python3 engine/benchmark.py --video monitor.avi --layout layout.json
+    python3 engine/benchmark.py --compare-onnx recognizer_int8.onnx --intra-op-threads 4
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+import cv2
+import numpy as np
+
+from typing import Optional
+
+from ocr import OnnxRecognizer, TextRecognition, export_onnx_recognizer
+from common import RoiLayout
+from sinks import Sink
+from configurations.constants import (DEFAULT_DIGITS_ALLOWLIST, DEFAULT_ONNX_INTER_OP_THREADS,
+                                      DEFAULT_ONNX_INTRA_OP_THREADS, ENGINE_MODE_DETECT, ENGINE_MODES)
+
+SYNTHETIC_FRAME_SIZE = (640, 480)  # Largura, altura
+SYNTHETIC_FPS = 15.0
+SYNTHETIC_FONT = cv2.FONT_HERSHEY_SIMPLEX
+SYNTHETIC_COLOR = (0, 220, 0)
+
+
+def synthetic_layout() -> RoiLayout:
+    # Mesma ordem do assistente: unidade, valor principal, mínimo e máximo
+    return RoiLayout("HR", ((20, 20, 140, 70), (20, 120, 260, 150), (320, 120, 140, 70), (320, 220, 140, 70)))
+
+
+def render_monitor_frame(values, layout: RoiLayout, rng: np.random.Generator) -> np.ndarray:
+    """
+    Desenha um quadro de monitor sintético: texto verde sobre fundo escuro, com ruído de sensor.
+
+    Args:
+        values (List[str]): Texto de cada ROI do layout.
+        layout (RoiLayout): ROIs onde o texto é desenhado.
+        rng (np.random.Generator): Gerador do ruído.
+    Returns:
+        np.ndarray: Quadro BGR.
+    """
+    width, height = SYNTHETIC_FRAME_SIZE
+    frame = np.full((height, width, 3), 12, dtype=np.uint8)
+
+    for (x, y, w, h), text in zip(layout.rois, values):
+        scale = h / 40.0
+        thickness = max(1, int(scale * 2))
+        (text_width, text_height), _baseline = cv2.getTextSize(text, SYNTHETIC_FONT, scale, thickness)
+        origin = (x + max(0, (w - text_width) // 2), y + (h + text_height) // 2)
+        cv2.putText(frame, text, origin, SYNTHETIC_FONT, scale, SYNTHETIC_COLOR, thickness, cv2.LINE_AA)
+
+    noise = rng.normal(0.0, 2.0, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def write_synthetic_video(path: str, frame_count: int, layout: RoiLayout, seed=0) -> None:
+    """
+    Grava o vídeo sintético: frequência cardíaca variando a cada ~0,5 s e limites fixos.
+
+    Args:
+        path (str): Arquivo .avi de saída.
+        frame_count (int): Quantidade de quadros.
+        layout (RoiLayout): Layout usado para posicionar o texto.
+        seed (int): Semente do gerador pseudoaleatório.
+    """
+    rng = np.random.default_rng(seed)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), SYNTHETIC_FPS, SYNTHETIC_FRAME_SIZE)
+    heart_rate = 80
+
+    for index in range(frame_count):
+        if index % int(SYNTHETIC_FPS / 2) == 0:
+            heart_rate = int(np.clip(heart_rate + rng.integers(-3, 4), 45, 140))
+        writer.write(render_monitor_frame([layout.label, str(heart_rate), "50", "120"], layout, rng))
+
+    writer.release()
+
+
+class DeliveryTimer(Sink):
+    name = "benchmark"
+
+    def __init__(self):
+        """Mede, no momento da entrega, o atraso de cada leitura desde a captura e desde o fim da janela."""
+        self.capture_delays = []
+        self.window_delays = []
+
+    def handle(self, reading) -> None:
+        if reading.capture_time is not None:
+            self.capture_delays.append(time.monotonic() - reading.capture_time)
+        self.window_delays.append(time.time() - reading.timestamp)
+
+
+def percentiles(samples) -> dict:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    values = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "mean": float(values.mean()),
+            "max": float(values.max())}
+
+
+def run_benchmark(video_path: str, layout: RoiLayout, engine_mode=ENGINE_MODE_DETECT, **options) -> dict:
+    """
+    Executa o pipeline real em modo headless sobre o vídeo e coleta as métricas.
+
+    Args:
+        video_path (str): Vídeo reproduzido no FPS original.
+        layout (RoiLayout): Layout fixo de ROIs.
+        engine_mode (str): Modo do motor de OCR.
+        **options: Parâmetros adicionais do `TextRecognition` (batched, workers, ...).
+    Returns:
+        dict: Métricas do benchmark.
+    """
+    text_recognition = TextRecognition(video_path, engine_mode=engine_mode, realtime_replay=True, **options)
+    text_recognition.apply_layout(layout)
+
+    latencies = []
+    roi_count = [0]
+    cached_count = [0]
+    completion_times = []
+
+    def on_frame_result(frame_result):
+        now = time.monotonic()
+        completion_times.append(now)
+        if frame_result.capture_time is not None:
+            latencies.append(now - frame_result.capture_time)
+        roi_count[0] += len(frame_result.roi_results)
+        cached_count[0] += sum(1 for roi_result in frame_result.roi_results if roi_result.cached)
+
+    text_recognition.add_result_listener(on_frame_result)
+    delivery_timer = text_recognition.add_sink(DeliveryTimer())
+    # A reprodução só começa com o modelo carregado e aquecido: mede o regime, não a inicialização
+    if not text_recognition.wait_until_ready():
+        raise RuntimeError("OCR engine failed to load") from text_recognition.engine_error
+
+    started = time.monotonic()
+    # Na própria thread: uma exceção do pipeline interrompe o benchmark em vez de gerar um relatório vazio
+    text_recognition.run_headless()
+    elapsed = (completion_times[-1] if completion_times else time.monotonic()) - started
+
+    capture = text_recognition.video_capture
+    report = {
+        "engine_mode": engine_mode,
+        "options": options,
+        "rois": len(layout.rois),
+        "frames_captured": capture.grabbed_frames,
+        "frames_processed": len(completion_times),
+        "frames_dropped": capture.dropped_frames + text_recognition.frame_queue.dropped,
+        "elapsed_seconds": elapsed,
+        "frames_per_second": len(completion_times) / elapsed if elapsed > 0 else 0.0,
+        "rois_per_second": roi_count[0] / elapsed if elapsed > 0 else 0.0,
+        "cached_rois": cached_count[0],
+        "capture_to_ocr_ms": percentiles(latencies),
+        "capture_to_reading_ms": percentiles(delivery_timer.capture_delays),
+        "window_to_sink_ms": percentiles(delivery_timer.window_delays),
+        "change_detection": text_recognition.change_detection_stats(),
+        "sinks": text_recognition.sink_metrics(),
+        "startup_seconds": text_recognition.startup_report(),
+        "calibration": text_recognition.calibration_report(),
+    }
+    if text_recognition.result_cache is not None:
+        report["result_cache"] = text_recognition.result_cache.stats()
+    return report
+
+
+def fixture_crops(layout: RoiLayout, frame_count: int, video_path: Optional[str] = None, seed=0):
+    """
+    Recortes em tons de cinza dos ROIs de valor (todos menos o da unidade) para a comparação de backends.
+
+    Args:
+        layout (RoiLayout): Layout dos ROIs.
+        frame_count (int): Quadros lidos do vídeo ou gerados.
+        video_path (str): Vídeo gravado (padrão: monitor sintético com valores aleatórios).
+        seed (int): Semente do gerador pseudoaleatório.
+    Returns:
+        Tuple[List[np.ndarray], Optional[List[str]]]: Recortes e o texto esperado de cada um (None
+        para vídeo gravado, que não tem gabarito).
+    """
+    crops = []
+    if video_path is not None:
+        capture = cv2.VideoCapture(video_path)
+        while len(crops) < frame_count * (len(layout.rois) - 1):
+            ret, frame = capture.read()
+            if not ret:
+                break
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            crops.extend(gray[y:y + h, x:x + w] for x, y, w, h in layout.rois[1:])
+        capture.release()
+        return crops, None
+
+    rng = np.random.default_rng(seed)
+    truths = []
+    for _index in range(frame_count):
+        values = [str(int(value)) for value in (rng.integers(40, 180), rng.integers(30, 80), rng.integers(100, 160))]
+        gray = cv2.cvtColor(render_monitor_frame([layout.label] + values, layout, rng), cv2.COLOR_BGR2GRAY)
+        crops.extend(gray[y:y + h, x:x + w] for x, y, w, h in layout.rois[1:])
+        truths.extend(values[:len(layout.rois) - 1])
+    return crops, truths
+
+
+def compare_backends(crops, truths, onnx_model: str, intra_op_threads=DEFAULT_ONNX_INTRA_OP_THREADS,
+                     inter_op_threads=DEFAULT_ONNX_INTER_OP_THREADS, allowlist=DEFAULT_DIGITS_ALLOWLIST) -> dict:
+    """
+    Executa o reconhecedor do easyocr (torch) e o modelo ONNX int8 sobre os mesmos recortes.
+
+    Args:
+        crops (List[np.ndarray]): Recortes em tons de cinza.
+        truths (List[str]): Texto esperado de cada recorte (opcional).
+        onnx_model (str): Modelo ONNX; exportado do Reader se o arquivo não existir.
+        intra_op_threads (int): Threads por operação do ONNX Runtime.
+        inter_op_threads (int): Threads entre operações do ONNX Runtime.
+        allowlist (str): Caracteres permitidos nos dois backends.
+    Returns:
+        dict: Latência, acerto e confiança média de cada backend, e a concordância entre eles.
+    """
+    import easyocr
+    import torch
+
+    reader = easyocr.Reader(["en"], gpu=False)
+    if not os.path.exists(onnx_model):
+        export_onnx_recognizer(reader, onnx_model)
+    onnx_recognizer = OnnxRecognizer(onnx_model, allowlist, intra_op_threads, inter_op_threads)
+    backends = {
+        "torch": lambda crop: reader.recognize(crop, allowlist=allowlist),
+        "onnx": onnx_recognizer.readtext,
+    }
+
+    report = {
+        "crops": len(crops),
+        "onnx_model": onnx_model,
+        "onnx_model_bytes": os.path.getsize(onnx_model),
+        "threads": {"torch": torch.get_num_threads(), "onnx_intra_op": intra_op_threads,
+                    "onnx_inter_op": inter_op_threads},
+    }
+    texts = {}
+    for name, recognize in backends.items():
+        recognize(crops[0])  # Aquecimento
+        latencies = []
+        backend_texts = []
+        confidences = []
+        for crop in crops:
+            started = time.perf_counter()
+            results = recognize(crop)
+            latencies.append(time.perf_counter() - started)
+            backend_texts.append("".join(text for _bbox, text, _prob in results))
+            confidences.append(max((float(prob) for _bbox, _text, prob in results), default=0.0))
+
+        texts[name] = backend_texts
+        report[name] = {"latency_ms": percentiles(latencies), "mean_confidence": float(np.mean(confidences))}
+        if truths is not None:
+            report[name]["accuracy"] = float(np.mean([text == truth for text, truth in zip(backend_texts, truths)]))
+
+    report["agreement"] = float(np.mean([a == b for a, b in zip(texts["torch"], texts["onnx"])]))
+    report["speedup_p50"] = report["torch"]["latency_ms"]["p50"] / report["onnx"]["latency_ms"]["p50"]
+    return report
+
+
+def main(args):
+    output_path = os.path.abspath(args.output) if args.output else None
+    layout = RoiLayout.load(args.layout) if args.layout else synthetic_layout()
+
+    options = {"batched": not args.no_batch, "workers": args.workers}
+    if args.change_threshold is not None:
+        options["change_threshold"] = args.change_threshold
+    if args.result_cache_entries is not None:
+        options["result_cache_entries"] = args.result_cache_entries
+    if args.calibration_frames:
+        options["calibration_frames"] = args.calibration_frames
+    if args.contrast:
+        options["contrast"] = True
+    if args.binarize:
+        options["binarize"] = True
+
+    if args.compare_onnx:
+        crops, truths = fixture_crops(layout, args.frames, args.video, args.seed)
+        comparison = compare_backends(crops, truths, args.compare_onnx, args.intra_op_threads, args.inter_op_threads)
+        for name in ("torch", "onnx"):
+            latency = comparison[name]["latency_ms"]
+            print(f"[BENCH] {name}: latency p50={latency['p50']:.2f} p95={latency['p95']:.2f} ms, "
+                  f"accuracy={comparison[name].get('accuracy')}")
+        print(f"[BENCH] agreement={comparison['agreement']:.3f}, speedup p50={comparison['speedup_p50']:.2f}x")
+        write_results({
+            "fixture": args.video or f"synthetic:{args.frames}:seed={args.seed}",
+            "platform": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+            "timestamp": time.time(),
+            "comparison": comparison,
+        }, output_path)
+        return
+
+    reports = []
+    with tempfile.TemporaryDirectory() as workdir:
+        video_path = os.path.abspath(args.video) if args.video else os.path.join(workdir, "synthetic_monitor.avi")
+        if not args.video:
+            write_synthetic_video(video_path, args.frames, layout, args.seed)
+
+        # As leituras são gravadas em CSV no diretório atual: isola no diretório temporário
+        previous_directory = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for engine_mode in args.engine_mode:
+                report = run_benchmark(video_path, layout, engine_mode, **options)
+                reports.append(report)
+                latency = report["capture_to_ocr_ms"]
+                delivery = report["capture_to_reading_ms"]
+                print(f"[BENCH] {engine_mode}: {report['frames_per_second']:.2f} frames/s, "
+                      f"{report['rois_per_second']:.2f} ROIs/s, capture->OCR p50={latency['p50']} "
+                      f"p95={latency['p95']} p99={latency['p99']} ms, capture->reading p50={delivery['p50']} "
+                      f"p95={delivery['p95']} p99={delivery['p99']} ms")
+        finally:
+            os.chdir(previous_directory)
+
+    results = {
+        "fixture": args.video or f"synthetic:{args.frames}@{SYNTHETIC_FPS}fps:seed={args.seed}",
+        "platform": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "timestamp": time.time(),
+        "runs": reports,
+    }
+    write_results(results, output_path)
+
+
+def write_results(results: dict, output_path: Optional[str]) -> None:
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark de vazão e latência do pipeline de OCR')
+    parser.add_argument('--video', type=str, default=None, help='Vídeo gravado do monitor (padrão: sintético)')
+    parser.add_argument('--layout', type=str, default=None, help='Layout de ROIs (padrão: layout sintético)')
+    parser.add_argument('--frames', type=int, default=300, help='Quadros do vídeo sintético (padrão: 300)')
+    parser.add_argument('--seed', type=int, default=0, help='Semente do vídeo sintético (padrão: 0)')
+    parser.add_argument('--engine-mode', type=str, nargs='+', default=[ENGINE_MODE_DETECT], choices=ENGINE_MODES,
+                        help='Um ou mais modos do motor a comparar')
+    parser.add_argument('--workers', type=int, default=0, help='Processos dedicados ao OCR (padrão: 0)')
+    parser.add_argument('--no-batch', action='store_true', help='Desativa a detecção em lote dos ROIs')
+    parser.add_argument('--change-threshold', type=float, default=None, help='Limiar do detector de mudança')
+    parser.add_argument('--result-cache-entries', type=int, default=None, help='Entradas do cache (0 desativa)')
+    parser.add_argument('--calibration-frames', type=int, default=0,
+                        help='Recortes por ROI para escolher o backend mais rápido (padrão: 0, desativado)')
+    parser.add_argument('--compare-onnx', type=str, default=None,
+                        help='Compara torch e o modelo ONNX int8 deste arquivo (exportado se não existir)')
+    parser.add_argument('--intra-op-threads', type=int, default=DEFAULT_ONNX_INTRA_OP_THREADS,
+                        help='Threads por operação do ONNX Runtime (padrão: 0, automático)')
+    parser.add_argument('--inter-op-threads', type=int, default=DEFAULT_ONNX_INTER_OP_THREADS,
+                        help='Threads entre operações do ONNX Runtime (padrão: 1, sequencial)')
+    parser.add_argument('--contrast', action='store_true', help='Estica o contraste de cada ROI antes do OCR')
+    parser.add_argument('--binarize', action='store_true', help='Binariza cada ROI (Otsu) antes do OCR')
+    parser.add_argument('--output', type=str, default=None, help='Arquivo JSON de saída (padrão: stdout)')
+    main(parser.parse_args())
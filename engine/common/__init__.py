@@ -1,3 +1,11 @@
 from .geometrics import BasicGeometrics
 from .floating_rectangle import FloatingRectangle
-from .video_capture import VideoCapture
\ No newline at end of file
+from .video_capture import VideoCapture
+from .dropping_queue import DroppingQueue
+from .roi_layout import RoiLayout, RoiSettings
+from .layout_library import LayoutLibrary
+from .roi_layout_provider import RoiLayoutProvider, parse_layout
+from .stage_profiler import StageProfiler
+from .live_feed import LiveFeedServer, LiveFeedSubscriber
+from .window_aggregator import WindowAggregator, WindowRecord
+from .lazy_import import lazy_import
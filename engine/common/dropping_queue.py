@@ -0,0 +1,29 @@
+from queue import Empty, Full, Queue
+
+
+class DroppingQueue(Queue):
+
+    def __init__(self, maxsize=1):
+        """
+        Fila limitada que descarta o item mais antigo quando está cheia.
+
+        Usada entre os estágios do pipeline para que um consumidor lento nunca bloqueie o
+        produtor nem acumule memória: o produtor sempre entrega o dado mais recente.
+
+        Args:
+            maxsize (int): Capacidade máxima da fila.
+        """
+        super().__init__(maxsize=max(1, maxsize))
+        self.dropped = 0
+
+    def put_latest(self, item) -> None:
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except Full:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except Empty:
+                    pass
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import time
+
+from typing import List, Optional
+
+from configurations.constants import LAYOUT_LIBRARY_FORMAT
+from .roi_layout import RoiLayout
+
+
+class LayoutLibrary:
+
+    def __init__(self, path: str):
+        """
+        Arquivo de layouts salvos, um por modelo de câmera/monitor.
+
+        Formato (JSON): {"format": 1, "layouts": {modelo: {layout, "saved_at"}}}. Um arquivo com
+        um único `RoiLayout` (formato do `--layout`) é lido como o layout do modelo "default". A
+        gravação é atômica (arquivo temporário + rename), então uma queda no meio nunca deixa o
+        arquivo corrompido.
+
+        Args:
+            path (str): Caminho do arquivo.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._layouts = self.__load()
+
+    def __load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as library_file:
+            data = json.load(library_file)
+
+        if "rois" in data:  # Arquivo de um único layout
+            return {"default": data}
+        file_format = int(data.get("format", 0))
+        if file_format > LAYOUT_LIBRARY_FORMAT:
+            raise ValueError(f"Unsupported layout library format {file_format} in {self.path}; "
+                             f"expected <= {LAYOUT_LIBRARY_FORMAT}")
+        return dict(data.get("layouts", {}))
+
+    def __save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as library_file:
+            json.dump({"format": LAYOUT_LIBRARY_FORMAT, "layouts": self._layouts}, library_file, indent=4)
+        os.replace(temporary_path, self.path)
+
+    def models(self) -> List[str]:
+        with self._lock:
+            return sorted(self._layouts)
+
+    def get(self, model: str) -> Optional[RoiLayout]:
+        with self._lock:
+            data = self._layouts.get(model)
+        return RoiLayout.from_dict(data) if data is not None else None
+
+    def put(self, model: str, layout: RoiLayout) -> RoiLayout:
+        """
+        Salva o layout do modelo, com versão uma acima da versão salva anteriormente.
+
+        Returns:
+            RoiLayout: O layout com a versão gravada.
+        """
+        with self._lock:
+            previous = self._layouts.get(model)
+            if previous is not None:
+                layout = layout._replace(version=max(layout.version, int(previous.get("version", 0)) + 1))
+            data = layout.to_dict()
+            data["saved_at"] = time.time()
+            self._layouts[model] = data
+            self.__save()
+        return layout
+
+    def remove(self, model: str) -> bool:
+        with self._lock:
+            if self._layouts.pop(model, None) is None:
+                return False
+            self.__save()
+            return True
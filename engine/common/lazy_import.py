@@ -0,0 +1,33 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Importa um módulo de forma preguiçosa: o módulo só é executado no primeiro acesso a um atributo.
+
+    Usado para dependências pesadas (easyocr/torch) que não são necessárias para abrir a janela
+    e começar a capturar quadros.
+
+    O `LazyLoader` não é thread-safe antes do Python 3.12.3: duas threads acessando o módulo
+    pela primeira vez ao mesmo tempo podem ver o módulo ainda vazio (AttributeError). O primeiro
+    acesso deve acontecer em uma única thread (ex.: a thread de carga do motor).
+
+    Args:
+        name (str): Nome do módulo (ex.: "easyocr").
+    Returns:
+        module: Módulo que será carregado no primeiro uso.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
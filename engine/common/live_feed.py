@@ -0,0 +1,242 @@
+import json
+import socket
+import threading
+import http.client
+import urllib.parse
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty
+
+from configurations.constants import (DEFAULT_LIVE_FEED_CLIENT_BUFFER, DEFAULT_LIVE_FEED_HOST,
+                                      DEFAULT_LIVE_FEED_KEEPALIVE, DEFAULT_LIVE_FEED_PORT,
+                                      DEFAULT_LIVE_FEED_RECONNECT_DELAY, LIVE_FEED_PATH)
+from .dropping_queue import DroppingQueue
+
+
+class _EventStreamHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != LIVE_FEED_PATH:
+            self.send_error(404)
+            return
+
+        # Inscreve antes de responder: ao receber o 200, o cliente já recebe tudo o que for publicado
+        feed = self.server.feed
+        client = feed._subscribe()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            while feed.running:
+                try:
+                    data = client.get(timeout=feed.keepalive)
+                except Empty:
+                    # Comentário SSE: mantém a conexão viva e detecta clientes desconectados
+                    data = b": keepalive\n\n"
+                if data is None:  # Encerramento do servidor
+                    break
+                self.wfile.write(data)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            feed._unsubscribe(client)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LiveFeedServer:
+
+    def __init__(self, host=DEFAULT_LIVE_FEED_HOST, port=DEFAULT_LIVE_FEED_PORT,
+                 client_buffer=DEFAULT_LIVE_FEED_CLIENT_BUFFER, keepalive=DEFAULT_LIVE_FEED_KEEPALIVE):
+        """
+        Canal de envio das leituras em tempo real via Server-Sent Events (`GET /events`).
+
+        Cada cliente conectado tem sua própria fila limitada: um cliente lento perde as leituras
+        mais antigas em vez de atrasar o motor. `publish()` nunca bloqueia.
+
+        Args:
+            host (str): Endereço de escuta (padrão: somente localhost).
+            port (int): Porta de escuta (0 escolhe uma porta livre; ver `self.port`).
+            client_buffer (int): Eventos pendentes mantidos por cliente.
+            keepalive (float): Intervalo, em segundos, dos comentários de keep-alive.
+        """
+        self.client_buffer = client_buffer
+        self.keepalive = keepalive
+        self.published = 0
+        self.dropped = 0
+        self.running = False
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _EventStreamHandler)
+        self._server.daemon_threads = True
+        self._server.feed = self
+        self.host, self.port = self._server.server_address[:2]
+        self._server_thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{LIVE_FEED_PATH}"
+
+    def start(self) -> None:
+        if self._server_thread is not None:
+            return
+        self.running = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever)
+        self._server_thread.daemon = True
+        self._server_thread.start()
+
+    def publish(self, event: dict) -> None:
+        """
+        Envia um evento (serializado em JSON) a todos os clientes conectados.
+
+        Args:
+            event (dict): Leitura a enviar.
+        """
+        data = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+        with self._lock:
+            clients = list(self._clients)
+            self.published += 1
+        for client in clients:
+            client.put_latest(data)
+
+    def _subscribe(self) -> DroppingQueue:
+        client = DroppingQueue(maxsize=self.client_buffer)
+        with self._lock:
+            self._clients.add(client)
+        return client
+
+    def _unsubscribe(self, client: DroppingQueue) -> None:
+        with self._lock:
+            if client in self._clients:
+                self._clients.discard(client)
+                self.dropped += client.dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "published": self.published,
+                "dropped": self.dropped + sum(client.dropped for client in self._clients),
+            }
+
+    def close(self) -> None:
+        if not self.running:
+            self._server.server_close()
+            return
+        self.running = False
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.put_latest(None)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server_thread.join(timeout=1.0)
+        self._server_thread = None
+
+
+class LiveFeedSubscriber:
+
+    def __init__(self, url, on_event, reconnect_delay=DEFAULT_LIVE_FEED_RECONNECT_DELAY,
+                 keepalive=DEFAULT_LIVE_FEED_KEEPALIVE, on_connect=None):
+        """
+        Cliente do `LiveFeedServer`: recebe os eventos em uma thread e reconecta sozinho.
+
+        Args:
+            url (str): Endereço do canal (ex.: http://127.0.0.1:8765/events).
+            on_event (Callable[[dict], None]): Chamada com cada evento recebido.
+            reconnect_delay (float): Espera, em segundos, antes de tentar reconectar.
+            keepalive (float): Intervalo de keep-alive do servidor; sem dados por 2x esse tempo,
+                a conexão é considerada perdida.
+            on_connect (Callable[[], None]): Chamada a cada conexão aceita (ex.: recuperar do CSV o
+                que foi gravado enquanto estava desconectado). Roda em outra thread, já inscrita no
+                canal: os eventos recebidos nesse meio tempo ficam guardados e só são entregues a
+                `on_event` depois que ela termina.
+        """
+        self.url = url
+        self.on_event = on_event
+        self.on_connect = on_connect
+        self.reconnect_delay = reconnect_delay
+        self.keepalive = keepalive
+        self.connected = False
+        self.received = 0
+        self._stop = threading.Event()
+        self._socket = None
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.__listen)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __listen(self) -> None:
+        address = urllib.parse.urlsplit(self.url)
+        path = address.path or "/"
+        if address.query:
+            path += "?" + address.query
+
+        while not self._stop.is_set():
+            connection = http.client.HTTPConnection(address.hostname, address.port, timeout=self.keepalive * 2)
+            try:
+                connection.request("GET", path, headers={"Accept": "text/event-stream"})
+                # A resposta assume o socket; guarda a referência para `close()` poder interrompê-la
+                self._socket = connection.sock
+                response = connection.getresponse()
+                if response.status == 200:
+                    backfill = None
+                    if self.on_connect is not None:
+                        backfill = threading.Thread(target=self.on_connect)
+                        backfill.daemon = True
+                        backfill.start()
+                    self.connected = True
+                    self.__read_events(response, backfill)
+            except (OSError, ValueError, http.client.HTTPException):
+                pass
+            finally:
+                self.connected = False
+                self._socket = None
+                connection.close()
+            self._stop.wait(self.reconnect_delay)
+
+    def __read_events(self, response, backfill=None) -> None:
+        data_lines = []
+        pending = []  # Eventos recebidos enquanto `on_connect` ainda recupera o histórico
+        for raw_line in response:
+            if self._stop.is_set():
+                return
+            if backfill is not None and not backfill.is_alive():
+                # Histórico recuperado: entrega os eventos guardados, na ordem em que chegaram
+                backfill = None
+                for event in pending:
+                    self.on_event(event)
+                pending = []
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                # Linha em branco encerra o evento
+                event = json.loads("\n".join(data_lines))
+                data_lines = []
+                self.received += 1
+                if backfill is not None:
+                    pending.append(event)
+                else:
+                    self.on_event(event)
+
+    def close(self) -> None:
+        self._stop.set()
+        sock = self._socket
+        if sock is not None:
+            # Desbloqueia a leitura em andamento na thread do cliente
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
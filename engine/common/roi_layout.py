@@ -0,0 +1,64 @@
+import json
+
+from typing import NamedTuple, Tuple
+
+from configurations.constants import ROI_ROLES
+
+
+class RoiSettings(NamedTuple):
+    """
+    Configuração de um ROI: papel na leitura (unit, current, min, max) e motor de OCR dedicado
+    ("" usa o motor padrão do `TextRecognition`).
+    """
+    role: str = ""
+    engine: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoiSettings":
+        return cls(str(data.get("role", "")), str(data.get("engine", "")))
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class RoiLayout(NamedTuple):
+    """
+    Layout imutável de ROIs: rótulo da unidade e caixas (x, y, w, h) na ordem do assistente
+    (unidade, valor principal, mínimo e máximo), com a configuração opcional de cada ROI.
+    """
+    label: str
+    rois: Tuple[Tuple[int, int, int, int], ...]
+    version: int = 0
+    settings: Tuple[RoiSettings, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoiLayout":
+        rois = tuple(tuple(int(value) for value in roi) for roi in data.get("rois", []))
+        for roi in rois:
+            if len(roi) != 4:
+                raise ValueError(f"Invalid ROI {roi}: expected [x, y, w, h]")
+        settings = tuple(RoiSettings.from_dict(item) for item in data.get("settings", []))
+        if settings and len(settings) != len(rois):
+            raise ValueError(f"Invalid layout: {len(settings)} ROI settings for {len(rois)} ROIs")
+        return cls(str(data.get("label", "")), rois, int(data.get("version", 0)), settings)
+
+    def to_dict(self) -> dict:
+        data = {"label": self.label, "rois": [list(roi) for roi in self.rois], "version": self.version}
+        if self.settings:
+            data["settings"] = [settings.to_dict() for settings in self.settings]
+        return data
+
+    def roi_settings(self, index: int) -> RoiSettings:
+        """Configuração do ROI; sem configuração salva, o papel segue a ordem do assistente."""
+        if index < len(self.settings):
+            return self.settings[index]
+        return RoiSettings(ROI_ROLES[index] if index < len(ROI_ROLES) else "")
+
+    @classmethod
+    def load(cls, path: str) -> "RoiLayout":
+        with open(path, "r", encoding="utf-8") as layout_file:
+            return cls.from_dict(json.load(layout_file))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as layout_file:
+            json.dump(self.to_dict(), layout_file, indent=4)
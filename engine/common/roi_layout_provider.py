@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+import requests
+
+from icecream import ic
+from typing import Optional
+
+from configurations.constants import DEFAULT_LAYOUT_REFRESH_INTERVAL, DEFAULT_LAYOUT_REQUEST_TIMEOUT
+from .roi_layout import RoiLayout
+
+
+def parse_layout(data: dict, label: str = "") -> RoiLayout:
+    """
+    Converte a resposta do servidor em um `RoiLayout`.
+
+    Aceita o formato do próprio `RoiLayout` ({"label", "rois": [[x, y, w, h]], "version"}) e o
+    formato legado do servidor de ROIs ({id: {"x1", "y1", "x2", "y2"}}), cujos cantos opostos
+    são convertidos para (x, y, w, h).
+
+    Args:
+        data (dict): JSON recebido.
+        label (str): Rótulo usado quando a resposta não traz um.
+    """
+    if "rois" in data:
+        layout = RoiLayout.from_dict(data)
+        return layout if layout.label else layout._replace(label=label)
+
+    rois = []
+    for roi in data.values():
+        x1, y1, x2, y2 = (int(roi[key]) for key in ("x1", "y1", "x2", "y2"))
+        rois.append((min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1)))
+    return RoiLayout(label, tuple(rois))
+
+
+class RoiLayoutProvider:
+
+    def __init__(self, url: str, cache_path: Optional[str] = None, interval=DEFAULT_LAYOUT_REFRESH_INTERVAL,
+                 label="", timeout=DEFAULT_LAYOUT_REQUEST_TIMEOUT):
+        """
+        Layout de ROIs mantido por um servidor, revalidado em segundo plano.
+
+        O laço de processamento chama `current()` (uma leitura de referência, sem rede nem
+        trava) e recebe um `RoiLayout` imutável, que só é substituído quando a versão muda. A
+        revalidação usa GET condicional (ETag/If-None-Match), então um layout inalterado custa
+        uma resposta 304 vazia a cada `interval` segundos. O último layout recebido fica em
+        `cache_path` e é usado imediatamente na próxima inicialização, mesmo sem servidor.
+
+        Args:
+            url (str): Endereço do layout (ex.: http://127.0.0.1:8080/get_roi_data).
+            cache_path (str): Arquivo JSON do cache local (opcional).
+            interval (float): Intervalo de revalidação em segundos.
+            label (str): Rótulo da unidade quando o servidor não informa um.
+            timeout (float): Tempo máximo de cada requisição em segundos.
+        """
+        self.url = url
+        self.cache_path = cache_path
+        self.interval = interval
+        self.label = label
+        self.timeout = timeout
+        self.checks = 0
+        self.changes = 0
+        self.errors = 0
+        self.cache_errors = 0
+        self.last_error = None
+        self.last_check = None
+        self._layout = None
+        self._etag = None
+        self._session = requests.Session()
+        self._stop = threading.Event()
+        self._thread = None
+        self.__load_cache()
+
+    def current(self) -> Optional[RoiLayout]:
+        return self._layout
+
+    def start(self) -> None:
+        """
+        Inicia a revalidação em segundo plano. Sem layout em cache, a primeira busca é feita
+        antes de retornar, para o chamador já começar com um layout.
+        """
+        if self._thread is not None:
+            return
+        if self._layout is None:
+            self.refresh()
+        self._thread = threading.Thread(target=self.__revalidate)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __revalidate(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Consulta o servidor uma vez.
+
+        Returns:
+            bool: True se um novo layout foi publicado.
+        """
+        self.checks += 1
+        self.last_check = time.time()
+        headers = {"If-None-Match": self._etag} if self._etag and self._layout is not None else {}
+        try:
+            response = self._session.get(self.url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                return False
+            response.raise_for_status()
+            layout = parse_layout(response.json(), self.label)
+        except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as error:
+            # Mantém o layout atual; nova tentativa no próximo intervalo
+            self.errors += 1
+            self.last_error = repr(error)
+            return False
+
+        self._etag = response.headers.get("ETag")
+        return self.__publish(layout)
+
+    def __publish(self, layout: RoiLayout) -> bool:
+        current = self._layout
+        if current is not None and (layout.label, layout.rois, layout.settings) == \
+                (current.label, current.rois, current.settings) and layout.version <= current.version:
+            return False
+
+        if current is not None and layout.version <= current.version:
+            # O servidor não versiona o layout (ou repetiu a versão): numera localmente
+            layout = layout._replace(version=current.version + 1)
+        self._layout = layout  # Troca atômica da referência: o laço vê o layout antigo ou o novo, inteiro
+        self.changes += 1
+        self.__save_cache(layout)
+        return True
+
+    def __load_cache(self) -> None:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                cached = json.load(cache_file)
+            self._layout = RoiLayout.from_dict(cached["layout"])
+            self._etag = cached.get("etag")
+        except (OSError, ValueError, KeyError, TypeError):
+            self._layout = None
+            self._etag = None
+
+    def __save_cache(self, layout: RoiLayout) -> None:
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        temporary_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"etag": self._etag, "layout": layout.to_dict()}, cache_file, indent=4)
+            os.replace(temporary_path, self.cache_path)
+        except OSError as error:
+            # Disco cheio ou montagem somente leitura: o layout novo continua valendo em memória e
+            # a revalidação segue; só a próxima inicialização começa com o cache antigo
+            self.cache_errors += 1
+            self.last_error = repr(error)
+            ic(f"Falha ao gravar o cache de layout em {self.cache_path}: {error!r}")
+
+    def stats(self) -> dict:
+        layout = self._layout
+        return {
+            "version": layout.version if layout is not None else None,
+            "rois": len(layout.rois) if layout is not None else 0,
+            "checks": self.checks,
+            "changes": self.changes,
+            "errors": self.errors,
+            "cache_errors": self.cache_errors,
+            "last_error": self.last_error,
+            "last_check": self.last_check,
+        }
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1.0)
+            self._thread = None
+        self._session.close()
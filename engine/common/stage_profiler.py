@@ -0,0 +1,125 @@
+import threading
+import time
+import numpy as np
+
+from collections import deque
+
+from configurations.constants import DEFAULT_PROFILER_LOG_INTERVAL, DEFAULT_PROFILER_WINDOW
+
+
+class StageProfiler:
+
+    def __init__(self, enabled=False, window=DEFAULT_PROFILER_WINDOW, log_interval=DEFAULT_PROFILER_LOG_INTERVAL):
+        """
+        Medição de tempo por estágio do pipeline (e por ROI), com janelas deslizantes de amostras.
+
+        Uso no caminho crítico:
+            started = profiler.start()
+            ...
+            profiler.stop("detection", started, roi=index)
+
+        Desativado, `start()` devolve 0 e `stop()` retorna imediatamente, então o custo é de
+        duas chamadas de função por estágio.
+
+        Args:
+            enabled (bool): Ativa a coleta.
+            window (int): Quantidade de amostras mantidas por estágio/ROI.
+            log_interval (float): Intervalo em segundos entre as linhas de resumo no log.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.log_interval = log_interval
+        self._samples = {}  # (estágio, roi) -> deque de durações em nanossegundos
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._last_log = time.monotonic()
+
+    def start(self) -> int:
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, stage: str, started: int, roi=None) -> None:
+        if not started:
+            return
+        self.record(stage, time.perf_counter_ns() - started, roi)
+
+    def record(self, stage: str, elapsed_ns: int, roi=None) -> None:
+        if not self.enabled:
+            return
+        key = (stage, roi)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+                self._counts[key] = 0
+            samples.append(elapsed_ns)
+            self._counts[key] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Estatísticas atuais de cada estágio, agregando todos os ROIs, e de cada par estágio/ROI.
+
+        O histograma usa faixas de potência de 2 em microssegundos ("<=1us", "<=2us", ...).
+
+        Returns:
+            dict: {"stages": {estágio: estatísticas}, "rois": {estágio: {roi: estatísticas}}}.
+        """
+        with self._lock:
+            items = [(key, np.fromiter(samples, dtype=np.int64), self._counts[key])
+                     for key, samples in self._samples.items()]
+
+        stages = {}
+        rois = {}
+        for (stage, roi), samples, count in items:
+            if roi is not None:
+                rois.setdefault(stage, {})[roi] = self.__statistics(samples, count)
+            merged = stages.setdefault(stage, ([], 0))
+            stages[stage] = (merged[0] + [samples], merged[1] + count)
+
+        return {
+            "stages": {stage: self.__statistics(np.concatenate(parts), count)
+                       for stage, (parts, count) in stages.items()},
+            "rois": rois,
+        }
+
+    def __statistics(self, samples: np.ndarray, count: int) -> dict:
+        milliseconds = samples / 1e6
+        p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+
+        buckets = np.ceil(np.log2(np.maximum(samples / 1e3, 1.0))).astype(int)
+        edges, frequencies = np.unique(buckets, return_counts=True)
+        histogram = {f"<={2 ** int(edge)}us": int(frequency) for edge, frequency in zip(edges, frequencies)}
+
+        return {
+            "count": count,
+            "mean_ms": float(milliseconds.mean()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(milliseconds.max()),
+            "histogram": histogram,
+        }
+
+    def summary_line(self) -> str:
+        stages = self.snapshot()["stages"]
+        return " | ".join(f"{stage} p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms n={stats['count']}"
+                          for stage, stats in stages.items())
+
+    def maybe_log(self, log) -> None:
+        """
+        Emite a linha de resumo se o intervalo de log já passou.
+
+        Args:
+            log (Callable[[str], None]): Função que recebe a linha de resumo.
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last_log < self.log_interval:
+            return
+        self._last_log = now
+        log(self.summary_line())
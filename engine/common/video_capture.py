@@ -1,15 +1,174 @@
 import cv2
+import threading
+import time
+
+from collections import deque
+
+from configurations.constants import DEFAULT_CAPTURE_BUFFER_SIZE, DEFAULT_REPLAY_FPS
 
 
 class VideoCapture:
 
-    def __init__(self, source):
+    def __init__(self, source, threaded=False, buffer_size=DEFAULT_CAPTURE_BUFFER_SIZE, realtime=False):
+        """
+        Captura de vídeo com modo opcional em thread dedicada.
+
+        No modo threaded, uma thread de captura lê continuamente a fonte e mantém apenas os
+        quadros mais recentes (anel de `buffer_size` quadros com timestamp), de forma que a
+        latência da captura não dependa da velocidade do OCR. A thread é iniciada na primeira
+        leitura (ou por `start()`). Sem o modo threaded, `read_latest` e `wait_for_frame` leem a
+        fonte diretamente, na thread de quem chama.
+
+        Args:
+            source (int | str): Índice da câmera, arquivo ou URL do stream.
+            threaded (bool): Ativa a thread de captura em segundo plano.
+            buffer_size (int): Quantidade de quadros mantidos no anel (modo threaded).
+            realtime (bool): Reproduz arquivos gravados no FPS original em vez de decodificar o
+                mais rápido possível (modo threaded).
+        """
         self.cap = cv2.VideoCapture(source)
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.threaded = threaded
+        self.realtime = realtime
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_REPLAY_FPS
+        self.dropped_frames = 0
+        self.grabbed_frames = 0
+        self.frame_id = 0
+        self._frames = deque(maxlen=max(1, buffer_size))
+        self._consumed_id = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._grabber_thread = None
+        self._grabber_done = False  # A thread de captura saiu do laço e não usa mais `cap`
+        self._release_on_exit = False  # release() expirou: a própria thread libera `cap` ao sair
+
+    def start(self):
+        if not self.threaded or self._grabber_thread is not None:
+            return
+        self._running = True
+        self._grabber_thread = threading.Thread(target=self.__grab_frames)
+        self._grabber_thread.daemon = True
+        self._grabber_thread.start()
+
+    def __grab_frames(self):
+        try:
+            self.__grab_loop()
+        finally:
+            with self._condition:
+                # Fim do arquivo, falha do stream ou release(): libera quem estiver aguardando
+                self._running = False
+                self._grabber_done = True
+                self._condition.notify_all()
+                if self._release_on_exit:
+                    self.cap.release()
+
+    def __grab_loop(self):
+        replay_start = time.monotonic()
+        while self._running:
+            if self.realtime:
+                # Aguarda o instante do próximo quadro no FPS original do arquivo
+                delay = replay_start + self.grabbed_frames / self.fps - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+
+            timestamp = time.monotonic()
+            with self._condition:
+                # O quadro anterior nunca foi lido pelo consumidor: contabiliza como descartado
+                if self.frame_id > self._consumed_id:
+                    self.dropped_frames += 1
+                self.frame_id += 1
+                self.grabbed_frames += 1
+                self._frames.append((self.frame_id, timestamp, frame))
+                self._condition.notify_all()
+
+    def __read_direct(self):
+        # Modo sem thread: cada leitura é um quadro novo, lido na hora
+        ret, frame = self.cap.read()
+        if not ret:
+            return None
+        timestamp = time.monotonic()
+        with self._condition:
+            self.frame_id += 1
+            self.grabbed_frames += 1
+            self._consumed_id = self.frame_id
+            self._frames.append((self.frame_id, timestamp, frame))
+            return self.frame_id, timestamp, frame
 
     def read(self):
-        return self.cap.read()
+        if not self.threaded:
+            return self.cap.read()
+
+        ret, frame, _timestamp = self.read_latest()
+        return ret, frame
+
+    def read_latest(self):
+        """
+        Retorna o quadro mais recente sem bloquear.
+
+        Returns:
+            Tuple[bool, np.ndarray, float]: Sucesso, quadro e timestamp (time.monotonic) da captura.
+        """
+        if not self.threaded:
+            captured = self.__read_direct()
+            return (False, None, None) if captured is None else (True, captured[2], captured[1])
+
+        self.start()
+        with self._condition:
+            if not self._frames:
+                return False, None, None
+            frame_id, timestamp, frame = self._frames[-1]
+            self._consumed_id = frame_id
+        return True, frame, timestamp
+
+    def wait_for_frame(self, last_frame_id=0, timeout=None):
+        """
+        Aguarda (sem espera ativa) até existir um quadro mais novo que `last_frame_id`.
+
+        Args:
+            last_frame_id (int): Último identificador de quadro já processado.
+            timeout (float): Tempo máximo de espera em segundos.
+        Returns:
+            Tuple[int, float, np.ndarray] | None: Identificador, timestamp e quadro, ou None.
+        """
+        if not self.threaded:
+            return self.__read_direct()
+
+        self.start()
+        with self._condition:
+            self._condition.wait_for(lambda: self.frame_id > last_frame_id or not self._running, timeout)
+            if self.frame_id <= last_frame_id or not self._frames:
+                return None
+            frame_id, timestamp, frame = self._frames[-1]
+            self._consumed_id = frame_id
+        return frame_id, timestamp, frame
+
+    def frames(self):
+        """
+        Retorna uma cópia do anel de quadros, do mais antigo para o mais recente.
+
+        Returns:
+            List[Tuple[int, float, np.ndarray]]: Identificador, timestamp e quadro.
+        """
+        with self._condition:
+            return list(self._frames)
+
+    def is_running(self):
+        return self._running if self.threaded else self.cap.isOpened()
 
     def release(self):
+        self._running = False
+        if self._grabber_thread is not None:
+            self._grabber_thread.join(timeout=1.0)
+            self._grabber_thread = None
+            with self._condition:
+                if not self._grabber_done:
+                    # A thread ainda está dentro de cap.read() (ex.: stream travado): liberar `cap` agora
+                    # concorreria com a leitura; ela mesma libera ao sair
+                    self._release_on_exit = True
+                    return
         self.cap.release()
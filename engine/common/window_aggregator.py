@@ -0,0 +1,131 @@
+import math
+import time
+
+from typing import List, NamedTuple, Optional
+
+from configurations.constants import DEFAULT_AGGREGATION_WINDOW
+
+
+class WindowRecord(NamedTuple):
+    """
+    Resumo das leituras de uma unidade em uma janela de tempo [start, end).
+
+    `capture_time` é o instante da captura (time.monotonic) do quadro mais novo da janela, ou None
+    se as leituras não informaram a captura.
+    """
+    unit: str
+    start: float
+    end: float
+    last: float
+    minimum: float
+    maximum: float
+    mean: float
+    count: int
+    capture_time: Optional[float] = None
+
+
+class _UnitWindow:
+
+    def __init__(self, value: float, capture_time: Optional[float]):
+        self.last = self.minimum = self.maximum = self.total = value
+        self.count = 1
+        self.capture_time = capture_time
+
+    def add(self, value: float, capture_time: Optional[float]) -> None:
+        self.last = value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.total += value
+        self.count += 1
+        if capture_time is not None:
+            self.capture_time = capture_time if self.capture_time is None else max(self.capture_time, capture_time)
+
+
+class WindowAggregator:
+
+    def __init__(self, window=DEFAULT_AGGREGATION_WINDOW, clock=time.time):
+        """
+        Agrega as leituras por unidade em janelas de tempo fixas, alinhadas ao relógio.
+
+        Em vez de processar cada leitura individualmente, o consumidor acrescenta tudo o que
+        estiver disponível e só emite um `WindowRecord` por unidade quando a janela fecha. A
+        memória é de um acumulador por unidade e a latência é no máximo de uma janela,
+        independente da taxa do OCR.
+
+        Args:
+            window (float): Duração da janela em segundos.
+            clock (Callable[[], float]): Relógio usado para alinhar as janelas.
+        """
+        self.window = window
+        self.clock = clock
+        self.readings = 0
+        self.records = 0
+        self._window_start = None
+        self._units = {}  # unidade -> _UnitWindow
+
+    def __align(self, timestamp: float) -> float:
+        return timestamp - timestamp % self.window
+
+    def add(self, unit_name: str, value: float, timestamp: Optional[float] = None,
+            capture_time: Optional[float] = None) -> List[WindowRecord]:
+        """
+        Acrescenta uma leitura à janela corrente.
+
+        Args:
+            unit_name (str): Nome da unidade.
+            value (float): Valor lido; valores não finitos são ignorados.
+            timestamp (float): Instante da leitura (padrão: agora).
+            capture_time (float): Instante da captura do quadro lido (time.monotonic), opcional.
+        Returns:
+            List[WindowRecord]: Registros da janela anterior, se a leitura pertence a uma janela nova.
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        closed = self.close_due(timestamp)
+        if value is None or not math.isfinite(value):
+            return closed
+
+        if self._window_start is None:
+            self._window_start = self.__align(timestamp)
+        unit = self._units.get(unit_name)
+        if unit is None:
+            self._units[unit_name] = _UnitWindow(value, capture_time)
+        else:
+            unit.add(value, capture_time)
+        self.readings += 1
+        return closed
+
+    def time_until_close(self, now: Optional[float] = None) -> Optional[float]:
+        """Segundos até o fechamento da janela corrente, ou None se não houver leituras pendentes."""
+        if self._window_start is None:
+            return None
+        now = self.clock() if now is None else now
+        return max(self._window_start + self.window - now, 0.0)
+
+    def close_due(self, now: Optional[float] = None) -> List[WindowRecord]:
+        """Fecha a janela corrente se o seu tempo já acabou."""
+        now = self.clock() if now is None else now
+        if self._window_start is None or now < self._window_start + self.window:
+            return []
+        return self.flush()
+
+    def flush(self) -> List[WindowRecord]:
+        """Fecha a janela corrente imediatamente (ex.: no encerramento)."""
+        if self._window_start is None:
+            return []
+
+        start, end = self._window_start, self._window_start + self.window
+        records = [WindowRecord(unit_name, start, end, unit.last, unit.minimum, unit.maximum,
+                                unit.total / unit.count, unit.count, unit.capture_time)
+                   for unit_name, unit in self._units.items()]
+        self._units = {}
+        self._window_start = None
+        self.records += len(records)
+        return records
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "readings": self.readings,
+            "records": self.records,
+            "pending_units": len(self._units),
+        }
@@ -1,3 +1,95 @@
 # Colors
 DEAFULT_COLOR_DETECTION_RECTANGLE = (25, 220, 255)
 DEFAULT_COLOR_DETECTION_TEXT = (0, 220, 0)
+DEFAULT_COLOR_ERROR_TEXT = (0, 0, 255)
+
+# Video Capture
+DEFAULT_CAPTURE_BUFFER_SIZE = 1
+DEFAULT_REPLAY_FPS = 30.0
+
+# Pipeline
+DEFAULT_FRAME_QUEUE_SIZE = 1
+DEFAULT_EVENT_QUEUE_SIZE = 256
+
+# Change Detection
+DEFAULT_CHANGE_THRESHOLD = 4.0  # Diferença absoluta média em níveis de cinza (0-255)
+DEFAULT_CHANGE_SIGNATURE_SIZE = (32, 16)  # Largura, altura
+
+# OCR Result Cache
+DEFAULT_RESULT_CACHE_ENTRIES = 4096
+DEFAULT_RESULT_CACHE_BYTES = 8 * 1024 * 1024
+DEFAULT_FINGERPRINT_BITS = 3
+
+# OCR Engine Modes
+ENGINE_MODE_DETECT = "detect"  # Detector CRAFT + reconhecedor em cada ROI
+ENGINE_MODE_RECOGNIZE = "recognize"  # Cada ROI é tratado como uma linha de texto conhecida, sem detecção
+ENGINE_MODES = (ENGINE_MODE_DETECT, ENGINE_MODE_RECOGNIZE)
+DEFAULT_DIGITS_ALLOWLIST = "0123456789.,-/:%"
+
+# Stage Profiler
+DEFAULT_PROFILER_WINDOW = 512  # Amostras por estágio/ROI
+DEFAULT_PROFILER_LOG_INTERVAL = 10.0  # Segundos
+
+# Reading Writer
+DEFAULT_WRITER_MAX_ROWS = 64
+DEFAULT_WRITER_MAX_DELAY = 1.0  # Segundos
+
+# Time Series Store
+DEFAULT_ROLLUP_INTERVALS = (15, 30, 60, 1800, 3600, 10800, 21600, 43200, 86400)  # 15s ... 24h
+
+# Real-time Plotter
+DEFAULT_PLOT_HISTORY_CAPACITY = 86400  # Pontos por unidade (24 h a 1 leitura/s)
+DEFAULT_PLOT_RETENTION_SECONDS = None  # Janela exibida em segundos (None: todo o histórico mantido)
+DEFAULT_PLOT_MAX_POINTS = 1000  # Pontos por traço após a redução (LTTB/min-max)
+
+# Live Feed (Server-Sent Events)
+DEFAULT_LIVE_FEED_HOST = "127.0.0.1"
+DEFAULT_LIVE_FEED_PORT = 8765
+LIVE_FEED_PATH = "/events"
+DEFAULT_LIVE_FEED_CLIENT_BUFFER = 1024  # Eventos pendentes por cliente
+DEFAULT_LIVE_FEED_KEEPALIVE = 15.0  # Segundos
+DEFAULT_LIVE_FEED_RECONNECT_DELAY = 2.0  # Segundos
+DEFAULT_PLOT_REFRESH_INTERVAL_MS = 250  # Atualização do gráfico quando há dados novos
+
+# Window Aggregator
+DEFAULT_AGGREGATION_WINDOW = 1.0  # Segundos; uma linha por unidade a cada janela
+
+# Result Bus
+DEFAULT_SINK_BUFFER_SIZE = 1024  # Leituras pendentes por sink
+DEFAULT_SINK_BATCH_SIZE = 256  # Leituras por entrega
+DEFAULT_SINK_IDLE_INTERVAL = 1.0  # Segundos
+DEFAULT_HTTP_SINK_TIMEOUT = 5.0  # Segundos
+
+# HTTP Uploader
+DEFAULT_UPLOAD_BATCH_SIZE = 500  # Leituras por requisição
+DEFAULT_UPLOAD_MAX_DELAY = 2.0  # Segundos que uma leitura espera pelo envio
+DEFAULT_UPLOAD_RETRIES = 3
+DEFAULT_UPLOAD_BACKOFF = 0.5  # Segundos; dobra a cada tentativa
+DEFAULT_UPLOAD_MAX_BACKOFF = 60.0  # Segundos entre tentativas durante uma queda do servidor
+DEFAULT_UPLOAD_POOL_SIZE = 4  # Conexões keep-alive
+DEFAULT_UPLOAD_MAX_PENDING = 10000  # Leituras em memória sem fila em disco
+DEFAULT_UPLOAD_SPOOL_MAX_BYTES = 256 * 1024 * 1024  # Tamanho máximo da fila em disco; descarta as mais antigas
+
+# ROI Layout Provider
+DEFAULT_LAYOUT_REFRESH_INTERVAL = 30.0  # Segundos entre revalidações do layout no servidor
+DEFAULT_LAYOUT_REQUEST_TIMEOUT = 5.0  # Segundos
+
+# Layout Library
+ROI_ROLES = ("unit", "current", "min", "max")  # Papel de cada ROI, na ordem do assistente
+LAYOUT_LIBRARY_FORMAT = 1  # Versão do formato do arquivo de layouts
+DEFAULT_LAYOUT_LIBRARY_PATH = "layouts.json"
+DEFAULT_LAYOUT_MODEL = "default"
+
+# ONNX Runtime Recognizer
+DEFAULT_RECOGNIZER_TEXT_HEIGHT = 64  # Altura da entrada do reconhecedor do EasyOCR (easyocr.config.imgH)
+DEFAULT_ONNX_INTRA_OP_THREADS = 0  # 0: padrão do ONNX Runtime (um por núcleo físico)
+DEFAULT_ONNX_INTER_OP_THREADS = 1  # 1: execução sequencial do grafo
+ONNX_OPSET = 13
+ONNX_QUANTIZED_OP_TYPES = ("LSTM", "MatMul", "Gemm")  # Pesos em int8; as convoluções ficam em float32
+
+# Recognizer Calibration
+DEFAULT_CALIBRATION_FRAMES = 30  # Recortes de cada ROI reconhecidos por todos os backends
+DEFAULT_CALIBRATION_MIN_AGREEMENT = 0.95  # Fração mínima de textos iguais aos do backend de referência
+DEFAULT_CALIBRATION_MIN_CONFIDENCE = 0.5  # Confiança média mínima do backend
+DEFAULT_TESSERACT_PAGE_SEGMENTATION = 7  # --psm 7: o ROI é uma única linha de texto
+DEFAULT_TESSERACT_TEXT_HEIGHT = 48  # Linha com letras maiúsculas de ~30 px, a faixa em que o Tesseract lê melhor
@@ -6,3 +6,6 @@ ENABLE_VISUAL_TEXT_RECOGNITION = False
 ENABLE_DEBUG_ROI_INFO = True
 ENABLE_EXTERNAL_DEBUG_CONSOLE = False
 ENABLE_DEBUG_CONSOLE = False
+
+# Pipeline Instrumentation
+ENABLE_STAGE_PROFILING = False
@@ -1,18 +1,102 @@
 import sys
+import signal
 import argparse
 from ocr import TextRecognition
+from common import LayoutLibrary, RoiLayout, RoiLayoutProvider
+from configurations.constants import (DEFAULT_LAYOUT_LIBRARY_PATH, DEFAULT_LAYOUT_MODEL, DEFAULT_LIVE_FEED_PORT,
+                                      DEFAULT_CALIBRATION_FRAMES, DEFAULT_CALIBRATION_MIN_AGREEMENT,
+                                      DEFAULT_ONNX_INTER_OP_THREADS, DEFAULT_ONNX_INTRA_OP_THREADS,
+                                      ENGINE_MODE_DETECT, ENGINE_MODE_RECOGNIZE, ENGINE_MODES)
 
 
-def main(camera_index):
-    text_recognition = TextRecognition(camera_index)
-    text_recognition.start()
-    while text_recognition.running:
-        pass  # Aguarde até que a tecla "q" ou "ESC" seja pressionada
+def main(camera_index, engine_mode=ENGINE_MODE_DETECT, workers=0, headless=False, layout_path=None,
+         store_directory=None, feed_port=None, upload_url=None, upload_spool=None, layout_url=None,
+         layout_cache=None, layout_label="", layouts_path=DEFAULT_LAYOUT_LIBRARY_PATH, model=DEFAULT_LAYOUT_MODEL,
+         onnx_model=None, intra_op_threads=DEFAULT_ONNX_INTRA_OP_THREADS,
+         inter_op_threads=DEFAULT_ONNX_INTER_OP_THREADS, calibration_frames=0,
+         calibration_agreement=DEFAULT_CALIBRATION_MIN_AGREEMENT, contrast=False, binarize=False):
+    text_recognition = TextRecognition(camera_index, engine_mode=engine_mode, workers=workers,
+                                       store_directory=store_directory, live_feed_port=feed_port,
+                                       upload_url=upload_url, upload_spool=upload_spool, onnx_model=onnx_model,
+                                       intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads,
+                                       calibration_frames=calibration_frames,
+                                       calibration_agreement=calibration_agreement, contrast=contrast,
+                                       binarize=binarize)
+    if layout_path is not None:
+        text_recognition.apply_layout(RoiLayout.load(layout_path))
+    elif layout_url is not None:
+        # ROIs mantidos pelo servidor, revalidados em segundo plano (sem requisição por quadro)
+        provider = RoiLayoutProvider(layout_url, cache_path=layout_cache, label=layout_label)
+        if not text_recognition.use_layout_provider(provider) and headless:
+            sys.exit("No ROI layout available from the server or the local cache")
+    elif layouts_path:
+        # Layout salvo para este modelo de monitor: pula o assistente; senão o assistente salva ao final
+        if not text_recognition.use_layout_library(LayoutLibrary(layouts_path), model) and headless:
+            sys.exit(f"No saved ROI layout for model '{model}' in {layouts_path}")
+
+    if headless:
+        # Encerramento limpo ao receber SIGTERM (ex.: systemd/docker stop) ou Ctrl+C
+        signal.signal(signal.SIGTERM, lambda _signum, _frame: text_recognition.stop())
+        signal.signal(signal.SIGINT, lambda _signum, _frame: text_recognition.stop())
+        try:
+            text_recognition.run_headless()
+        except RuntimeError as error:
+            sys.exit(str(error))  # Status diferente de zero: o supervisor (systemd/docker) reinicia ou alerta
+    else:
+        text_recognition.start()  # Retorna quando a tecla "q" é pressionada
     sys.exit(0)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Script para reconhecimento de texto com índice da câmera')
     parser.add_argument('--camera-index', type=str, default=0, help='Índice da câmera (padrão: 0)')
+    parser.add_argument('--engine-mode', type=str, default=ENGINE_MODE_DETECT, choices=ENGINE_MODES,
+                        help='Modo do OCR: "detect" (detecção + reconhecimento) ou "recognize" (somente reconhecimento)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Processos dedicados ao OCR (padrão: 0, inferência no próprio processo)')
+    parser.add_argument('--layout', type=str, default=None, help='Arquivo JSON com os ROIs e o rótulo da unidade')
+    parser.add_argument('--headless', action='store_true',
+                        help='Executa sem interface gráfica (requer --layout, --layout-url ou --layouts)')
+    parser.add_argument('--store', type=str, default=None,
+                        help='Diretório do armazenamento colunar com agregações 15s-24h (opcional)')
+    parser.add_argument('--feed-port', type=int, default=None,
+                        help=f'Publica as leituras via SSE em localhost (ex.: {DEFAULT_LIVE_FEED_PORT}) para o plotter')
+    parser.add_argument('--upload-url', type=str, default=None,
+                        help='Servidor que recebe as leituras em lotes (POST JSON, opcional)')
+    parser.add_argument('--upload-spool', type=str, default=None,
+                        help='Fila em disco (JSONL) das leituras não enviadas durante quedas do servidor')
+    parser.add_argument('--layout-url', type=str, default=None,
+                        help='Servidor de ROIs (ex.: http://127.0.0.1:8080/get_roi_data), revalidado em segundo plano')
+    parser.add_argument('--layout-cache', type=str, default=None,
+                        help='Cache local do layout do servidor, usado na inicialização e durante quedas')
+    parser.add_argument('--layout-label', type=str, default='',
+                        help='Rótulo da unidade quando o servidor de ROIs não informa um')
+    parser.add_argument('--layouts', type=str, default=DEFAULT_LAYOUT_LIBRARY_PATH,
+                        help=f'Arquivo de layouts salvos por modelo (padrão: {DEFAULT_LAYOUT_LIBRARY_PATH}; vazio desativa)')
+    parser.add_argument('--model', type=str, default=DEFAULT_LAYOUT_MODEL,
+                        help=f'Modelo da câmera/monitor, chave do layout salvo (padrão: {DEFAULT_LAYOUT_MODEL})')
+    parser.add_argument('--onnx-model', type=str, default=None,
+                        help='Reconhecedor int8 exportado para ONNX (requer --engine-mode recognize; ver benchmark.py)')
+    parser.add_argument('--intra-op-threads', type=int, default=DEFAULT_ONNX_INTRA_OP_THREADS,
+                        help='Threads por operação do ONNX Runtime (padrão: 0, automático)')
+    parser.add_argument('--inter-op-threads', type=int, default=DEFAULT_ONNX_INTER_OP_THREADS,
+                        help='Threads entre operações do ONNX Runtime (padrão: 1, sequencial)')
+    parser.add_argument('--calibrate', type=int, nargs='?', const=DEFAULT_CALIBRATION_FRAMES, default=0,
+                        metavar='FRAMES',
+                        help=f'Escolhe o backend mais rápido de cada ROI nos primeiros quadros '
+                             f'(padrão ao informar: {DEFAULT_CALIBRATION_FRAMES})')
+    parser.add_argument('--calibration-agreement', type=float, default=DEFAULT_CALIBRATION_MIN_AGREEMENT,
+                        help=f'Concordância mínima com o motor principal (padrão: {DEFAULT_CALIBRATION_MIN_AGREEMENT})')
+    parser.add_argument('--contrast', action='store_true', help='Estica o contraste de cada ROI antes do OCR')
+    parser.add_argument('--binarize', action='store_true', help='Binariza cada ROI (Otsu) antes do OCR')
     args = parser.parse_args()
-    main(args.camera_index)
+    if args.onnx_model and (args.engine_mode != ENGINE_MODE_RECOGNIZE or args.workers > 0):
+        parser.error('--onnx-model requires --engine-mode recognize and --workers 0')
+    if args.calibrate and args.workers > 0:
+        parser.error('--calibrate requires --workers 0')
+    if args.headless and args.layout is None and args.layout_url is None and not args.layouts:
+        parser.error('--headless requires --layout, --layout-url or --layouts')
+    main(args.camera_index, args.engine_mode, args.workers, args.headless, args.layout, args.store, args.feed_port,
+         args.upload_url, args.upload_spool, args.layout_url, args.layout_cache, args.layout_label, args.layouts,
+         args.model, args.onnx_model, args.intra_op_threads, args.inter_op_threads,
+         args.calibrate, args.calibration_agreement, args.contrast, args.binarize)
@@ -1 +1,12 @@
-from .text_recognition import TextRecognition
\ No newline at end of file
+from .text_recognition import TextRecognition
+from .results import FrameResult, RoiResult
+from .change_detector import RoiChangeDetector
+from .result_cache import OCRResultCache
+from .seven_segment import SevenSegmentRecognizer
+from .process_pool import OCRProcessPool
+from .onnx_recognizer import OnnxRecognizer, export_onnx_recognizer
+from .recognizer import Recognizer
+from .easyocr_recognizer import EasyOCRRecognizer
+from .tesseract_recognizer import TesseractRecognizer
+from .calibration import RecognizerCalibrator
+from .preprocessing import RoiPreprocessor, unscale_results
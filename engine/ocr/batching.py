@@ -0,0 +1,41 @@
+import numpy as np
+
+from typing import List, Sequence
+
+
+def pad_to_common_shape(crops: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Empacota recortes em tons de cinza de tamanhos diferentes em um único tensor (N, H, W).
+
+    Cada recorte fica ancorado no canto superior esquerdo e é completado replicando a borda,
+    assim as coordenadas detectadas continuam válidas no recorte original e o preenchimento
+    não cria arestas artificiais para o detector.
+
+    Args:
+        crops (Sequence[np.ndarray]): Recortes 2D (uint8).
+    Returns:
+        np.ndarray: Tensor (N, H, W) com H e W iguais ao maior recorte.
+    """
+    height = max(crop.shape[0] for crop in crops)
+    width = max(crop.shape[1] for crop in crops)
+    batch = np.empty((len(crops), height, width), dtype=np.uint8)
+
+    for index, crop in enumerate(crops):
+        h, w = crop.shape[:2]
+        batch[index] = np.pad(crop, ((0, height - h), (0, width - w)), mode="edge")
+
+    return batch
+
+
+def discard_padding_detections(results: List[tuple], shape) -> List[tuple]:
+    """
+    Remove detecções que começam na área de preenchimento, fora do recorte original.
+
+    Args:
+        results (List[tuple]): Tuplas (bbox, text, prob) no espaço do tensor preenchido.
+        shape (tuple): Formato (altura, largura) do recorte original.
+    Returns:
+        List[tuple]: Tuplas cujas caixas começam dentro do recorte original.
+    """
+    height, width = shape[:2]
+    return [result for result in results if result[0][0][0] < width and result[0][0][1] < height]
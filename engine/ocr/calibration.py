@@ -0,0 +1,125 @@
+import time
+import numpy as np
+
+from typing import Dict, List, Optional, Tuple
+
+from configurations.constants import (DEFAULT_CALIBRATION_FRAMES, DEFAULT_CALIBRATION_MIN_AGREEMENT,
+                                      DEFAULT_CALIBRATION_MIN_CONFIDENCE)
+from .preprocessing import unscale_results
+from .recognizer import Recognizer
+
+
+class _BackendSamples:
+
+    def __init__(self):
+        self.latencies = []
+        self.agreements = 0
+        self.confidence_total = 0.0
+
+    def summary(self, samples: int) -> dict:
+        return {
+            "latency_ms_p50": float(np.median(self.latencies)) * 1000.0 if self.latencies else None,
+            "agreement": self.agreements / samples if samples else 0.0,
+            "confidence": self.confidence_total / samples if samples else 0.0,
+        }
+
+
+class RecognizerCalibrator:
+
+    def __init__(self, backends: Dict[str, Recognizer], reference: str, frames=DEFAULT_CALIBRATION_FRAMES,
+                 min_agreement=DEFAULT_CALIBRATION_MIN_AGREEMENT, min_confidence=DEFAULT_CALIBRATION_MIN_CONFIDENCE):
+        """
+        Escolhe, para cada ROI, o backend de OCR mais rápido que ainda lê o mesmo que a referência.
+
+        Nos primeiros `frames` quadros de cada ROI, todos os backends reconhecem o mesmo ROI, cada
+        um preparado na sua própria altura de texto (`Recognizer.text_height`, a mesma que terá
+        em produção), e o resultado entregue ao pipeline é o da referência (o backend padrão). Ao final, o
+        backend escolhido é o de menor latência mediana entre os que concordaram com a referência
+        em pelo menos `min_agreement` dos recortes e tiveram confiança média de pelo menos
+        `min_confidence`; a referência sempre é elegível. Assim um ROI com dígitos de sete
+        segmentos passa a usar o reconhecedor leve, e um ROI de texto continua no EasyOCR.
+
+        Args:
+            backends (Dict[str, Recognizer]): Backends candidatos, por nome (inclui a referência).
+            reference (str): Nome do backend de referência.
+            frames (int): Recortes por ROI usados na calibração.
+            min_agreement (float): Fração mínima de textos iguais aos da referência.
+            min_confidence (float): Confiança média mínima.
+        """
+        if reference not in backends:
+            raise ValueError(f"Reference backend {reference} is not one of {tuple(backends)}")
+        self.backends = backends
+        self.reference = reference
+        self.frames = frames
+        self.min_agreement = min_agreement
+        self.min_confidence = min_confidence
+        # Alturas de recorte a preparar para cada amostra (None: tamanho original do ROI)
+        self.text_heights = list(dict.fromkeys(backend.text_height for backend in backends.values()))
+        self.choices = {}  # Índice do ROI -> nome do backend escolhido
+        self._samples = {}  # Índice do ROI -> (recortes, {nome: _BackendSamples})
+
+    def is_calibrating(self, index: int) -> bool:
+        return index not in self.choices
+
+    def sample(self, index: int, prepared: Dict[Optional[int], Tuple[np.ndarray, Tuple[float, float]]]) -> List[tuple]:
+        """
+        Reconhece o ROI com todos os backends e acumula as medidas do ROI.
+
+        Args:
+            index (int): Índice do ROI.
+            prepared (Dict): Altura de texto -> (recorte, fatores de escala), para cada altura em
+                `text_heights` (ver `RoiPreprocessor.prepare`).
+        Returns:
+            List[tuple]: Resultado do backend de referência, em coordenadas do ROI.
+        """
+        samples, backend_samples = self._samples.get(index, (0, None))
+        if backend_samples is None:
+            backend_samples = {name: _BackendSamples() for name in self.backends}
+
+        texts = {}
+        reference_results = []
+        for name, backend in self.backends.items():
+            image, scale = prepared[backend.text_height]
+            started = time.perf_counter()
+            results = backend.readtext(image)
+            backend_samples[name].latencies.append(time.perf_counter() - started)
+            results = unscale_results(results, scale)
+            backend_samples[name].confidence_total += float(np.mean([prob for _bbox, _text, prob in results])) \
+                if results else 0.0
+            texts[name] = "".join(text for _bbox, text, _prob in results).replace(" ", "")
+            if name == self.reference:
+                reference_results = results
+
+        for name, text in texts.items():
+            backend_samples[name].agreements += text == texts[self.reference]
+
+        samples += 1
+        self._samples[index] = (samples, backend_samples)
+        if samples >= self.frames:
+            self.choices[index] = self.__choose(samples, backend_samples)
+        return reference_results
+
+    def __choose(self, samples: int, backend_samples: Dict[str, _BackendSamples]) -> str:
+        eligible = [name for name, measures in backend_samples.items()
+                    if name == self.reference or
+                    (measures.agreements / samples >= self.min_agreement and
+                     measures.confidence_total / samples >= self.min_confidence)]
+        return min(eligible, key=lambda name: np.median(backend_samples[name].latencies))
+
+    def choice(self, index: int) -> Optional[str]:
+        return self.choices.get(index)
+
+    def reset(self) -> None:
+        """Descarta as medidas e escolhas (ex.: quando o layout de ROIs muda)."""
+        self.choices = {}
+        self._samples = {}
+
+    def report(self) -> dict:
+        return {
+            index: {
+                "choice": self.choices.get(index),
+                "samples": samples,
+                "backends": {name: measures.summary(samples) for name, measures in backend_samples.items()},
+            }
+            for index, (samples, backend_samples) in sorted(self._samples.items())
+        }
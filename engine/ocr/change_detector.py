@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+
+from configurations.constants import DEFAULT_CHANGE_SIGNATURE_SIZE, DEFAULT_CHANGE_THRESHOLD
+
+
+class RoiChangeDetector:
+
+    def __init__(self, threshold=DEFAULT_CHANGE_THRESHOLD, signature_size=DEFAULT_CHANGE_SIGNATURE_SIZE):
+        """
+        Detector barato de mudança por ROI, executado antes da inferência.
+
+        Cada ROI é reduzido para uma assinatura pequena (média por área) e comparado, pela
+        diferença absoluta média em níveis de cinza, com a assinatura da última vez em que o
+        OCR foi executado. Abaixo do limiar, o ROI é considerado inalterado.
+
+        Args:
+            threshold (float): Diferença absoluta média (0-255) a partir da qual o ROI mudou.
+                Use 0 para sempre recalcular.
+            signature_size (Tuple[int, int]): Largura e altura da assinatura reduzida.
+        """
+        self.threshold = threshold
+        self.signature_size = signature_size
+        self.skipped = 0
+        self.recomputed = 0
+        self.last_score = {}
+        self._references = {}
+
+    def signature(self, gray_crop: np.ndarray) -> np.ndarray:
+        return cv2.resize(gray_crop, self.signature_size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def has_changed(self, key, gray_crop: np.ndarray) -> bool:
+        """
+        Indica se o ROI mudou desde o último recálculo e atualiza os contadores.
+
+        A referência só é atualizada quando o ROI é recalculado, assim uma deriva lenta
+        acaba ultrapassando o limiar em vez de ser absorvida quadro a quadro.
+
+        Args:
+            key (Hashable): Identificador do ROI.
+            gray_crop (np.ndarray): Recorte atual em tons de cinza.
+        Returns:
+            bool: True se o OCR deve ser executado novamente.
+        """
+        signature = self.signature(gray_crop)
+        reference = self._references.get(key)
+
+        if reference is not None:
+            score = float(np.mean(np.abs(signature - reference)))
+            self.last_score[key] = score
+            if score < self.threshold:
+                self.skipped += 1
+                return False
+
+        self._references[key] = signature
+        self.recomputed += 1
+        return True
+
+    def forget(self, key=None) -> None:
+        if key is None:
+            self._references.clear()
+            self.last_score.clear()
+        else:
+            self._references.pop(key, None)
+            self.last_score.pop(key, None)
+
+    def stats(self) -> dict:
+        total = self.skipped + self.recomputed
+        return {
+            "threshold": self.threshold,
+            "skipped": self.skipped,
+            "recomputed": self.recomputed,
+            "skip_ratio": self.skipped / total if total else 0.0,
+        }
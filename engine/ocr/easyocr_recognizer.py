@@ -0,0 +1,35 @@
+import numpy as np
+
+from typing import List
+
+from configurations.constants import (DEFAULT_DIGITS_ALLOWLIST, DEFAULT_RECOGNIZER_TEXT_HEIGHT, ENGINE_MODE_DETECT,
+                                      ENGINE_MODE_RECOGNIZE)
+from .recognizer import Recognizer
+
+
+class EasyOCRRecognizer(Recognizer):
+    name = "easyocr"
+
+    def __init__(self, reader, engine_mode=ENGINE_MODE_DETECT, allowlist=DEFAULT_DIGITS_ALLOWLIST):
+        """
+        Backend sobre um `easyocr.Reader` (torch).
+
+        No modo "detect" cada ROI passa pelo detector CRAFT e pelo reconhecedor; no modo
+        "recognize" o ROI inteiro é tratado como uma linha de texto, restrita a `allowlist`, e o
+        recorte é entregue já na altura de entrada do reconhecedor. No modo "detect" o recorte
+        fica no tamanho original: o detector CRAFT redimensiona a imagem por conta própria.
+
+        Args:
+            reader (easyocr.Reader): Reader já carregado.
+            engine_mode (str): Modo do motor de OCR.
+            allowlist (str): Caracteres permitidos no modo "recognize".
+        """
+        self.reader = reader
+        self.engine_mode = engine_mode
+        self.allowlist = allowlist
+        self.text_height = DEFAULT_RECOGNIZER_TEXT_HEIGHT if engine_mode == ENGINE_MODE_RECOGNIZE else None
+
+    def readtext(self, image: np.ndarray) -> List[tuple]:
+        if self.engine_mode == ENGINE_MODE_RECOGNIZE:
+            return self.reader.recognize(image, allowlist=self.allowlist)
+        return self.reader.readtext(image)
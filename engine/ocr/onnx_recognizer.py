@@ -0,0 +1,230 @@
+import copy
+import math
+import os
+import tempfile
+import cv2
+import numpy as np
+
+from typing import List, Optional
+
+from configurations.constants import (DEFAULT_DIGITS_ALLOWLIST, DEFAULT_ONNX_INTER_OP_THREADS,
+                                      DEFAULT_ONNX_INTRA_OP_THREADS, DEFAULT_RECOGNIZER_TEXT_HEIGHT, ONNX_OPSET,
+                                      ONNX_QUANTIZED_OP_TYPES)
+from .recognizer import Recognizer
+
+BLANK_INDEX = 0  # Símbolo vazio do CTC (converter.character[0] == "[blank]" no EasyOCR)
+METADATA_CHARACTERS = "characters"
+METADATA_TEXT_HEIGHT = "text_height"
+
+
+def _import_onnxruntime():
+    # Dependência opcional: só é exigida quando o backend ONNX é usado
+    try:
+        import onnxruntime
+    except ImportError as error:
+        raise ImportError("The ONNX backend requires onnxruntime (pip install onnxruntime)") from error
+    return onnxruntime
+
+
+def export_onnx_recognizer(reader, path: str, quantize=True, text_height=DEFAULT_RECOGNIZER_TEXT_HEIGHT,
+                           opset=ONNX_OPSET) -> str:
+    """
+    Exporta o reconhecedor (CRNN) de um `easyocr.Reader` para ONNX, com quantização dinâmica int8.
+
+    Somente o reconhecedor é exportado: o detector CRAFT não é usado no modo "recognize". A
+    entrada tem lote e largura dinâmicos e altura fixa `text_height`. A lista de caracteres do
+    modelo e a altura de entrada vão nos metadados do arquivo, então o `OnnxRecognizer` não
+    depende do easyocr/torch em tempo de execução.
+
+    A quantização dinâmica grava em int8 os pesos das operações em `ONNX_QUANTIZED_OP_TYPES` (o
+    LSTM bidirecional e as camadas lineares); as ativações são quantizadas durante a inferência.
+
+    Args:
+        reader (easyocr.Reader): Reader já carregado.
+        path (str): Arquivo .onnx de saída.
+        quantize (bool): Aplica a quantização dinâmica int8.
+        text_height (int): Altura da entrada do reconhecedor (easyocr.config.imgH).
+        opset (int): Versão do opset ONNX.
+    Returns:
+        str: Caminho do modelo gravado.
+    """
+    import onnx
+    import torch
+
+    class CTCModel(torch.nn.Module):
+        # O reconhecedor do EasyOCR recebe (imagem, texto); o texto só é usado pelo decodificador Attn
+        def __init__(self, recognizer):
+            super().__init__()
+            self.recognizer = recognizer
+
+        def forward(self, image):
+            return self.recognizer(image, None)
+
+    class HeightMean(torch.nn.Module):
+        # AdaptiveAvgPool2d((None, 1)) com largura dinâmica não é exportável; equivale à média na última dimensão
+        def forward(self, features):
+            return features.mean(dim=3, keepdim=True)
+
+    recognizer = copy.deepcopy(reader.recognizer).cpu().eval()
+    recognizer = getattr(recognizer, "module", recognizer)  # DataParallel
+    if isinstance(getattr(recognizer, "AdaptiveAvgPool", None), torch.nn.AdaptiveAvgPool2d):
+        recognizer.AdaptiveAvgPool = HeightMean()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=directory) as workdir:
+        model_path = os.path.join(workdir, "recognizer_fp32.onnx")
+        sample = torch.zeros((1, 1, text_height, text_height * 4), dtype=torch.float32)
+        with torch.no_grad():
+            torch.onnx.export(CTCModel(recognizer), sample, model_path, input_names=["image"],
+                              output_names=["logits"], opset_version=opset,
+                              dynamic_axes={"image": {0: "batch", 3: "width"}, "logits": {0: "batch", 1: "steps"}})
+
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantized_path = os.path.join(workdir, "recognizer_int8.onnx")
+            quantize_dynamic(model_path, quantized_path, op_types_to_quantize=list(ONNX_QUANTIZED_OP_TYPES),
+                             weight_type=QuantType.QInt8)
+            model_path = quantized_path
+
+        model = onnx.load(model_path)
+        metadata = {METADATA_CHARACTERS: "".join(reader.converter.character[BLANK_INDEX + 1:]),
+                    METADATA_TEXT_HEIGHT: str(text_height)}
+        for key, value in metadata.items():
+            entry = model.metadata_props.add()
+            entry.key, entry.value = key, value
+        onnx.save(model, path)
+    return path
+
+
+class OnnxRecognizer(Recognizer):
+    name = "onnx"
+
+    def __init__(self, model_path: str, allowlist=DEFAULT_DIGITS_ALLOWLIST,
+                 intra_op_threads=DEFAULT_ONNX_INTRA_OP_THREADS, inter_op_threads=DEFAULT_ONNX_INTER_OP_THREADS):
+        """
+        Reconhecedor de linha de texto sobre ONNX Runtime (CPU), a partir do modelo exportado por
+        `export_onnx_recognizer`.
+
+        Substitui `easyocr.Reader.recognize` no modo "recognize": o ROI inteiro é uma linha de
+        texto, redimensionada para a altura do modelo e normalizada como no EasyOCR, e a saída é
+        decodificada por CTC guloso. O retorno segue o formato do EasyOCR: lista de
+        (bbox, text, prob), com a mesma fórmula de confiança. O reajuste de contraste que o
+        EasyOCR aplica aos resultados de baixa confiança não é repetido.
+
+        Args:
+            model_path (str): Modelo .onnx exportado.
+            allowlist (str): Caracteres permitidos por padrão (None: todos os do modelo).
+            intra_op_threads (int): Threads usadas dentro de cada operação (0: padrão do ONNX Runtime).
+            inter_op_threads (int): Threads para operações independentes em paralelo (1: sequencial).
+        """
+        onnxruntime = _import_onnxruntime()
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL if inter_op_threads > 1 \
+            else onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+
+        self.model_path = model_path
+        self.session = onnxruntime.InferenceSession(model_path, sess_options=options,
+                                                    providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        if METADATA_CHARACTERS not in metadata:
+            raise ValueError(f"{model_path} has no character list; export it with export_onnx_recognizer()")
+        self.characters = ["[blank]"] + list(metadata[METADATA_CHARACTERS])
+        self.text_height = int(metadata.get(METADATA_TEXT_HEIGHT, DEFAULT_RECOGNIZER_TEXT_HEIGHT))
+        self.allowlist = allowlist
+        self._ignored_indices = {}  # allowlist -> índices das classes zeradas antes da decodificação
+
+    def readtext(self, image: np.ndarray) -> List[tuple]:
+        return self.recognize(image, allowlist=self.allowlist)
+
+    def recognize(self, image: np.ndarray, allowlist: Optional[str] = None) -> List[tuple]:
+        """
+        Reconhece o ROI inteiro como uma linha de texto.
+
+        Args:
+            image (np.ndarray): ROI em tons de cinza ou BGR.
+            allowlist (str): Caracteres permitidos (padrão: todos os do modelo).
+        Returns:
+            List[tuple]: [(bbox, text, prob)] em coordenadas do ROI, ou lista vazia.
+        """
+        return self.__run([image], allowlist)[0]
+
+    def recognize_batch(self, images: List[np.ndarray]) -> List[List[tuple]]:
+        """
+        Reconhece vários ROIs em uma única execução do modelo (preenchidos até a maior largura).
+
+        Returns:
+            List[List[tuple]]: Tuplas (bbox, text, prob) de cada ROI, na ordem de entrada.
+        """
+        return self.__run(images, self.allowlist)
+
+    def __run(self, images: List[np.ndarray], allowlist: Optional[str]) -> List[List[tuple]]:
+        batch_results = [[] for _ in images]
+        indices = [index for index, image in enumerate(images) if image is not None and image.size > 0]
+        if not indices:
+            return batch_results
+
+        prepared = [self.__prepare(images[index]) for index in indices]
+        width = max(line.shape[1] for line in prepared)
+        batch = np.empty((len(prepared), 1, self.text_height, width), dtype=np.float32)
+        for position, line in enumerate(prepared):
+            batch[position, 0, :, :line.shape[1]] = line
+            # Preenche com a última coluna, como o NormalizePAD do EasyOCR
+            batch[position, 0, :, line.shape[1]:] = line[:, -1:]
+
+        logits = self.session.run(None, {self.input_name: batch})[0]
+        probabilities = np.exp(logits - logits.max(axis=2, keepdims=True))
+        ignored = self.__ignored(allowlist)
+        if ignored is not None:
+            probabilities[:, :, ignored] = 0.0
+        probabilities /= np.maximum(probabilities.sum(axis=2, keepdims=True), np.finfo(np.float32).tiny)
+
+        for index, line_probabilities in zip(indices, probabilities):
+            height, width = images[index].shape[:2]
+            text, confidence = self.__decode(line_probabilities)
+            bbox = [[0, 0], [width, 0], [width, height], [0, height]]
+            batch_results[index] = [(bbox, text, confidence)]
+        return batch_results
+
+    def __prepare(self, image: np.ndarray) -> np.ndarray:
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = image.shape
+        # Mesma proporção do EasyOCR (calculate_ratio): recortes mais altos que largos também são esticados
+        ratio = width / height
+        ratio = 1.0 / ratio if ratio < 1.0 else ratio
+        target_width = max(int(math.ceil(self.text_height * ratio)), 1)
+        if (height, width) != (self.text_height, target_width):  # O RoiPreprocessor já entrega na altura do modelo
+            interpolation = cv2.INTER_AREA if height > self.text_height else cv2.INTER_CUBIC
+            image = cv2.resize(image, (target_width, self.text_height), interpolation=interpolation)
+        return image.astype(np.float32) / 127.5 - 1.0  # (x / 255 - 0.5) / 0.5
+
+    def __ignored(self, allowlist: Optional[str]) -> Optional[np.ndarray]:
+        if not allowlist:
+            return None
+        ignored = self._ignored_indices.get(allowlist)
+        if ignored is None:
+            allowed = set(allowlist)
+            ignored = np.array([index for index, character in enumerate(self.characters)
+                                if index != BLANK_INDEX and character not in allowed], dtype=np.int64)
+            self._ignored_indices[allowlist] = ignored
+        return ignored
+
+    def __decode(self, probabilities: np.ndarray):
+        """CTC guloso: classe mais provável por passo, sem repetições consecutivas e sem o vazio."""
+        best = probabilities.argmax(axis=1)
+        best_probabilities = probabilities.max(axis=1)
+        keep = best != BLANK_INDEX
+        keep[1:] &= best[1:] != best[:-1]
+        text = "".join(self.characters[index] for index in best[keep])
+
+        # Confiança do EasyOCR (custom_mean): produto das probabilidades dos passos não vazios
+        values = best_probabilities[best != BLANK_INDEX]
+        if values.size == 0:
+            return text, 0.0
+        return text, float(np.prod(values) ** (2.0 / np.sqrt(values.size)))
@@ -0,0 +1,127 @@
+import cv2
+import numpy as np
+
+from typing import List, Optional, Sequence, Tuple
+
+BINARY_BACKGROUND_LEVEL = 127  # Média abaixo disso após o Otsu: fundo escuro, a imagem é invertida
+
+
+def unscale_results(results: List[tuple], scale: Tuple[float, float]) -> List[tuple]:
+    """
+    Converte as caixas de um recorte redimensionado de volta para as coordenadas do ROI.
+
+    Args:
+        results (List[tuple]): Tuplas (bbox, text, prob) no recorte redimensionado.
+        scale (Tuple[float, float]): Fatores (horizontal, vertical) aplicados ao ROI.
+    Returns:
+        List[tuple]: Tuplas (bbox, text, prob) em coordenadas do ROI.
+    """
+    scale_x, scale_y = scale
+    if scale_x == 1.0 and scale_y == 1.0:
+        return results
+    return [([[int(round(point[0] / scale_x)), int(round(point[1] / scale_y))] for point in bbox], text, prob)
+            for bbox, text, prob in results]
+
+
+class RoiPreprocessor:
+
+    def __init__(self, contrast=False, binarize=False):
+        """
+        Preparação dos recortes de todos os ROIs de um quadro para o OCR.
+
+        A conversão para tons de cinza é feita uma única vez, na menor região do quadro que
+        contém todos os ROIs, e cada ROI é uma fatia (sem cópia) dessa imagem. Quando o backend
+        do ROI tem uma altura de texto ideal, o recorte é redimensionado para ela; opcionalmente
+        o contraste é esticado (min-max) e o recorte é binarizado (Otsu, texto escuro sobre fundo
+        claro). Os recortes redimensionados ou alterados são escritos em buffers pré-alocados
+        por ROI, reaproveitados de um quadro para o outro.
+
+        Os recortes devolvidos são válidos até a próxima chamada de `prepare`.
+
+        Args:
+            contrast (bool): Estica o contraste de cada recorte para 0-255.
+            binarize (bool): Binariza cada recorte por Otsu.
+        """
+        self.contrast = contrast
+        self.binarize = binarize
+        self._gray = None  # Região em tons de cinza que contém todos os ROIs
+        self._buffers = {}  # Índice do ROI -> buffer do recorte preparado
+
+    def prepare(self, frame: np.ndarray, rois: Sequence[tuple], text_heights: Sequence[Optional[int]]):
+        """
+        Recorta e prepara todos os ROIs do quadro.
+
+        Args:
+            frame (np.ndarray): Quadro BGR.
+            rois (Sequence[tuple]): ROIs (x, y, w, h).
+            text_heights (Sequence[int]): Altura de destino de cada ROI (None mantém o tamanho).
+        Returns:
+            Tuple[List[Optional[np.ndarray]], List[Tuple[float, float]]]: Recorte de cada ROI (None
+            se o ROI estiver fora do quadro) e os fatores (horizontal, vertical) aplicados.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        bounds = []
+        for x, y, w, h in rois:
+            left, top = max(x, 0), max(y, 0)
+            right, bottom = min(x + w, frame_width), min(y + h, frame_height)
+            bounds.append((left, top, right, bottom) if right > left and bottom > top else None)
+
+        valid = [bound for bound in bounds if bound is not None]
+        if not valid:
+            return [None] * len(rois), [(1.0, 1.0)] * len(rois)
+
+        region_left = min(bound[0] for bound in valid)
+        region_top = min(bound[1] for bound in valid)
+        region_right = max(bound[2] for bound in valid)
+        region_bottom = max(bound[3] for bound in valid)
+        region = frame[region_top:region_bottom, region_left:region_right]
+        if self._gray is None or self._gray.shape != region.shape[:2]:
+            self._gray = np.empty(region.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(region, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        crops = []
+        scales = []
+        for index, (bound, text_height) in enumerate(zip(bounds, text_heights)):
+            if bound is None:
+                crops.append(None)
+                scales.append((1.0, 1.0))
+                continue
+
+            left, top, right, bottom = bound
+            crop = self._gray[top - region_top:bottom - region_top, left - region_left:right - region_left]
+            height, width = crop.shape
+            scale = (1.0, 1.0)
+            if text_height and text_height != height:
+                target_width = max(int(round(width * text_height / height)), 1)
+                buffer = self.__buffer(index, (text_height, target_width))
+                interpolation = cv2.INTER_AREA if text_height < height else cv2.INTER_LINEAR
+                cv2.resize(crop, (target_width, text_height), dst=buffer, interpolation=interpolation)
+                crop = buffer
+                scale = (target_width / width, text_height / height)
+            elif self.contrast or self.binarize:
+                buffer = self.__buffer(index, crop.shape)
+                np.copyto(buffer, crop)  # Os ajustes abaixo são feitos no lugar; a imagem em cinza fica intacta
+                crop = buffer
+
+            if self.contrast:
+                cv2.normalize(crop, crop, 0, 255, cv2.NORM_MINMAX)
+            if self.binarize:
+                cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU, dst=crop)
+                if crop.mean() < BINARY_BACKGROUND_LEVEL:
+                    cv2.bitwise_not(crop, dst=crop)
+
+            crops.append(crop)
+            scales.append(scale)
+        return crops, scales
+
+    def __buffer(self, index: int, shape: Tuple[int, int]) -> np.ndarray:
+        buffer = self._buffers.get(index)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[index] = buffer
+        return buffer
+
+    def reset(self) -> None:
+        """Libera os buffers (ex.: quando o layout de ROIs muda)."""
+        self._gray = None
+        self._buffers = {}
@@ -0,0 +1,215 @@
+import os
+import multiprocessing
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+from queue import Empty, Queue
+from typing import Collection, List
+
+from configurations.constants import DEFAULT_DIGITS_ALLOWLIST, ENGINE_MODE_DETECT, ENGINE_MODE_RECOGNIZE
+
+SEGMENT_ALIGNMENT = 64  # Alinhamento (bytes) de cada recorte dentro do segmento compartilhado
+
+# Estado de cada processo worker
+_worker_reader = None
+_worker_engine_mode = ENGINE_MODE_DETECT
+_worker_allowlist = None
+_worker_segments = {}
+_worker_ready = None
+
+
+def _initialize_worker(language: str, engine_mode: str, allowlist: str, ready) -> None:
+    """Carrega e aquece o `easyocr.Reader` uma única vez por processo worker."""
+    global _worker_reader, _worker_engine_mode, _worker_allowlist, _worker_ready
+    import easyocr
+
+    _worker_reader = easyocr.Reader([language])
+    _worker_engine_mode = engine_mode
+    _worker_allowlist = allowlist
+    _worker_ready = ready
+    # Os workers saem por os._exit (atexit não roda); o Finalize roda no encerramento do processo
+    util.Finalize(None, _close_segments, exitpriority=10)
+    _worker_reader.readtext(np.zeros((32, 96), dtype=np.uint8))
+
+
+def _ping() -> int:
+    # Só retorna quando há um _ping em execução em cada worker: como um worker parado na barreira
+    # não pega outra tarefa, as `workers` chamadas rodam em processos distintos, todos já inicializados
+    _worker_ready.wait()
+    return os.getpid()
+
+
+def _close_segments(keep: Collection[str] = ()) -> None:
+    for name in [name for name in _worker_segments if name not in keep]:
+        _worker_segments.pop(name).close()
+
+
+def _attach_segment(name: str, live_segments: Collection[str]) -> shared_memory.SharedMemory:
+    # Mantém o segmento aberto entre tarefas: o processo principal reutiliza os mesmos segmentos.
+    # Os que ele já recriou (maiores) são fechados aqui, senão o mapeamento e o fd ficariam abertos
+    _close_segments(keep=live_segments)
+    segment = _worker_segments.get(name)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=name)
+        _worker_segments[name] = segment
+    return segment
+
+
+def _recognize_segment(segment_name: str, layout: List[tuple], live_segments: Collection[str]) -> List[List[tuple]]:
+    """
+    Executa o OCR nos recortes escritos no segmento compartilhado.
+
+    Args:
+        segment_name (str): Nome do segmento de memória compartilhada.
+        layout (List[tuple]): (offset, altura, largura) de cada recorte dentro do segmento.
+        live_segments (Collection[str]): Segmentos ainda existentes no processo principal.
+    Returns:
+        List[List[tuple]]: Tuplas (bbox, text, prob) de cada recorte, na ordem do layout.
+    """
+    segment = _attach_segment(segment_name, live_segments)
+    batch_results = []
+    for offset, height, width in layout:
+        crop = np.ndarray((height, width), dtype=np.uint8, buffer=segment.buf, offset=offset)
+        if _worker_engine_mode == ENGINE_MODE_RECOGNIZE:
+            batch_results.append(_worker_reader.recognize(crop, allowlist=_worker_allowlist))
+        else:
+            batch_results.append(_worker_reader.readtext(crop))
+    return batch_results
+
+
+class PendingBatch:
+
+    def __init__(self, pool, chunks):
+        self._pool = pool
+        self._chunks = chunks  # [(segment, future)] na ordem dos recortes
+
+    def result(self) -> List[List[tuple]]:
+        """
+        Aguarda todos os pedaços e remonta os resultados na ordem original dos recortes.
+
+        Returns:
+            List[List[tuple]]: Tuplas (bbox, text, prob) de cada recorte.
+        """
+        batch_results = []
+        try:
+            for _segment, future in self._chunks:
+                batch_results.extend(future.result())
+        finally:
+            for segment, _future in self._chunks:
+                self._pool._release_segment(segment)
+            self._chunks = []
+        return batch_results
+
+
+class OCRProcessPool:
+
+    def __init__(self, workers: int, language="en", engine_mode=ENGINE_MODE_DETECT,
+                 allowlist=DEFAULT_DIGITS_ALLOWLIST):
+        """
+        Executor de OCR com um pool de processos, cada um com seu próprio `easyocr.Reader` aquecido.
+
+        Os recortes de um quadro são divididos entre os workers e entregues por segmentos de
+        `multiprocessing.shared_memory` reutilizados entre quadros, em vez de arrays serializados
+        com pickle. Os processos são criados com "spawn", seguro com as threads e o torch do
+        processo principal.
+
+        Args:
+            workers (int): Quantidade de processos worker.
+            language (str): Idioma do `easyocr.Reader`.
+            engine_mode (str): ENGINE_MODE_DETECT ou ENGINE_MODE_RECOGNIZE.
+            allowlist (str): Caracteres permitidos no modo somente reconhecimento.
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid number of OCR workers: {workers}")
+
+        self.workers = workers
+        context = multiprocessing.get_context("spawn")
+        self._ready = context.Barrier(workers)  # Usada por warm_up(); passada aos workers na criação
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_initialize_worker,
+            initargs=(language, engine_mode, allowlist, self._ready),
+        )
+        self._free_segments = Queue()
+        self._segments = []
+
+    def warm_up(self) -> set:
+        """
+        Inicia todos os processos e aguarda o `Reader` de cada um ficar pronto.
+
+        Envia um `_ping` por worker; cada um espera numa barreira até todos os `workers` estarem
+        em execução ao mesmo tempo, o que só acontece com todos os processos criados e com o
+        inicializador concluído. Sem isso, os workers só nascem (e carregam o modelo) no
+        primeiro quadro enviado, e um único worker rápido poderia responder a todos os pings.
+
+        Returns:
+            set: PIDs dos workers.
+        """
+        futures = [self._executor.submit(_ping) for _worker in range(self.workers)]
+        return {future.result() for future in futures}
+
+    def submit(self, gray_crops: List[np.ndarray]) -> PendingBatch:
+        """
+        Distribui os recortes entre os workers sem bloquear.
+
+        Args:
+            gray_crops (List[np.ndarray]): Recortes em tons de cinza (uint8).
+        Returns:
+            PendingBatch: Resultado pendente; `result()` devolve os resultados na ordem dos recortes.
+        """
+        chunks = []
+        if not gray_crops:
+            return PendingBatch(self, chunks)
+
+        for chunk in np.array_split(np.arange(len(gray_crops)), min(self.workers, len(gray_crops))):
+            crops = [np.ascontiguousarray(gray_crops[index], dtype=np.uint8) for index in chunk]
+
+            layout = []
+            offset = 0
+            for crop in crops:
+                layout.append((offset, crop.shape[0], crop.shape[1]))
+                offset += -(-crop.nbytes // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+
+            segment = self._acquire_segment(max(offset, 1))
+            for (crop_offset, height, width), crop in zip(layout, crops):
+                np.ndarray((height, width), dtype=np.uint8, buffer=segment.buf, offset=crop_offset)[:] = crop
+
+            live_segments = frozenset(existing.name for existing in self._segments)
+            chunks.append((segment, self._executor.submit(_recognize_segment, segment.name, layout, live_segments)))
+
+        return PendingBatch(self, chunks)
+
+    def map(self, gray_crops: List[np.ndarray]) -> List[List[tuple]]:
+        return self.submit(gray_crops).result()
+
+    def _acquire_segment(self, size: int) -> shared_memory.SharedMemory:
+        try:
+            segment = self._free_segments.get_nowait()
+        except Empty:
+            segment = None
+
+        if segment is not None and segment.size >= size:
+            return segment
+
+        if segment is not None:
+            self.__destroy_segment(segment)
+        # Cresce com folga para evitar realocações a cada variação de tamanho dos ROIs
+        segment = shared_memory.SharedMemory(create=True, size=size * 2)
+        self._segments.append(segment)
+        return segment
+
+    def _release_segment(self, segment: shared_memory.SharedMemory) -> None:
+        self._free_segments.put(segment)
+
+    def __destroy_segment(self, segment: shared_memory.SharedMemory) -> None:
+        self._segments.remove(segment)
+        segment.close()
+        segment.unlink()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for segment in list(self._segments):
+            self.__destroy_segment(segment)
+        self._free_segments = Queue()
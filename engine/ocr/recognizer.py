@@ -0,0 +1,24 @@
+import numpy as np
+
+from typing import List
+
+
+class Recognizer:
+    """
+    Backend de OCR de um ROI.
+
+    Todos os backends (EasyOCR, ONNX Runtime, Tesseract, sete segmentos) recebem o recorte do ROI
+    e devolvem tuplas no formato de `easyocr.Reader.readtext`: (bbox, text, prob), com bbox em
+    coordenadas do recorte. O nome identifica o backend no layout salvo (`RoiSettings.engine`)
+    e na calibração; `text_height` é a altura de recorte com que o backend lê melhor (None: o
+    recorte é entregue no tamanho original).
+    """
+    name = None
+    text_height = None
+
+    def readtext(self, image: np.ndarray) -> List[tuple]:
+        raise NotImplementedError
+
+    def recognize_batch(self, images: List[np.ndarray]) -> List[List[tuple]]:
+        # Backends que processam vários recortes em uma única inferência sobrescrevem este método
+        return [self.readtext(image) for image in images]
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import cv2
+import numpy as np
+
+from collections import OrderedDict
+from typing import List, Optional
+
+from configurations.constants import (DEFAULT_FINGERPRINT_BITS, DEFAULT_RESULT_CACHE_BYTES,
+                                      DEFAULT_RESULT_CACHE_ENTRIES)
+
+# Estimativa de memória por entrada: chave, tuplas, caixas (4 pontos) e estruturas do dicionário
+ENTRY_OVERHEAD_BYTES = 240
+RESULT_OVERHEAD_BYTES = 320
+
+
+class OCRResultCache:
+
+    def __init__(self, max_entries=DEFAULT_RESULT_CACHE_ENTRIES, max_bytes=DEFAULT_RESULT_CACHE_BYTES,
+                 quantization_bits=DEFAULT_FINGERPRINT_BITS):
+        """
+        Cache LRU limitado de resultados de OCR, endereçado pelo conteúdo do recorte.
+
+        O monitor alterna entre poucas imagens de dígitos, então o mesmo recorte aparece
+        milhares de vezes: um acerto no cache evita a rede neural por completo.
+
+        Args:
+            max_entries (int): Número máximo de entradas.
+            max_bytes (int): Limite estimado de memória ocupada pelas entradas.
+            quantization_bits (int): Bits mantidos por pixel na impressão digital (1-8).
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.quantization_bits = min(8, max(1, quantization_bits))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # fingerprint -> (results, size)
+        self._lock = threading.Lock()
+
+    def fingerprint(self, gray_crop: np.ndarray) -> bytes:
+        """
+        Impressão digital do recorte: contraste normalizado, quantizado e resumido com BLAKE2b.
+
+        A normalização e a quantização absorvem pequenas variações de exposição e ruído do
+        sensor, mantendo a forma dos dígitos.
+
+        Args:
+            gray_crop (np.ndarray): Recorte em tons de cinza (uint8).
+        Returns:
+            bytes: Impressão digital de 16 bytes.
+        """
+        normalized = cv2.normalize(gray_crop, None, 0, 255, cv2.NORM_MINMAX)
+        quantized = np.right_shift(normalized, 8 - self.quantization_bits)
+
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        digest.update(np.asarray(gray_crop.shape[:2], dtype=np.int32).tobytes())
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[List[tuple]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, results: List[tuple]) -> None:
+        size = ENTRY_OVERHEAD_BYTES + sum(RESULT_OVERHEAD_BYTES + len(text) for _bbox, text, _prob in results)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            self._entries[key] = (results, size)
+            self.current_bytes += size
+
+            # Remove as entradas menos usadas até respeitar os limites
+            while self._entries and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+                _key, (_results, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
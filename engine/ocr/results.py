@@ -0,0 +1,18 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class RoiResult(NamedTuple):
+    """
+    Resultado do OCR para um único ROI: caixa do ROI e tuplas (bbox, text, prob) do reconhecedor.
+    `cached` indica que o valor foi reaproveitado de um quadro anterior sem executar o OCR.
+    """
+    roi: Tuple[int, int, int, int]
+    results: List[tuple]
+    cached: bool = False
+
+
+class FrameResult(NamedTuple):
+    """Resultado do OCR para um quadro completo, com o instante da captura (time.monotonic)."""
+    frame_id: int
+    capture_time: Optional[float]
+    roi_results: List[RoiResult]
@@ -0,0 +1,207 @@
+import cv2
+import numpy as np
+
+from typing import Dict, List, Optional
+
+from .recognizer import Recognizer
+
+# Regiões de amostragem de cada segmento, relativas à célula do dígito: (y0, y1, x0, x1)
+#
+#      a
+#    f   b
+#      g
+#    e   c
+#      d
+SEGMENT_REGIONS = np.array([
+    (0.00, 0.16, 0.25, 0.75),  # a
+    (0.12, 0.45, 0.65, 1.00),  # b
+    (0.55, 0.88, 0.65, 1.00),  # c
+    (0.84, 1.00, 0.25, 0.75),  # d
+    (0.55, 0.88, 0.00, 0.35),  # e
+    (0.12, 0.45, 0.00, 0.35),  # f
+    (0.42, 0.58, 0.25, 0.75),  # g
+])
+
+SEGMENT_PATTERNS = {
+    "0": (1, 1, 1, 1, 1, 1, 0),
+    "1": (0, 1, 1, 0, 0, 0, 0),
+    "2": (1, 1, 0, 1, 1, 0, 1),
+    "3": (1, 1, 1, 1, 0, 0, 1),
+    "4": (0, 1, 1, 0, 0, 1, 1),
+    "5": (1, 0, 1, 1, 0, 1, 1),
+    "6": (1, 0, 1, 1, 1, 1, 1),
+    "7": (1, 1, 1, 0, 0, 0, 0),
+    "8": (1, 1, 1, 1, 1, 1, 1),
+    "9": (1, 1, 1, 1, 0, 1, 1),
+    "-": (0, 0, 0, 0, 0, 0, 1),
+}
+PATTERN_CHARACTERS = list(SEGMENT_PATTERNS.keys())
+PATTERN_MATRIX = np.array(list(SEGMENT_PATTERNS.values()), dtype=np.int8)
+
+SEGMENT_ON_RATIO = 0.4  # Fração de pixels acesos para considerar o segmento ligado
+ONE_ASPECT_RATIO = 0.3  # Células mais estreitas que isso (largura / altura) são o dígito "1"
+DOT_HEIGHT_RATIO = 0.3  # Células mais baixas que isso (em relação à linha) são ponto decimal
+MIN_COLUMN_RATIO = 0.04  # Fração mínima da altura com tinta para a coluna pertencer a um dígito
+TEMPLATE_SIZE = (16, 24)  # Largura, altura usadas na correlação com os modelos
+
+
+class SevenSegmentRecognizer(Recognizer):
+    name = "seven_segment"
+
+    def __init__(self, templates: Optional[Dict[str, np.ndarray]] = None, min_confidence=0.0):
+        """
+        Reconhecedor leve para displays de sete segmentos ou fontes fixas de LCD.
+
+        O ROI é binarizado (Otsu), dividido em células de dígito pela projeção das colunas e
+        cada célula é classificada pelo estado dos sete segmentos. Se `templates` for informado
+        (caractere -> imagem do caractere), a classificação usa correlação normalizada com os
+        modelos, adequada a fontes fixas que não são de sete segmentos.
+
+        O retorno segue o formato de `easyocr.Reader.readtext`: lista de (bbox, text, prob).
+
+        Args:
+            templates (Dict[str, np.ndarray]): Modelos de caracteres em tons de cinza (opcional).
+            min_confidence (float): Resultados abaixo desta confiança são descartados.
+        """
+        self.min_confidence = min_confidence
+        self.template_characters = []
+        self.template_matrix = None
+        if templates:
+            self.set_templates(templates)
+
+    def set_templates(self, templates: Dict[str, np.ndarray]) -> None:
+        self.template_characters = list(templates.keys())
+        vectors = [self.__normalized_vector(self.__binarize(template)) for template in templates.values()]
+        self.template_matrix = np.stack(vectors)
+
+    def readtext(self, image: np.ndarray) -> List[tuple]:
+        """
+        Reconhece o texto de um ROI.
+
+        Args:
+            image (np.ndarray): ROI em tons de cinza ou BGR.
+        Returns:
+            List[tuple]: [(bbox, text, prob)] em coordenadas do ROI, ou lista vazia.
+        """
+        if image is None or image.size == 0:
+            return []
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        mask = self.__binarize(image)
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size == 0:
+            return []
+
+        # Recorta a linha de texto na vertical; todas as células compartilham essa altura
+        top, bottom = rows[0], rows[-1] + 1
+        line = mask[top:bottom]
+        line_height = bottom - top
+
+        characters = []
+        confidences = []
+        left = right = None
+        for x0, x1 in self.__split_cells(line):
+            cell = line[:, x0:x1]
+            character, confidence = self.__classify_cell(cell, line_height)
+            if character is None:
+                continue
+            characters.append(character)
+            confidences.append(confidence)
+            left = x0 if left is None else left
+            right = x1
+
+        if not characters:
+            return []
+
+        confidence = float(np.mean(confidences))
+        if confidence < self.min_confidence:
+            return []
+
+        bbox = [[int(left), int(top)], [int(right), int(top)], [int(right), int(bottom)], [int(left), int(bottom)]]
+        return [(bbox, "".join(characters), confidence)]
+
+    def __binarize(self, gray: np.ndarray) -> np.ndarray:
+        """Binariza por Otsu (vetorizado) e garante que os dígitos sejam o primeiro plano (minoria)."""
+        histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        levels = np.arange(256)
+
+        weight_background = np.cumsum(histogram)
+        weight_foreground = weight_background[-1] - weight_background
+        cumulative_mean = np.cumsum(histogram * levels)
+        mean_background = cumulative_mean / np.maximum(weight_background, 1)
+        mean_foreground = (cumulative_mean[-1] - cumulative_mean) / np.maximum(weight_foreground, 1)
+        between_variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+
+        mask = gray > int(np.argmax(between_variance))
+        if mask.mean() > 0.5:
+            mask = ~mask
+        return mask
+
+    def __split_cells(self, line: np.ndarray):
+        """Divide a linha em células contíguas de colunas com tinta."""
+        min_pixels = max(1, int(round(line.shape[0] * MIN_COLUMN_RATIO)))
+        columns = np.concatenate(([False], line.sum(axis=0) >= min_pixels, [False]))
+        edges = np.flatnonzero(np.diff(columns.astype(np.int8)))
+        return zip(edges[0::2], edges[1::2])
+
+    def __classify_cell(self, cell: np.ndarray, line_height: int):
+        height, width = cell.shape
+        rows = np.flatnonzero(cell.any(axis=1))
+        ink_height = rows[-1] - rows[0] + 1
+
+        # Célula baixa: ponto decimal (encostado na base) ou sinal de menos (no meio da linha)
+        if ink_height < line_height * DOT_HEIGHT_RATIO:
+            if rows[0] > line_height / 2:
+                return ".", 1.0
+            if width > ink_height * 2:
+                return "-", 1.0
+            return None, 0.0
+
+        if self.template_matrix is not None:
+            return self.__match_template(cell)
+
+        # "1" ocupa somente a coluna dos segmentos b e c
+        if width < height * ONE_ASPECT_RATIO:
+            return "1", float(min(1.0, cell.mean() / SEGMENT_ON_RATIO))
+
+        fill = self.__segment_fill(cell)
+        states = (fill >= SEGMENT_ON_RATIO).astype(np.int8)
+        margins = np.clip(np.abs(fill - SEGMENT_ON_RATIO) / SEGMENT_ON_RATIO, 0.0, 1.0)
+
+        distances = np.abs(PATTERN_MATRIX - states).sum(axis=1)
+        best = int(np.argmin(distances))
+        confidence = float(margins.mean()) * 0.5 ** int(distances[best])
+        return PATTERN_CHARACTERS[best], confidence
+
+    def __segment_fill(self, cell: np.ndarray) -> np.ndarray:
+        """Fração de pixels acesos em cada uma das sete regiões, via imagem integral."""
+        height, width = cell.shape
+        integral = np.zeros((height + 1, width + 1), dtype=np.int32)
+        integral[1:, 1:] = cell.astype(np.int32).cumsum(axis=0).cumsum(axis=1)
+
+        y0 = np.floor(SEGMENT_REGIONS[:, 0] * height).astype(int)
+        y1 = np.maximum(np.ceil(SEGMENT_REGIONS[:, 1] * height).astype(int), y0 + 1)
+        x0 = np.floor(SEGMENT_REGIONS[:, 2] * width).astype(int)
+        x1 = np.maximum(np.ceil(SEGMENT_REGIONS[:, 3] * width).astype(int), x0 + 1)
+        y1 = np.minimum(y1, height)
+        x1 = np.minimum(x1, width)
+
+        ink = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        area = np.maximum((y1 - y0) * (x1 - x0), 1)
+        return ink / area
+
+    def __normalized_vector(self, mask: np.ndarray) -> np.ndarray:
+        rows = np.flatnonzero(mask.any(axis=1))
+        columns = np.flatnonzero(mask.any(axis=0))
+        if rows.size:
+            mask = mask[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+        resized = cv2.resize(mask.astype(np.float32), TEMPLATE_SIZE, interpolation=cv2.INTER_AREA).ravel()
+        resized -= resized.mean()
+        norm = np.linalg.norm(resized)
+        return resized / norm if norm > 0 else resized
+
+    def __match_template(self, cell: np.ndarray):
+        scores = self.template_matrix @ self.__normalized_vector(cell)
+        best = int(np.argmax(scores))
+        return self.template_characters[best], float(max(0.0, scores[best]))
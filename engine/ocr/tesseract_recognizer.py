@@ -0,0 +1,52 @@
+import cv2
+import numpy as np
+
+from typing import List
+
+from configurations.constants import (DEFAULT_DIGITS_ALLOWLIST, DEFAULT_TESSERACT_PAGE_SEGMENTATION,
+                                      DEFAULT_TESSERACT_TEXT_HEIGHT)
+from .recognizer import Recognizer
+
+
+class TesseractRecognizer(Recognizer):
+    name = "tesseract"
+    text_height = DEFAULT_TESSERACT_TEXT_HEIGHT
+
+    def __init__(self, allowlist=DEFAULT_DIGITS_ALLOWLIST, page_segmentation=DEFAULT_TESSERACT_PAGE_SEGMENTATION):
+        """
+        Backend sobre o Tesseract (pytesseract), opcional.
+
+        Requer o pacote `pytesseract` e o executável `tesseract` instalados; caso contrário o
+        construtor levanta ImportError e o backend fica de fora da calibração.
+
+        Args:
+            allowlist (str): Caracteres permitidos (tessedit_char_whitelist).
+            page_segmentation (int): Modo de segmentação (--psm); 7 trata o ROI como uma linha.
+        """
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+        except Exception as error:
+            raise ImportError("The Tesseract backend requires pytesseract and the tesseract executable") from error
+
+        self.pytesseract = pytesseract
+        self.config = f"--psm {page_segmentation}"
+        if allowlist:
+            self.config += f" -c tessedit_char_whitelist={allowlist}"
+
+    def readtext(self, image: np.ndarray) -> List[tuple]:
+        if image is None or image.size == 0:
+            return []
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        data = self.pytesseract.image_to_data(image, config=self.config, output_type=self.pytesseract.Output.DICT)
+        results = []
+        for text, confidence, left, top, width, height in zip(data["text"], data["conf"], data["left"], data["top"],
+                                                              data["width"], data["height"]):
+            confidence = float(confidence)
+            if not text.strip() or confidence < 0:
+                continue
+            bbox = [[left, top], [left + width, top], [left + width, top + height], [left, top + height]]
+            results.append((bbox, text.strip(), confidence / 100.0))
+        return results
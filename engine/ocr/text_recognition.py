@@ -1,19 +1,52 @@
 import cv2
-import easyocr
-import pandas as pd
 import numpy as np
 import re
 import threading
 import time
-import json
 
-from icecream import ic
-from queue import Queue
-from typing import List
+from queue import Empty
+from typing import List, Optional
 
-from common import BasicGeometrics, FloatingRectangle, VideoCapture
+from common import (BasicGeometrics, DroppingQueue, FloatingRectangle, LayoutLibrary, LiveFeedServer, RoiLayout,
+                    RoiLayoutProvider, RoiSettings, StageProfiler, VideoCapture, WindowAggregator, WindowRecord,
+                    lazy_import)
+from icecream import ic
 from configurations.constants import DEFAULT_COLOR_DETECTION_TEXT as GREEN
-from configurations.debug_flag_control import ENABLE_VISUAL_GEOMETRIC_DETECTORS
+from configurations.constants import DEFAULT_COLOR_ERROR_TEXT as RED
+from configurations.constants import (DEFAULT_AGGREGATION_WINDOW, DEFAULT_CALIBRATION_MIN_AGREEMENT,
+                                      DEFAULT_CALIBRATION_MIN_CONFIDENCE, DEFAULT_CHANGE_THRESHOLD, DEFAULT_DIGITS_ALLOWLIST,
+                                      DEFAULT_EVENT_QUEUE_SIZE, DEFAULT_FRAME_QUEUE_SIZE, DEFAULT_LAYOUT_MODEL,
+                                      DEFAULT_ONNX_INTER_OP_THREADS, DEFAULT_ONNX_INTRA_OP_THREADS,
+                                      DEFAULT_RECOGNIZER_TEXT_HEIGHT, DEFAULT_RESULT_CACHE_ENTRIES, ENGINE_MODE_DETECT, ENGINE_MODE_RECOGNIZE,
+                                      ENGINE_MODES, ROI_ROLES)
+from configurations.debug_flag_control import ENABLE_STAGE_PROFILING, ENABLE_VISUAL_GEOMETRIC_DETECTORS
+from sinks import (ConsoleSink, CsvSink, HttpSink, LatestValueSink, LiveFeedSink, Reading, ResultBus, Sink,
+                   TimeSeriesSink)
+from storage import BufferedReadingWriter, TimeSeriesStore
+from .batching import discard_padding_detections, pad_to_common_shape
+from .calibration import RecognizerCalibrator
+from .change_detector import RoiChangeDetector
+from .easyocr_recognizer import EasyOCRRecognizer
+from .onnx_recognizer import OnnxRecognizer
+from .preprocessing import RoiPreprocessor, unscale_results
+from .process_pool import OCRProcessPool
+from .recognizer import Recognizer
+from .result_cache import OCRResultCache
+from .results import FrameResult, RoiResult
+from .seven_segment import SevenSegmentRecognizer
+from .tesseract_recognizer import TesseractRecognizer
+
+# Dependência pesada: carregada no primeiro uso. O LazyLoader não é thread-safe antes do Python
+# 3.12.3, então o módulo só pode ser acessado pela thread de carga do motor (__load_engine)
+easyocr = lazy_import("easyocr")
+
+# Backends leves que um layout salvo (RoiSettings.engine) ou a calibração podem atribuir a um ROI: nome -> fábrica
+RECOGNIZER_BACKENDS = {
+    SevenSegmentRecognizer.name: lambda allowlist: SevenSegmentRecognizer(),
+    TesseractRecognizer.name: TesseractRecognizer,
+}
+# Motores principais, carregados em segundo plano; um ROI atribuído a qualquer um deles usa o que estiver carregado
+MAIN_ENGINES = (EasyOCRRecognizer.name, OnnxRecognizer.name)
 
 
 class TextRecognition:
@@ -22,12 +55,85 @@ class TextRecognition:
         "Select the maximum value"
     ]
 
-    def __init__(self, video_source, language="en"):
+    def __init__(self, video_source, language="en", batched=True, change_threshold=DEFAULT_CHANGE_THRESHOLD,
+                 result_cache_entries=DEFAULT_RESULT_CACHE_ENTRIES, engine_mode=ENGINE_MODE_DETECT,
+                 allowlist=DEFAULT_DIGITS_ALLOWLIST, workers=0, realtime_replay=False,
+                 profiling=ENABLE_STAGE_PROFILING, store_directory=None, live_feed_port=None,
+                 aggregation_window=DEFAULT_AGGREGATION_WINDOW, upload_url=None, upload_spool=None,
+                 onnx_model=None, intra_op_threads=DEFAULT_ONNX_INTRA_OP_THREADS,
+                 inter_op_threads=DEFAULT_ONNX_INTER_OP_THREADS, calibration_frames=0,
+                 calibration_agreement=DEFAULT_CALIBRATION_MIN_AGREEMENT,
+                 calibration_confidence=DEFAULT_CALIBRATION_MIN_CONFIDENCE, contrast=False, binarize=False):
+        if engine_mode not in ENGINE_MODES:
+            raise ValueError(f"Invalid engine mode: {engine_mode}. Expected one of {ENGINE_MODES}")
+        if onnx_model is not None and (engine_mode != ENGINE_MODE_RECOGNIZE or workers > 0):
+            # O modelo ONNX contém somente o reconhecedor, e usa as threads do ONNX Runtime em vez de processos
+            raise ValueError(f"The ONNX backend requires engine_mode='{ENGINE_MODE_RECOGNIZE}' and workers=0")
+        if calibration_frames > 0 and workers > 0:
+            raise ValueError("Recognizer calibration requires workers=0")
+
+        self.started_at = time.monotonic()
+        self.startup_timings = {}  # Marco -> segundos desde a construção
         self.geometric = BasicGeometrics()
-        self.reader = easyocr.Reader([language])
-        self.video_capture = VideoCapture(video_source)
+        self.profiler = StageProfiler(enabled=profiling)
+        # O modelo é carregado e aquecido em segundo plano: a janela abre e mostra a câmera na hora.
+        # Com workers > 0 a inferência roda em processos separados, cada um com seu próprio Reader
+        self.process_pool = None
+        self.recognizer = None  # Backend principal (Recognizer); None com o pool de processos
+        self.backends = {}  # Nome -> backend leve, compartilhado pelos ROIs
+        self.engine_ready = threading.Event()
+        self.engine_error = None
+        # Reconhecedor int8 no ONNX Runtime no lugar do easyocr/torch (somente no modo "recognize")
+        self.onnx_model = onnx_model
+        self.onnx_threads = (intra_op_threads, inter_op_threads)
+        # Calibração: nos primeiros quadros, cada ROI sem backend definido é lido por todos os backends
+        self.calibration_options = (calibration_frames, calibration_agreement, calibration_confidence)
+        self.calibrator = None
+        self.calibrated_rois = set()
+        self.engine_thread = threading.Thread(target=self.__load_engine, args=(language, workers))
+        self.engine_thread.daemon = True
+        self.batched = batched
+        self.engine_mode = engine_mode
+        self.allowlist = allowlist
+        # Tons de cinza uma vez por quadro e recortes na altura ideal de cada backend, em buffers reaproveitados
+        self.preprocessor = RoiPreprocessor(contrast, binarize)
+        self.calibration_preprocessor = RoiPreprocessor(contrast, binarize)  # Um recorte por altura dos candidatos
+        self.change_detector = RoiChangeDetector(change_threshold)
+        self.last_roi_results = {}  # ROI -> último resultado recalculado
+        self.roi_recognizers = {}  # Índice do ROI -> backend leve (ex.: SevenSegmentRecognizer)
+        self.roi_engines = {}  # Índice do ROI -> nome do backend (layout salvo, set_roi_recognizer ou calibração)
+        self.roi_roles = {}  # Índice do ROI -> papel definido no layout (sem entrada: ordem do assistente)
+        self.result_cache = OCRResultCache(result_cache_entries) if result_cache_entries > 0 else None
+        self.video_capture = VideoCapture(video_source, threaded=True, realtime=realtime_replay)
         self.floating_rectangle = FloatingRectangle("Text Recognition")
-        self.event_queue = Queue()
+        self.frame_queue = DroppingQueue(maxsize=DEFAULT_FRAME_QUEUE_SIZE)  # Display -> OCR
+        self.event_queue = DroppingQueue(maxsize=DEFAULT_EVENT_QUEUE_SIZE)  # OCR -> consumidor
+        self.aggregator = WindowAggregator(aggregation_window)  # Uma linha por unidade e janela
+        self.alarm_limits = {}  # Unidade -> últimos limites lidos {"min", "max"} (thread do consumidor)
+        self.latest_result = None
+        self.result_listeners = []  # Chamados na thread de OCR a cada FrameResult concluído
+        self.reading_writer = BufferedReadingWriter()
+        self.timeseries_store = TimeSeriesStore(store_directory) if store_directory else None
+        # Envio das leituras em tempo real (SSE) para o RealTimePlotter, sem passar pelo CSV
+        self.live_feed = LiveFeedServer(port=live_feed_port) if live_feed_port is not None else None
+        if self.live_feed is not None:
+            self.live_feed.start()
+        # Cada saída das leituras é um sink com thread e fila próprias: uma saída lenta não atrasa o OCR
+        self.result_bus = ResultBus()
+        self.latest_values = self.result_bus.register(LatestValueSink())
+        self.result_bus.register(ConsoleSink())
+        self.result_bus.register(CsvSink(self.reading_writer, self.profiler))
+        if self.timeseries_store is not None:
+            self.result_bus.register(TimeSeriesSink(self.timeseries_store))
+        if self.live_feed is not None:
+            self.result_bus.register(LiveFeedSink(self.live_feed))
+        if upload_url:
+            # Envio em lote por conexões persistentes; durante quedas as leituras vão para `upload_spool`
+            self.result_bus.register(HttpSink(upload_url, spool_path=upload_spool))
+        self.layout_provider = None
+        self.layout_library = None
+        self.layout_model = DEFAULT_LAYOUT_MODEL
+        self.applied_layout = None
         self.rois = []
         self.deleted_rois = []
         self.drawing = False
@@ -39,65 +145,342 @@ class TextRecognition:
         self.delayed_processing_thread = threading.Thread(target=self.__delayed_processing)
         self.delayed_processing_thread.daemon = True
         self.delayed_processing_thread.start()
+        self.ocr_thread = threading.Thread(target=self.__ocr_worker)
+        self.ocr_thread.daemon = True
+        self.ocr_thread.start()
         self.label_text = ""
+        self.unit_name = ""
         self.start_time = None
+        self.engine_thread.start()
 
     def start(self):
         self.display_window()
 
-    def __process_filtered_values(self, filtered_values: List[float]) -> None:
-        # Adicione os valores filtrados à fila de processamento
-        self.event_queue.put((filtered_values))
+    def __load_engine(self, language: str, workers: int) -> None:
+        """
+        Carrega o motor de OCR e executa uma inferência de aquecimento, fora da thread de exibição.
+        """
+        try:
+            if workers > 0:
+                process_pool = OCRProcessPool(workers, language, self.engine_mode, self.allowlist)
+                process_pool.warm_up()
+                self.process_pool = process_pool
+            else:
+                if self.onnx_model is not None:
+                    intra_op_threads, inter_op_threads = self.onnx_threads
+                    recognizer = OnnxRecognizer(self.onnx_model, self.allowlist, intra_op_threads, inter_op_threads)
+                else:
+                    recognizer = EasyOCRRecognizer(easyocr.Reader([language]), self.engine_mode, self.allowlist)
+                self.__warm_up(recognizer)
+                self.recognizer = recognizer
+                self.calibrator = self.__create_calibrator(recognizer)
+        except Exception as error:
+            self.engine_error = error
+            ic.configureOutput(prefix="[ERROR] OCR Engine\t", includeContext=False)
+            ic(repr(error))
+        finally:
+            self.engine_ready.set()
+
+        self.__mark_startup("engine_ready")
+        if not self.running and self.process_pool is not None:
+            self.process_pool.close()  # Encerrado durante a carga
+
+    @staticmethod
+    def __warm_up(recognizer: Recognizer) -> None:
+        # A primeira inferência aloca buffers e compila caminhos do torch; paga esse custo antes do 1º quadro
+        sample = np.zeros((48, 160), dtype=np.uint8)
+        cv2.putText(sample, "120", (8, 38), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 255, 2)
+        recognizer.readtext(sample)
+
+    def __create_calibrator(self, recognizer: Recognizer) -> Optional[RecognizerCalibrator]:
+        frames, agreement, confidence = self.calibration_options
+        if frames <= 0:
+            return None
+        candidates = {recognizer.name: recognizer}
+        for name in RECOGNIZER_BACKENDS:
+            try:
+                candidates[name] = self.__backend(name)
+            except ImportError:
+                continue  # Backend opcional não instalado (ex.: Tesseract)
+        return RecognizerCalibrator(candidates, recognizer.name, frames, agreement, confidence)
 
-    def __save_data_in_interval(self, unit_name: str, unit_values: List[float]) -> None:
+    def __backend(self, name: str) -> Recognizer:
+        """Instância compartilhada de um backend leve; ImportError se ele não estiver instalado."""
+        backend = self.backends.get(name)
+        if backend is None:
+            backend = RECOGNIZER_BACKENDS[name](self.allowlist)
+            self.backends[name] = backend
+        return backend
+
+    def __resolve_engine(self, index: int, name: str) -> Optional[Recognizer]:
+        """
+        Backend leve de um ROI pelo nome, ou None para o motor principal (caminho em lote).
+
+        Raises:
+            ValueError: Nome desconhecido ou backend não instalado.
+        """
+        if name in MAIN_ENGINES:
+            return None
+        if name not in RECOGNIZER_BACKENDS:
+            raise ValueError(f"Invalid engine for ROI {index}: {name}. "
+                             f"Expected one of {MAIN_ENGINES + tuple(RECOGNIZER_BACKENDS)}")
+        try:
+            return self.__backend(name)
+        except ImportError as error:
+            raise ValueError(f"Engine {name} for ROI {index} is not available: {error}") from error
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
         """
-        Salve os dados em um arquivo CSV
-        Salva os dados em um determinado intervalo de tempo: 15s, 30s, 1m, 30m, 3h, 1h, 6h, 12h, 24h
+        Aguarda o motor de OCR terminar de carregar.
+
+        Returns:
+            bool: True se o motor está pronto para uso (False em timeout ou falha na carga).
+        """
+        return self.engine_ready.wait(timeout) and self.engine_error is None
+
+    def __mark_startup(self, milestone: str) -> None:
+        if milestone in self.startup_timings:
+            return
+        elapsed = time.monotonic() - self.started_at
+        self.startup_timings[milestone] = elapsed
+        ic.configureOutput(prefix="[INFO] Startup\t", includeContext=False)
+        ic(f"{milestone}: {elapsed:.2f}s")
+
+    def startup_report(self) -> dict:
+        """
+        Tempos de inicialização, em segundos desde a construção: first_frame (primeiro quadro
+        capturado), engine_ready (modelo carregado e aquecido), first_result (primeiro quadro
+        reconhecido) e first_reading (primeira leitura publicada).
+        """
+        return dict(self.startup_timings)
+
+    def stop(self) -> None:
+        """
+        Solicita o encerramento do pipeline; seguro para ser chamado de um tratador de sinal.
+
+        Só altera a flag: nenhuma trava é adquirida aqui (o sinal pode chegar enquanto a thread
+        principal segura a trava de uma fila). O laço de captura percebe a flag em até 1 s e
+        acorda as outras threads ao liberar os recursos.
+        """
+        self.running = False
+
+    @staticmethod
+    def to_unit_name(label: str) -> str:
+        return label.strip().upper().replace(" ", "_")
+
+    def apply_layout(self, layout: RoiLayout) -> None:
+        """
+        Aplica um layout salvo, pulando o assistente interativo de seleção de ROIs.
+
+        Se o layout traz a configuração dos ROIs, os backends definidos nela (ex.: "seven_segment")
+        substituem os definidos antes. As escolhas de uma calibração anterior são descartadas.
 
         Args:
-            unit_name (str): Nome da unidade
-            unit_values (List[float]): Lista de valores da unidade
-            interval (int): Intervalo de tempo em segundos
+            layout (RoiLayout): ROIs, rótulo da unidade e configuração de cada ROI.
         """
-        if self.start_time is None:
-            self.start_time = time.time()
+        if layout.settings:
+            recognizers = {}
+            engines = {}
+            for index, settings in enumerate(layout.settings):
+                if not settings.engine:
+                    continue
+                recognizer = self.__resolve_engine(index, settings.engine)
+                if recognizer is not None:
+                    recognizers[index] = recognizer
+                engines[index] = settings.engine
+            self.roi_recognizers = recognizers
+            self.roi_engines = engines
+            if self.result_cache is not None:
+                self.result_cache.clear()
+        else:
+            for index in self.calibrated_rois:
+                self.roi_recognizers.pop(index, None)
+                self.roi_engines.pop(index, None)
+        self.calibrated_rois = set()
+        if self.calibrator is not None:
+            self.calibrator.reset()
+        self.preprocessor.reset()
+        self.calibration_preprocessor.reset()
 
-        current_time = time.time()
-        elapsed_time = int(current_time - self.start_time)
+        self.roi_roles = {index: layout.roi_settings(index).role for index in range(len(layout.rois))}
+        self.rois = list(layout.rois)
+        self.deleted_rois = []
+        self.label_text = layout.label
+        self.unit_name = self.to_unit_name(layout.label)
+        self.stage = len(self.__class__.stage_texts)
+        self.show_floating_rectangle = False
+        self.last_roi_results.clear()
+        self.change_detector.forget()
+        self.applied_layout = layout
 
-        data_unit = {
-            "unit_name": unit_name,
-            "current": unit_values[0] if unit_values else 0,
-            "min": unit_values[1] if len(unit_values) > 1 else 0,
-            "max": unit_values[2] if len(unit_values) > 2 else 0,
-            "time": elapsed_time
-        }
-        df = pd.DataFrame(data_unit, index=[0])
-        df.to_csv(f"{unit_name}.csv", mode="a", header=False, index=False)
+    def use_layout_provider(self, provider: RoiLayoutProvider) -> bool:
+        """
+        Passa a seguir o layout mantido por um servidor de ROIs.
 
-        # Agende a próxima execução
-        #Timer(interval, self._save_data_in_interval, args=[unit_name, unit_values, interval]).start()
+        O layout disponível (cache local ou primeira busca) é aplicado já; as mudanças seguintes
+        são aplicadas pela thread de OCR entre um quadro e outro, nunca no meio de um quadro.
 
-    def __delayed_processing(self) -> None:
+        Args:
+            provider (RoiLayoutProvider): Fonte do layout.
+        Returns:
+            bool: True se já havia um layout para aplicar.
+        """
+        self.layout_provider = provider
+        provider.start()
+        layout = provider.current()
+        if layout is not None:
+            self.apply_layout(layout)
+        return layout is not None
+
+    def __sync_layout(self) -> None:
+        # Leitura de referência, sem rede: o provider revalida em segundo plano
+        layout = self.layout_provider.current()
+        if layout is not None and (self.applied_layout is None or layout.version != self.applied_layout.version):
+            try:
+                self.apply_layout(layout)
+            except ValueError as error:
+                # Layout inválido: mantém o atual e não tenta de novo até a próxima versão
+                self.applied_layout = self.applied_layout._replace(version=layout.version) \
+                    if self.applied_layout is not None else layout
+                ic.configureOutput(prefix="[ERROR] Layout Rejected\t", includeContext=False)
+                ic(repr(error))
+
+    def use_layout_library(self, library: LayoutLibrary, model: str = DEFAULT_LAYOUT_MODEL) -> bool:
         """
-        Processamento atrasado dos valores filtrados, usado para controlar a taxa de processamento.
+        Usa o layout salvo para o modelo de câmera/monitor e salva o layout do assistente ao final.
 
         Args:
-            None.
+            library (LayoutLibrary): Arquivo de layouts.
+            model (str): Modelo da câmera/monitor (chave do layout).
         Returns:
-            None.
+            bool: True se havia um layout salvo (o assistente é pulado).
+        """
+        self.layout_library = library
+        self.layout_model = model
+        layout = library.get(model)
+        if layout is not None:
+            self.apply_layout(layout)
+        return layout is not None
+
+    def __persist_layout(self) -> None:
+        # Salva o layout quando o assistente termina (ou quando ROIs são refeitos depois)
+        if self.layout_library is None or self.stage != len(self.__class__.stage_texts):
+            return
+        layout = self.current_layout()
+        applied = self.applied_layout
+        if applied is not None and (layout.label, layout.rois, layout.settings) == \
+                (applied.label, applied.rois, applied.settings):
+            return
+        self.applied_layout = self.layout_library.put(self.layout_model, layout)
+        ic.configureOutput(prefix="[INFO] Layout Saved\t", includeContext=False)
+        ic(self.layout_model, self.layout_library.path)
+
+    def current_layout(self) -> RoiLayout:
+        settings = tuple(RoiSettings(self.roi_role(index), self.roi_engines.get(index, ""))
+                         for index in range(len(self.rois)))
+        version = self.applied_layout.version if self.applied_layout is not None else 0
+        return RoiLayout(self.unit_name, tuple(tuple(roi) for roi in self.rois), version, settings)
+
+    def run_headless(self) -> None:
+        """
+        Modo de serviço sem interface gráfica: captura -> OCR -> saídas, até `stop()` ou o fim da fonte.
+
+        Requer um layout aplicado com `apply_layout`. Nenhuma chamada de janela do OpenCV é feita
+        e a espera por quadros é bloqueante, sem laços de espera ativa.
+
+        Raises:
+            RuntimeError: O motor de OCR falhou ao carregar (o serviço não fica rodando sem leituras).
+        """
+        if self.stage != len(self.__class__.stage_texts):
+            raise RuntimeError("Headless mode requires a ROI layout; call apply_layout() or use_layout_provider() first")
+
+        last_frame_id = 0
+        while self.running and self.engine_error is None:
+            captured = self.video_capture.wait_for_frame(last_frame_id, timeout=1.0)
+            if captured is None:
+                if not self.video_capture.is_running():
+                    break
+                continue
+
+            last_frame_id, capture_time, frame = captured
+            if "first_frame" not in self.startup_timings:
+                self.__mark_startup("first_frame")
+            self.submit_frame(frame, last_frame_id, capture_time)
+
+        self.stop()
+        self.__release_resources()
+        if self.engine_error is not None:
+            raise RuntimeError(f"OCR engine failed to load: {self.engine_error!r}") from self.engine_error
+
+    def __release_resources(self) -> None:
+        self.frame_queue.put_latest(None)  # Acorda o estágio de OCR bloqueado na fila
+        self.event_queue.put_latest(None)  # Acorda o consumidor para gravar a janela em aberto
+        self.video_capture.release()
+        # O consumidor emite a janela em aberto ao sair; aguarda antes de fechar as saídas
+        if self.delayed_processing_thread.is_alive():
+            self.delayed_processing_thread.join(timeout=2.0)
+        self.result_bus.close()  # Entrega o que estiver pendente e fecha CSV, armazenamento e canal ao vivo
+        if self.layout_provider is not None:
+            self.layout_provider.close()
+        if self.process_pool is not None:
+            self.process_pool.close()
+
+    def __process_filtered_values(self, role_values: dict, capture_time: Optional[float]) -> None:
+        # Adicione os valores do quadro à fila de processamento (descarta o mais antigo se estiver cheia)
+        self.event_queue.put_latest((self.unit_name, time.time(), role_values, capture_time))
+
+    def __delayed_processing(self) -> None:
+        """
+        Consumidor das leituras: agrega tudo o que chega em janelas e publica uma leitura por
+        unidade no barramento de resultados quando cada janela fecha.
+
+        A espera na fila é bloqueante e dura no máximo até o fechamento da janela corrente, então
+        não há espera ativa e a latência de gravação fica limitada a uma janela.
         """
         while self.running:
-            # Verifique se há valores na fila de processamento
-            if not self.event_queue.empty():
-                filtered_values = (self.event_queue.get())  # Obtenha os valores da fila
-                # Pega somente o nome da unidade, sem o prefixo "Enter the label name: "
-                label = self.text[22:].upper()
-                label = label.replace(" ", "_")
+            timeout = self.aggregator.time_until_close()
+            try:
+                self.__aggregate(self.event_queue.get(timeout=1.0 if timeout is None else max(timeout, 1e-3)))
+                # Consome de uma vez tudo o que já estiver na fila
+                while True:
+                    self.__aggregate(self.event_queue.get_nowait())
+            except Empty:
+                pass
+
+            self.__emit_window_records(self.aggregator.close_due())
 
-                time.sleep(1)  # Delay para controlar a taxa de processamento
-                self.__print_roi_data(label, filtered_values)
-                self.__save_data_in_interval(label, filtered_values)
+        # Encerramento: o que restou na fila e a janela em aberto ainda são gravados
+        try:
+            while True:
+                self.__aggregate(self.event_queue.get_nowait())
+        except Empty:
+            pass
+        self.__emit_window_records(self.aggregator.flush())
+
+    def __aggregate(self, event) -> None:
+        if event is None:
+            return
+        unit_name, timestamp, role_values, capture_time = event
+        # Somente o valor principal é agregado; os limites de alarme valem pela última leitura
+        limits = self.alarm_limits.setdefault(unit_name, {"min": 0.0, "max": 0.0})
+        for role in ("min", "max"):
+            if role in role_values:
+                limits[role] = role_values[role]
+        if "current" in role_values:
+            self.__emit_window_records(self.aggregator.add(unit_name, role_values["current"], timestamp,
+                                                           capture_time))
+
+    def __emit_window_records(self, records: List[WindowRecord]) -> None:
+        for record in records:
+            if self.start_time is None:
+                self.start_time = record.start
+            if "first_reading" not in self.startup_timings:
+                self.__mark_startup("first_reading")
+            started = self.profiler.start()
+            limits = self.alarm_limits.get(record.unit, {})
+            self.result_bus.publish(Reading.from_window(record, self.start_time, limits.get("min", 0.0),
+                                                        limits.get("max", 0.0)))
+            self.profiler.stop("publish", started)
 
     def __extract_label_and_value(self, text):
         """
@@ -113,51 +496,383 @@ class TextRecognition:
         value = parts[1].strip() if len(parts) > 1 else None
         return value
 
-    def __print_roi_data(self, unit_name: str, unit_values: List[float]) -> None:
-        _unit_data_structure = {
-            f"{unit_name}": {
-                "current": unit_values[0] if unit_values else 0,
-                "min": unit_values[1] if len(unit_values) > 1 else 0,
-                "max": unit_values[2] if len(unit_values) > 2 else 0,
-            }
-        }
-        ic.configureOutput(prefix="[INFO] Unit Data Structure\t", includeContext=True)
-        ic(json.dumps(_unit_data_structure, indent=4))
-
-    def read_text(self, frame: np.ndarray) -> None:
-        if frame is None:
+    def submit_frame(self, frame: np.ndarray, frame_id: int = 0, capture_time: Optional[float] = None) -> None:
+        """
+        Entrega um quadro ao estágio de OCR sem bloquear o chamador.
+
+        Apenas o quadro mais recente é mantido: se o OCR ainda estiver ocupado, o quadro
+        pendente anterior é descartado.
+
+        Args:
+            frame (np.ndarray): Quadro BGR capturado.
+            frame_id (int): Identificador sequencial do quadro.
+            capture_time (float): Instante da captura (time.monotonic).
+        """
+        if frame is None or self.stage != len(self.__class__.stage_texts):
             return
+        self.frame_queue.put_latest((frame_id, capture_time, frame))
 
-        if self.stage == len(self.__class__.stage_texts):
-            for roi in self.rois:
-                x, y, w, h = roi
-                cropped_frame = frame[y:y + h, x:x + w]
-                gray_cropped_frame = cv2.cvtColor(cropped_frame, cv2.COLOR_BGR2GRAY)
-                results = self.reader.readtext(gray_cropped_frame)
+    def __ocr_worker(self) -> None:
+        """
+        Estágio de OCR: consome quadros da fila, executa o reconhecimento e publica o resultado.
+        """
+        # Enquanto o modelo carrega, a fila mantém só o quadro mais recente
+        while self.running and not self.engine_ready.wait(timeout=0.5):
+            pass
+        if self.engine_error is not None:
+            return
 
-                list_value = []
+        while self.running:
+            item = self.frame_queue.get()
+            if item is None:  # Sinal de encerramento enviado por stop()
+                break
 
-                for bbox, text, _prob in results:
-                    value = self.__extract_label_and_value(text)
-                    list_value.append(value)
+            frame_id, capture_time, frame = item
+            if self.layout_provider is not None:
+                self.__sync_layout()
+            if self.profiler.enabled and capture_time is not None:
+                # Tempo entre a captura do quadro e o início do OCR (fila + espera)
+                self.profiler.record("capture", int((time.monotonic() - capture_time) * 1e9))
 
-                    self.__process_filtered_values([float(value) if value is not None else 0])
+            frame_result = self.recognize(frame, frame_id, capture_time)
+            if "first_result" not in self.startup_timings and \
+                    any(roi_result.results for roi_result in frame_result.roi_results):
+                self.__mark_startup("first_result")
+            self.latest_result = frame_result
+            self.__publish_frame_result(frame_result)
+            for listener in self.result_listeners:
+                listener(frame_result)
+            self.profiler.maybe_log(self.__log_stage_timings)
 
-                    text_x = x + bbox[0][0]
-                    text_y = y + bbox[0][1]
+    def __log_stage_timings(self, summary: str) -> None:
+        ic.configureOutput(prefix="[INFO] Stage Timings\t", includeContext=False)
+        ic(summary)
 
-                    if ENABLE_VISUAL_GEOMETRIC_DETECTORS:
-                        # Desenha o texto e o retângulo ao redor do texto reconhecido
-                        cv2.rectangle(frame, (text_x, text_y), (x + bbox[2][0], y + bbox[2][1]), GREEN, 1)
-                        cv2.putText(frame, text, (text_x, text_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, GREEN, 1)
+    def stage_timings(self) -> dict:
+        """
+        Estatísticas de tempo por estágio e por ROI (requer `profiling=True` ou `self.profiler.enabled`).
 
-                # Remove valores nulos da lista
-                _filtered_values = [float(item) for item in list_value if item is not None]
+        Returns:
+            dict: Ver `StageProfiler.snapshot`.
+        """
+        return self.profiler.snapshot()
 
-                # ROI
-                self.geometric.rounded_rectangle(frame, (x, y, w, h), thickness_of_line=1)
+    def recognize(self, frame: np.ndarray, frame_id: int = 0, capture_time: Optional[float] = None) -> FrameResult:
+        """
+        Executa o OCR em todos os ROIs do quadro, sem desenhar nada.
+
+        Args:
+            frame (np.ndarray): Quadro BGR.
+            frame_id (int): Identificador sequencial do quadro.
+            capture_time (float): Instante da captura (time.monotonic).
+        Returns:
+            FrameResult: Resultados por ROI, na ordem de `self.rois`.
+        """
+        profiler = self.profiler
+        rois = list(self.rois)
+        started = profiler.start()
+        gray_crops, scales = self.preprocessor.prepare(frame, rois, [self.__text_height(index)
+                                                                     for index in range(len(rois))])
+        profiler.stop("preprocess", started)
+
+        # Somente os ROIs com recorte válido e que mudaram desde o último OCR vão para a inferência
+        roi_results = [RoiResult(roi, []) for roi in rois]
+        pending = []
+        for index, (roi, gray_crop) in enumerate(zip(rois, gray_crops)):
+            if gray_crop is None:
+                continue
+            if roi not in self.last_roi_results:
+                self.change_detector.forget(roi)
+            started = profiler.start()
+            changed = self.change_detector.has_changed(roi, gray_crop)
+            profiler.stop("change_detection", started, index)
+            if changed:
+                pending.append(index)
+            else:
+                roi_results[index] = RoiResult(roi, self.last_roi_results[roi], cached=True)
+
+        # Recortes idênticos a imagens já reconhecidas saem do cache sem passar pela rede neural
+        fingerprints = {}
+        if self.result_cache is not None:
+            misses = []
+            for index in pending:
+                started = profiler.start()
+                fingerprint = self.result_cache.fingerprint(gray_crops[index])
+                results = self.result_cache.get(fingerprint)
+                profiler.stop("cache_lookup", started, index)
+                if results is None:
+                    fingerprints[index] = fingerprint
+                    misses.append(index)
+                else:
+                    self.last_roi_results[rois[index]] = results
+                    roi_results[index] = RoiResult(rois[index], results)
+            pending = misses
+
+        # ROIs sem backend definido passam pela calibração (todos os backends) nos primeiros quadros
+        calibrating = []
+        if self.calibrator is not None:
+            calibrating = [index for index in pending
+                           if index not in self.roi_engines and self.calibrator.is_calibrating(index)]
+            pending = [index for index in pending if index not in calibrating]
+
+        # ROIs com backend leve não passam pelo motor principal
+        dedicated = [index for index in pending if index in self.roi_recognizers]
+        pending = [index for index in pending if index not in self.roi_recognizers]
+        inferred = self.__infer([gray_crops[index] for index in pending], pending)
+        for index in dedicated:
+            started = profiler.start()
+            inferred.append(self.roi_recognizers[index].readtext(gray_crops[index]))
+            profiler.stop("dedicated_recognizer", started, index)
+        for index in calibrating:
+            started = profiler.start()
+            # Cada candidato lê o ROI na sua própria altura de texto, como leria depois de escolhido
+            text_heights = self.calibrator.text_heights
+            crops, crop_scales = self.calibration_preprocessor.prepare(frame, [rois[index]] * len(text_heights),
+                                                                       text_heights)
+            inferred.append(self.calibrator.sample(index, dict(zip(text_heights, zip(crops, crop_scales)))))
+            profiler.stop("calibration", started, index)
+
+        for index, results in zip(pending + dedicated + calibrating, inferred):
+            roi = rois[index]
+            self.last_roi_results[roi] = results
+            roi_results[index] = RoiResult(roi, results)
+            if index in fingerprints:
+                self.result_cache.put(fingerprints[index], results)
+        for index in calibrating:
+            if not self.calibrator.is_calibrating(index):
+                self.__apply_calibration(index, self.calibrator.choice(index))
+
+        # O cache e os últimos resultados ficam na escala do recorte; as caixas publicadas, na do ROI
+        roi_results = [roi_result._replace(results=unscale_results(roi_result.results, scale))
+                       for roi_result, scale in zip(roi_results, scales)]
+        return FrameResult(frame_id, capture_time, roi_results)
+
+    def __text_height(self, index: int) -> Optional[int]:
+        if self.calibrator is not None and index not in self.roi_engines and self.calibrator.is_calibrating(index):
+            return None  # Em calibração: cada candidato prepara o seu recorte e devolve coordenadas do ROI
+        recognizer = self.roi_recognizers.get(index, self.recognizer)
+        if recognizer is None:  # Pool de processos: cada worker usa o EasyOCR
+            return DEFAULT_RECOGNIZER_TEXT_HEIGHT if self.engine_mode == ENGINE_MODE_RECOGNIZE else None
+        return getattr(recognizer, "text_height", None)
+
+    def __infer(self, gray_crops: List[np.ndarray], indices: List[int]) -> List[List[tuple]]:
+        """
+        Executa o reconhecedor sobre os recortes, mantendo a ordem de entrada.
+
+        Args:
+            gray_crops (List[np.ndarray]): Recortes em tons de cinza.
+            indices (List[int]): Índice do ROI de cada recorte (usado na instrumentação).
+        Returns:
+            List[List[tuple]]: Tuplas (bbox, text, prob) de cada recorte.
+        """
+        if not gray_crops:
+            return []
+        if self.process_pool is not None:
+            started = self.profiler.start()
+            batch_results = self.process_pool.map(gray_crops)
+            self.profiler.stop("pool_inference", started)
+            return batch_results
+        if self.batched and len(gray_crops) > 1:
+            if isinstance(self.recognizer, EasyOCRRecognizer) and self.engine_mode == ENGINE_MODE_DETECT:
+                return self.__readtext_batched(gray_crops, indices)
+            if isinstance(self.recognizer, OnnxRecognizer):
+                # Todos os ROIs em uma única execução do modelo ONNX
+                started = self.profiler.start()
+                batch_results = self.recognizer.recognize_batch(gray_crops)
+                self.profiler.stop("recognition", started)
+                return batch_results
+
+        # No modo "recognize" o detector é pulado: o ROI inteiro é uma linha de texto
+        stage = "recognition" if self.engine_mode == ENGINE_MODE_RECOGNIZE else "readtext"
+        batch_results = []
+        for gray_crop, index in zip(gray_crops, indices):
+            started = self.profiler.start()
+            batch_results.append(self.recognizer.readtext(gray_crop))
+            self.profiler.stop(stage, started, index)
+        return batch_results
+
+    def __apply_calibration(self, index: int, choice: str) -> None:
+        recognizer = self.__resolve_engine(index, choice)
+        if recognizer is not None:
+            self.roi_recognizers[index] = recognizer
+        self.roi_engines[index] = choice
+        self.calibrated_rois.add(index)
+        # O novo backend pode ter outra altura de recorte: o último resultado (na escala antiga) é descartado
+        self.last_roi_results.pop(self.rois[index], None)
+        ic.configureOutput(prefix="[INFO] Calibration\t", includeContext=False)
+        ic(index, choice, self.calibrator.report()[index]["backends"])
+
+    def calibration_report(self) -> dict:
+        """
+        Medidas da calibração por ROI: backend escolhido e, para cada backend, latência mediana,
+        concordância com a referência e confiança média.
+        """
+        return self.calibrator.report() if self.calibrator is not None else {}
+
+    def __readtext_batched(self, gray_crops: List[np.ndarray], indices: List[int]) -> List[List[tuple]]:
+        """
+        Detecta o texto de todos os recortes em uma única passada do detector e reconhece cada um.
+
+        Os recortes são empacotados em um tensor preenchido (mesmo fluxo de `Reader.readtext_batched`,
+        mas sem redimensionar), de modo que o custo fixo do detector é pago uma vez por quadro.
+
+        Args:
+            gray_crops (List[np.ndarray]): Recortes em tons de cinza.
+            indices (List[int]): Índice do ROI de cada recorte (usado na instrumentação).
+        Returns:
+            List[List[tuple]]: Tuplas (bbox, text, prob) de cada recorte, em coordenadas do recorte.
+        """
+        started = self.profiler.start()
+        batch = pad_to_common_shape(gray_crops)
+        color_batch = np.repeat(batch[..., np.newaxis], 3, axis=3)
+        reader = self.recognizer.reader
+        horizontal_list_agg, free_list_agg = reader.detect(color_batch, reformat=False)
+        self.profiler.stop("detection", started)
+
+        batch_results = []
+        for gray_crop, padded_crop, horizontal_list, free_list, index in zip(gray_crops, batch, horizontal_list_agg,
+                                                                             free_list_agg, indices):
+            started = self.profiler.start()
+            results = reader.recognize(padded_crop, horizontal_list, free_list, reformat=False)
+            batch_results.append(discard_padding_detections(results, gray_crop.shape))
+            self.profiler.stop("recognition", started, index)
+
+        return batch_results
+
+    def __publish_frame_result(self, frame_result: FrameResult) -> None:
+        # Um evento por quadro, com o valor de cada ROI marcado pelo seu papel; o ROI da unidade é só o rótulo
+        role_values = {}
+        for index, roi_result in enumerate(frame_result.roi_results):
+            role = self.roi_role(index)
+            if role not in ("current", "min", "max"):
+                continue
+            for _bbox, text, _prob in roi_result.results:
+                started = self.profiler.start()
+                value = self.__extract_label_and_value(text)
+                self.profiler.stop("extract_value", started, index)
+                if value is not None:
+                    role_values.setdefault(role, float(value))
+        if role_values:
+            self.__process_filtered_values(role_values, frame_result.capture_time)
+
+    def roi_role(self, index: int) -> str:
+        """Papel do ROI na leitura (unit, current, min, max): o do layout aplicado ou a ordem do assistente."""
+        role = self.roi_roles.get(index)
+        if role:
+            return role
+        return ROI_ROLES[index] if index < len(ROI_ROLES) else ""
+
+    def draw_results(self, frame: np.ndarray, frame_result: Optional[FrameResult]) -> None:
+        """
+        Desenha sobre o quadro o resultado de OCR mais recente já concluído.
+
+        Args:
+            frame (np.ndarray): Quadro BGR onde o resultado será desenhado.
+            frame_result (FrameResult): Resultado a desenhar, ou None.
+        """
+        if frame_result is None:
+            return
+
+        for roi_result in frame_result.roi_results:
+            x, y, w, h = roi_result.roi
+
+            if ENABLE_VISUAL_GEOMETRIC_DETECTORS:
+                for bbox, text, _prob in roi_result.results:
+                    text_x = x + int(bbox[0][0])
+                    text_y = y + int(bbox[0][1])
+
+                    # Desenha o texto e o retângulo ao redor do texto reconhecido
+                    cv2.rectangle(frame, (text_x, text_y), (x + int(bbox[2][0]), y + int(bbox[2][1])), GREEN, 1)
+                    cv2.putText(frame, text, (text_x, text_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, GREEN, 1)
+
+            # ROI
+            self.geometric.rounded_rectangle(frame, (x, y, w, h), thickness_of_line=1)
+
+    def read_text(self, frame: np.ndarray) -> Optional[FrameResult]:
+        """
+        Caminho síncrono: reconhece, publica e desenha o resultado no próprio quadro.
+
+        Args:
+            frame (np.ndarray): Quadro BGR.
+        Returns:
+            FrameResult: Resultado do OCR, ou None se não houver quadro ou ROIs configurados.
+        """
+        if frame is None:
+            return None
+
+        frame_result = None
+        if self.stage == len(self.__class__.stage_texts):
+            self.engine_ready.wait()
+            if self.engine_error is not None:
+                raise RuntimeError("OCR engine failed to load") from self.engine_error
+            frame_result = self.recognize(frame)
+            self.latest_result = frame_result
+            self.__publish_frame_result(frame_result)
+            self.draw_results(frame, frame_result)
 
         self.last_frame = frame
+        return frame_result
+
+    def add_result_listener(self, listener) -> None:
+        """
+        Registra uma função chamada com cada FrameResult concluído pelo estágio de OCR.
+
+        Args:
+            listener (Callable[[FrameResult], None]): Deve ser rápida; roda na thread de OCR.
+        """
+        self.result_listeners.append(listener)
+
+    def set_roi_recognizer(self, roi_index: int, recognizer: Optional[Recognizer]) -> None:
+        """
+        Define o backend de um ROI, no lugar do motor principal.
+
+        Args:
+            roi_index (int): Índice do ROI em `self.rois`.
+            recognizer (Recognizer): Backend (ou objeto com `readtext(image) -> List[(bbox, text, prob)]`),
+                ou None para voltar ao motor principal.
+        """
+        self.calibrated_rois.discard(roi_index)
+        if recognizer is None:
+            self.roi_recognizers.pop(roi_index, None)
+            self.roi_engines.pop(roi_index, None)
+        else:
+            self.roi_recognizers[roi_index] = recognizer
+            self.roi_engines[roi_index] = getattr(recognizer, "name", None) or ""
+
+        # O cache de resultados é indexado por conteúdo, independente do reconhecedor
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        self.last_roi_results.clear()
+
+    def add_sink(self, sink: Sink, **options) -> Sink:
+        """
+        Registra uma saída adicional para as leituras (ver `ResultBus.register`).
+
+        Args:
+            sink (Sink): Destino das leituras; roda em thread própria.
+            **options: buffer_size, batch_size e idle_interval.
+        Returns:
+            Sink: O próprio sink.
+        """
+        return self.result_bus.register(sink, **options)
+
+    def sink_metrics(self) -> dict:
+        """
+        Atraso, descartes e erros de cada saída das leituras.
+
+        Returns:
+            dict: Ver `ResultBus.metrics`.
+        """
+        return self.result_bus.metrics()
+
+    def change_detection_stats(self) -> dict:
+        """
+        Contadores de ROIs pulados e recalculados, para ajuste do limiar de mudança.
+
+        Returns:
+            dict: threshold, skipped, recomputed e skip_ratio.
+        """
+        return self.change_detector.stats()
 
     def _draw_roi(self, frame, roi):
         x, y, w, h = roi
@@ -196,10 +911,16 @@ class TextRecognition:
         cv2.setMouseCallback("Text Recognition", self.on_mouse_events)
 
         label_text = None  # Variável para armazenar o texto digitado
+        last_frame_id = 0
 
         while self.running:
-            ret, frame = self.video_capture.read()
+            # Aguarda o próximo quadro da thread de captura, sem acumular atraso quando o OCR é lento
+            captured = self.video_capture.wait_for_frame(last_frame_id, timeout=0.1)
+            ret = captured is not None
             if ret:
+                last_frame_id, capture_time, frame = captured
+                if "first_frame" not in self.startup_timings:
+                    self.__mark_startup("first_frame")
                 self.display_text_instructions(frame)
                 if (self.stage < len(self.stage_texts) and self.stage_texts[self.stage] == "Enter the label name"):
                     # Se o estágio atual for para digitar a label, chame a função draw_text_input
@@ -213,15 +934,23 @@ class TextRecognition:
                             self._draw_roi(frame, self.current_roi)
                         for roi in self.rois:
                             self.geometric.rounded_rectangle(frame, roi, thickness_of_line=1)
-                    self.read_text(frame)
+                    else:
+                        # O OCR roda em sua própria thread; desenha o último resultado concluído
+                        self.submit_frame(frame.copy(), last_frame_id, capture_time)
+                        self.draw_results(frame, self.latest_result)
+                        if self.engine_error is not None:
+                            cv2.putText(frame, f"OCR engine failed to load: {self.engine_error!r}"[:120], (10, 20),
+                                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, RED, 1)
+                        elif not self.engine_ready.is_set():
+                            cv2.putText(frame, "Loading OCR engine...", (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                                        GREEN, 1)
+                    self.last_frame = frame
 
                     if (self.show_floating_rectangle):  # Verifica se o retângulo flutuante deve ser exibido
                         self.floating_rectangle.draw(frame)
                     cv2.imshow("Text Recognition", frame)
 
                 key = cv2.waitKey(1) & 0xFF
-                if key != 255:  # Verifica se uma tecla foi pressionada
-                    self.event_queue.put(True)  # Informa à thread de processamento que uma tecla foi pressionada
 
                 if key == ord("q"):
                     self.running = False
@@ -233,9 +962,16 @@ class TextRecognition:
                 # Atualize a label_text se houver texto digitado
                 if label_text is not None:
                     self.label_text = label_text
+                    # Somente o nome da unidade, sem o prefixo "Enter the label name: "
+                    self.unit_name = self.to_unit_name(label_text[len("Enter the label name: "):])
                     label_text = None  # Reseta label_text para None após a atribuição
+                self.__persist_layout()
+            elif not self.video_capture.is_running():
+                # Fonte de vídeo encerrada (fim do arquivo ou falha do stream)
+                self.running = False
 
-        self.video_capture.release()
+        self.stop()
+        self.__release_resources()
         cv2.destroyAllWindows()
 
     def display_text_instructions(self, frame):
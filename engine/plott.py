@@ -1,49 +1,266 @@
-import pandas as pd
+import os
+import csv
+import argparse
+import threading
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import time
 
+from common import LiveFeedSubscriber
+from configurations.constants import (DEFAULT_LIVE_FEED_HOST, DEFAULT_LIVE_FEED_PORT, DEFAULT_PLOT_HISTORY_CAPACITY,
+                                      DEFAULT_PLOT_MAX_POINTS, DEFAULT_PLOT_REFRESH_INTERVAL_MS,
+                                      DEFAULT_PLOT_RETENTION_SECONDS, LIVE_FEED_PATH)
+
+VALUE_COLUMNS = ['current', 'min', 'max']
+TIME_COLUMN = 4
+TIMESTAMP_COLUMN = 9  # Instante absoluto da leitura; ausente em CSVs antigos
+SESSION_START_TOLERANCE = 2.0  # `time` é truncado para segundos inteiros: início da sessão varia até 1 s
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: escolhe `threshold` pontos preservando a forma visual da série.
+
+    Args:
+        x (np.ndarray): Tempos em ordem crescente.
+        y (np.ndarray): Valores (NaN permitido).
+        threshold (int): Quantidade de pontos desejada.
+    Returns:
+        np.ndarray: Índices dos pontos escolhidos, em ordem crescente.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # NaN não entra no cálculo das áreas; os valores originais continuam sendo plotados
+    valid = ~np.isnan(y)
+    filled = np.where(valid, y, np.median(y[valid]) if valid.any() else 0.0)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        average_x = x[end:next_end].mean()
+        average_y = filled[end:next_end].mean()
+
+        area = np.abs((x[selected] - average_x) * (filled[start:end] - filled[selected])
+                      - (x[selected] - x[start:end]) * (average_y - filled[selected]))
+        selected = start + int(np.argmax(area))
+        indices[bucket + 1] = selected
+
+    return indices
+
+
+def minmax_indices(y, buckets):
+    """
+    Mantém o mínimo e o máximo de cada faixa (por pixel): preserva picos e degraus.
+
+    Args:
+        y (np.ndarray): Valores (NaN permitido).
+        buckets (int): Quantidade de faixas.
+    Returns:
+        np.ndarray: Índices escolhidos, em ordem crescente.
+    """
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    filled_low = np.where(np.isnan(y), np.inf, y)
+    filled_high = np.where(np.isnan(y), -np.inf, y)
+    indices = []
+    for bucket in np.array_split(np.arange(n), buckets):
+        indices.append(bucket[np.argmin(filled_low[bucket])])
+        indices.append(bucket[np.argmax(filled_high[bucket])])
+    return np.unique(indices)
+
+
+def visible_range(relayout_data):
+    """Intervalo de tempo visível a partir do relayoutData do gráfico, ou None para o histórico todo."""
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return float(relayout_data['xaxis.range[0]']), float(relayout_data['xaxis.range[1]'])
+    if 'xaxis.range' in relayout_data:
+        low, high = relayout_data['xaxis.range']
+        return float(low), float(high)
+    return None
+
+
+class UnitHistory:
+    def __init__(self, capacity):
+        """
+        Histórico de uma unidade em um anel pré-alocado: a memória não cresce com a sessão.
+
+        O eixo de tempo é o `time` das leituras, contado desde o início da sessão do motor, que
+        recomeça do zero quando o motor é reiniciado. Cada leitura informa o início da sua sessão
+        (instante absoluto - `time`): uma sessão mais nova recomeça o histórico, e leituras de uma
+        sessão anterior (ex.: o CSV relido na reconexão) são ignoradas.
+
+        Args:
+            capacity (int): Quantidade máxima de pontos mantidos.
+        """
+        self.capacity = capacity
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty((capacity, len(VALUE_COLUMNS)), dtype=np.float64)
+        self.session_start = None  # Instante absoluto do início da sessão exibida
+        self.reset()
+
+    def reset(self):
+        self.start = 0
+        self.size = 0
+        self.last_values = np.full(len(VALUE_COLUMNS), np.nan)
+
+    def append(self, timestamp, values, session_start=None):
+        """
+        Acrescenta uma leitura.
+
+        Args:
+            timestamp (float): `time` da leitura (segundos desde o início da sessão).
+            values (Sequence[float]): current, min e max.
+            session_start (float): Início da sessão da leitura (segundos desde a época), se conhecido.
+        """
+        if self.size and session_start is not None and self.session_start is not None:
+            if session_start < self.session_start - SESSION_START_TOLERANCE:
+                return  # Sessão anterior à exibida
+            if session_start > self.session_start + SESSION_START_TOLERANCE:
+                self.reset()  # O motor foi reiniciado: a nova sessão recomeça do zero
+        elif self.size and timestamp < self.times[(self.start + self.size - 1) % self.capacity]:
+            self.reset()  # Sem o instante absoluto (CSV antigo): o tempo voltou, nova sessão
+        if not self.size or self.session_start is None:
+            self.session_start = session_start
+
+        # Trata '0' como ausente e repete o último valor válido (equivalente ao ffill)
+        values = np.asarray(values, dtype=np.float64)
+        values = np.where((values == 0) | np.isnan(values), self.last_values, values)
+        self.last_values = np.where(np.isnan(values), self.last_values, values)
+
+        if self.size:
+            last = (self.start + self.size - 1) % self.capacity
+            if timestamp == self.times[last]:
+                # Mesmo instante: mantém a última leitura
+                self.values[last] = values
+                return
+            if timestamp < self.times[last]:
+                return
+
+        position = (self.start + self.size) % self.capacity
+        self.times[position] = timestamp
+        self.values[position] = values
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def arrays(self, retention_seconds=None):
+        """
+        Retorna tempos e valores em ordem cronológica, opcionalmente limitados à janela de retenção.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Tempos (N,) e valores (N, 3) em current, min, max.
+        """
+        order = (self.start + np.arange(self.size)) % self.capacity
+        times, values = self.times[order], self.values[order]
+        if retention_seconds is not None and self.size:
+            first = np.searchsorted(times, times[-1] - retention_seconds, side='left')
+            times, values = times[first:], values[first:]
+        return times, values
+
+
 class RealTimePlotter:
-    def __init__(self, csv_file):
+    def __init__(self, csv_file, capacity=DEFAULT_PLOT_HISTORY_CAPACITY, retention_seconds=DEFAULT_PLOT_RETENTION_SECONDS,
+                 max_points=DEFAULT_PLOT_MAX_POINTS, feed_url=None, refresh_interval=DEFAULT_PLOT_REFRESH_INTERVAL_MS):
+        """
+        Gráfico em tempo real das leituras.
+
+        Com `feed_url`, as leituras chegam por push (SSE) do motor assim que são gravadas; o CSV
+        só é lido enquanto o canal estiver desconectado. O histórico já gravado no CSV é carregado
+        na inicialização e novamente a cada (re)conexão, já inscrito no canal, para cobrir o
+        intervalo em que ele esteve fora; os eventos recebidos durante essa leitura são aplicados
+        depois dela, e as leituras presentes nas duas fontes (mesmo instante absoluto) entram uma
+        única vez. O navegador consulta o servidor a cada
+        `refresh_interval` ms, mas a figura só é reconstruída quando há dados novos.
+
+        Args:
+            csv_file (str): CSV da unidade (fallback, ou fonte única sem `feed_url`).
+            capacity (int): Pontos mantidos por unidade.
+            retention_seconds (float): Janela exibida em segundos (None: todo o histórico).
+            max_points (int): Pontos por traço enviados ao navegador.
+            feed_url (str): Endereço do canal SSE do motor (ex.: http://127.0.0.1:8765/events).
+            refresh_interval (int): Intervalo de atualização do gráfico em milissegundos.
+        """
         self.csv_file = csv_file
-        self.data = pd.DataFrame(columns=['unit_name', 'current', 'min', 'max', 'time'])
-        
+        self.capacity = capacity
+        self.retention_seconds = retention_seconds
+        self.max_points = max_points  # Pontos por traço enviados ao navegador (~ largura do gráfico em pixels)
+        self._visible_range = None
+        self.histories = {}  # unit_name -> UnitHistory
+        self._last_timestamps = {}  # unit_name -> instante absoluto da última leitura aplicada
+        self._offset = 0  # Bytes do CSV já lidos
+        self._partial_line = b''  # Linha ainda incompleta no fim do arquivo
+        self._lock = threading.Lock()  # Os eventos do canal chegam em outra thread
+        self._csv_lock = threading.Lock()  # update_data roda no servidor e na thread do canal
+        self._revision = 0  # Incrementada a cada ponto novo
+        self._rendered = None  # (revisão, intervalo visível) da última figura enviada
+        self.update_data()  # Histórico já gravado
+        self.live_feed = LiveFeedSubscriber(feed_url, self.append_event, on_connect=self.update_data) \
+            if feed_url else None
+        if self.live_feed is not None:
+            self.live_feed.start()
+
         self.app = dash.Dash(__name__)
         self.app.layout = html.Div([
             dcc.Graph(id='live-graph', animate=True),
             dcc.Interval(
                 id='graph-update',
-                interval=1000,  # in milliseconds
+                interval=refresh_interval,  # in milliseconds
                 n_intervals=0
             )
         ])
 
         @self.app.callback(Output('live-graph', 'figure'),
-                           [Input('graph-update', 'n_intervals')])
-        def update_graph_scatter(n):
-            self.update_data()
+                           [Input('graph-update', 'n_intervals')],
+                           [State('live-graph', 'relayoutData')])
+        def update_graph_scatter(n, relayout_data):
+            if self.live_feed is None or not self.live_feed.connected:
+                self.update_data()
+            # relayoutData só traz as chaves alteradas: mantém o último zoom até um autorange
+            if relayout_data and any(key.startswith('xaxis.') for key in relayout_data):
+                self._visible_range = visible_range(relayout_data)
+
+            with self._lock:
+                state = (self._revision, self._visible_range)
+                if state == self._rendered:
+                    raise PreventUpdate  # Nada novo desde a última figura
+                series = {unit: history.arrays(self.retention_seconds) for unit, history in self.histories.items()}
+            self._rendered = state
             fig = make_subplots(rows=1, cols=1, subplot_titles=['Real-time Data Visualization'])
-            
-            for unit in self.data['unit_name'].unique():
-                unit_data = self.data[self.data['unit_name'] == unit]
+
+            for unit, arrays in series.items():
+                times, values = self.downsample(*arrays)
                 fig.add_trace(
-                    go.Scatter(x=unit_data['time'], y=unit_data['current'],
+                    go.Scatter(x=times[0], y=values[0],
                                mode='lines+markers',
                                name=f'{unit} (Current)'),
                     row=1, col=1
                 )
                 fig.add_trace(
-                    go.Scatter(x=unit_data['time'], y=unit_data['min'],
+                    go.Scatter(x=times[1], y=values[1],
                                mode='lines',
                                name=f'{unit} (Min)',
                                line=dict(dash='dash')),
                     row=1, col=1
                 )
                 fig.add_trace(
-                    go.Scatter(x=unit_data['time'], y=unit_data['max'],
+                    go.Scatter(x=times[2], y=values[2],
                                mode='lines',
                                name=f'{unit} (Max)',
                                line=dict(dash='dot')),
@@ -54,29 +271,124 @@ class RealTimePlotter:
                 title='Real-time Data Visualization',
                 xaxis_title='Time (s)',
                 yaxis_title='Value',
-                height=600
+                height=600,
+                uirevision='live'  # Preserva o zoom do usuário entre as atualizações
             )
 
             return fig
 
+    def downsample(self, times, values):
+        """
+        Reduz cada série ao intervalo visível e a no máximo `max_points` pontos.
+
+        O valor atual usa LTTB (forma da curva); mínimo e máximo usam min/max por faixa
+        (preservam degraus). O tamanho da resposta fica limitado independente da duração da sessão.
+
+        Returns:
+            Tuple[List[np.ndarray], List[np.ndarray]]: Tempos e valores de current, min e max.
+        """
+        if self._visible_range is not None and len(times):
+            # Mantém um ponto de cada lado para a linha continuar até a borda do gráfico
+            first, last = np.searchsorted(times, self._visible_range)
+            first, last = max(first - 1, 0), min(last + 1, len(times))
+            times, values = times[first:last], values[first:last]
+
+        series_times, series_values = [], []
+        for column in range(len(VALUE_COLUMNS)):
+            y = values[:, column]
+            if column == 0:
+                indices = lttb_indices(times, y, self.max_points)
+            else:
+                indices = minmax_indices(y, self.max_points // 2)
+            series_times.append(times[indices])
+            series_values.append(y[indices])
+        return series_times, series_values
+
     def update_data(self):
-        new_data = pd.read_csv(self.csv_file, header=None, names=['unit_name', 'current', 'min', 'max', 'time'])
-        self.data = pd.concat([self.data, new_data], ignore_index=True)
-        self.data = self.data.drop_duplicates(subset=['time'], keep='last')
-        self.data = self.data.sort_values('time')
-        
-        # Converter valores para numéricos, tratando '0' como NaN
-        for col in ['current', 'min', 'max']:
-            self.data[col] = pd.to_numeric(self.data[col], errors='coerce')
-            self.data[col] = self.data[col].replace(0, pd.NA)
-        
-        # Preencher valores ausentes
-        self.data = self.data.fillna(method='ffill')
+        """
+        Lê somente as linhas acrescentadas ao CSV desde a última chamada.
+
+        O custo por atualização é proporcional às linhas novas, e não ao histórico inteiro.
+        Linhas incompletas no fim do arquivo ficam guardadas até serem terminadas.
+        """
+        with self._csv_lock:
+            self.__read_new_rows()
+
+    def __read_new_rows(self):
+        try:
+            size = os.path.getsize(self.csv_file)
+        except FileNotFoundError:
+            return
+
+        if size < self._offset:
+            # Arquivo truncado ou recriado: recomeça do início
+            self._offset = 0
+            self._partial_line = b''
+        if size == self._offset:
+            return
+
+        with open(self.csv_file, 'rb') as csv_file:
+            csv_file.seek(self._offset)
+            chunk = csv_file.read(size - self._offset)
+        self._offset += len(chunk)
+
+        lines = (self._partial_line + chunk).split(b'\n')
+        self._partial_line = lines.pop()
+
+        for row in csv.reader(line.decode('utf-8', errors='replace') for line in lines if line.strip()):
+            self.append_row(row)
+
+    def append_row(self, row):
+        if len(row) <= TIME_COLUMN:
+            return
+        try:
+            timestamp = float(row[TIME_COLUMN])
+        except ValueError:
+            return
+        absolute_timestamp = self.__to_number(row[TIMESTAMP_COLUMN] if len(row) > TIMESTAMP_COLUMN else None)
+        self.__append(row[0], timestamp, [self.__to_number(value) for value in row[1:4]], absolute_timestamp)
+
+    def append_event(self, event):
+        """Acrescenta uma leitura recebida pelo canal SSE (mesmos campos da linha do CSV)."""
+        try:
+            timestamp = float(event['time'])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.__append(str(event.get('unit', '')), timestamp,
+                      [self.__to_number(event.get(column, np.nan)) for column in VALUE_COLUMNS],
+                      self.__to_number(event.get('timestamp')))
+
+    def __append(self, unit_name, timestamp, values, absolute_timestamp=np.nan):
+        # Sem o instante absoluto (CSV antigo), não há como deduplicar nem identificar a sessão
+        session_start = None if np.isnan(absolute_timestamp) else absolute_timestamp - timestamp
+        with self._lock:
+            if session_start is not None:
+                if absolute_timestamp <= self._last_timestamps.get(unit_name, -np.inf):
+                    return  # Já recebida pela outra fonte (CSV e canal na reconexão)
+                self._last_timestamps[unit_name] = absolute_timestamp
+            history = self.histories.get(unit_name)
+            if history is None:
+                history = self.histories[unit_name] = UnitHistory(self.capacity)
+            history.append(timestamp, values, session_start)
+            self._revision += 1
+
+    @staticmethod
+    def __to_number(value):
+        # Converter valores para numéricos; inválidos viram NaN
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
 
     def run(self):
         self.app.run_server(debug=True)
 
 if __name__ == "__main__":
-    csv_file = "PULSE.csv"  # Substitua pelo nome do seu arquivo CSV
-    plotter = RealTimePlotter(csv_file)
-    plotter.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Gráfico em tempo real das leituras')
+    parser.add_argument('--csv', type=str, default="PULSE.csv", help='CSV da unidade (padrão: PULSE.csv)')
+    parser.add_argument('--feed', type=str,
+                        default=f"http://{DEFAULT_LIVE_FEED_HOST}:{DEFAULT_LIVE_FEED_PORT}{LIVE_FEED_PATH}",
+                        help='Canal SSE do motor (core.py --feed-port); vazio para usar somente o CSV')
+    args = parser.parse_args()
+    plotter = RealTimePlotter(args.csv, feed_url=args.feed or None)
+    plotter.run()
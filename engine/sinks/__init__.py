@@ -0,0 +1,6 @@
+from .base import Sink
+from .reading import Reading
+from .result_bus import ResultBus
+from .local_sinks import ConsoleSink, CsvSink, LatestValueSink, LiveFeedSink, TimeSeriesSink
+from .http_sink import HttpSink
+from .upload_spool import UploadSpool
@@ -0,0 +1,30 @@
+from typing import List
+
+
+class Sink:
+    """
+    Destino das leituras publicadas no `ResultBus`.
+
+    Cada sink registrado roda em sua própria thread, com sua própria fila limitada: os métodos
+    abaixo nunca são chamados em paralelo para o mesmo sink e podem bloquear (disco, rede) sem
+    atrasar o OCR nem os outros sinks.
+    """
+    name = None
+
+    def handle(self, reading) -> None:
+        raise NotImplementedError
+
+    def handle_batch(self, readings: List) -> None:
+        # Sinks que se beneficiam de lotes (disco, rede) sobrescrevem este método
+        for reading in readings:
+            self.handle(reading)
+
+    def stats(self) -> dict:
+        """Contadores próprios do sink, incluídos em `ResultBus.metrics()`."""
+        return {}
+
+    def on_idle(self) -> None:
+        """Chamado quando a fila do sink fica ociosa (ex.: para gravar lotes pendentes)."""
+
+    def close(self) -> None:
+        """Libera os recursos do sink; chamado uma vez, depois que a fila foi esvaziada."""
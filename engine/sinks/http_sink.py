@@ -0,0 +1,204 @@
+import random
+import time
+import requests
+
+from requests.adapters import HTTPAdapter
+from typing import List
+
+from configurations.constants import (DEFAULT_HTTP_SINK_TIMEOUT, DEFAULT_UPLOAD_BACKOFF, DEFAULT_UPLOAD_BATCH_SIZE,
+                                      DEFAULT_UPLOAD_MAX_BACKOFF, DEFAULT_UPLOAD_MAX_DELAY,
+                                      DEFAULT_UPLOAD_MAX_PENDING, DEFAULT_UPLOAD_POOL_SIZE, DEFAULT_UPLOAD_RETRIES,
+                                      DEFAULT_UPLOAD_SPOOL_MAX_BYTES)
+from .base import Sink
+from .reading import Reading
+from .upload_spool import UploadSpool
+
+RETRYABLE_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+class HttpSink(Sink):
+    name = "http"
+
+    def __init__(self, url: str, timeout=DEFAULT_HTTP_SINK_TIMEOUT, batch_size=DEFAULT_UPLOAD_BATCH_SIZE,
+                 max_delay=DEFAULT_UPLOAD_MAX_DELAY, retries=DEFAULT_UPLOAD_RETRIES, backoff=DEFAULT_UPLOAD_BACKOFF,
+                 max_backoff=DEFAULT_UPLOAD_MAX_BACKOFF, pool_size=DEFAULT_UPLOAD_POOL_SIZE,
+                 max_pending=DEFAULT_UPLOAD_MAX_PENDING, spool_path=None, spool_max_bytes=DEFAULT_UPLOAD_SPOOL_MAX_BYTES,
+                 session=None):
+        """
+        Envio das leituras a um servidor HTTP, em lotes, por conexões persistentes.
+
+        As leituras são acumuladas e enviadas em um único POST (lista JSON) quando o lote atinge
+        `batch_size` leituras ou quando a mais antiga espera há `max_delay` segundos. A sessão
+        reutiliza conexões keep-alive de um pool, então não há handshake TCP/TLS por leitura.
+
+        Falhas de rede e respostas 408/429/5xx são repetidas até `retries` vezes com espera
+        exponencial (com jitter). Se ainda assim falhar, o servidor é considerado fora do ar: as
+        leituras vão para a fila em disco (`spool_path`) e novas tentativas são feitas em
+        intervalos crescentes até `max_backoff`. Quando o servidor volta, a fila em disco é
+        enviada primeiro, preservando a ordem. Respostas 4xx definitivas descartam o lote.
+
+        Args:
+            url (str): Endereço que recebe as leituras.
+            timeout (float): Tempo máximo de cada requisição em segundos.
+            batch_size (int): Leituras por requisição.
+            max_delay (float): Tempo máximo, em segundos, que uma leitura espera pelo envio.
+            retries (int): Novas tentativas imediatas de cada lote.
+            backoff (float): Espera inicial entre as tentativas, em segundos.
+            max_backoff (float): Espera máxima entre tentativas durante uma queda do servidor.
+            pool_size (int): Conexões mantidas no pool.
+            max_pending (int): Leituras mantidas em memória sem fila em disco (as mais antigas são
+                descartadas).
+            spool_path (str): Arquivo JSONL da fila em disco (opcional).
+            spool_max_bytes (int): Tamanho máximo da fila em disco (as mais antigas são descartadas).
+            session (requests.Session): Sessão HTTP já configurada (opcional).
+        """
+        self.url = url
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_pending = max_pending
+        self.session = session if session is not None else self.__create_session(pool_size)
+        self.spool = UploadSpool(spool_path, spool_max_bytes) if spool_path else None
+        self._pending = []  # Leituras (dict) aguardando envio, da mais antiga para a mais nova
+        self._oldest_pending = None  # time.monotonic() da leitura mais antiga em `_pending`
+        self._outage_delay = 0.0
+        self._retry_at = 0.0  # Durante uma queda, nenhuma requisição é feita antes deste instante
+        self.uploaded = 0
+        self.requests = 0
+        self.failed_requests = 0
+        self.retried = 0
+        self.rejected = 0
+        self.spooled = 0
+        self.dropped = 0
+
+    @staticmethod
+    def __create_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        # As repetições são feitas por este sink (com fila em disco), não pelo urllib3
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def handle_batch(self, readings: List[Reading]) -> None:
+        if not self._pending:
+            self._oldest_pending = time.monotonic()
+        self._pending.extend(reading.to_dict() for reading in readings)
+        if len(self._pending) >= self.batch_size or self.__is_due():
+            self.__upload()
+        self.__limit_pending()
+
+    def on_idle(self) -> None:
+        if self.__is_due() or (self.spool is not None and self.spool.pending_bytes()):
+            self.__upload()
+
+    def __is_due(self) -> bool:
+        return bool(self._pending) and time.monotonic() - self._oldest_pending >= self.max_delay
+
+    def __upload(self) -> None:
+        if time.monotonic() < self._retry_at:
+            # Servidor fora do ar: não tenta agora; as leituras vão para o disco
+            self.__spool_pending()
+            return
+
+        if self.spool is not None and self.spool.pending_bytes() and not self.__upload_spool():
+            self.__spool_pending()
+            return
+
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            if not self.__post(batch):
+                self.__spool_pending()
+                return
+            del self._pending[:len(batch)]
+        self._oldest_pending = None
+
+    def __upload_spool(self) -> bool:
+        # Envia primeiro o que ficou no disco, para o servidor receber as leituras em ordem
+        while True:
+            records, offset = self.spool.read_batch(self.batch_size)
+            if not records:
+                self.spool.commit(offset)
+                return True
+            if not self.__post(records):
+                return False
+            self.spool.commit(offset)
+
+    def __post(self, records: List[dict], retries=None) -> bool:
+        """
+        Envia um lote, repetindo falhas transitórias.
+
+        Returns:
+            bool: True se o lote foi aceito (ou recusado de forma definitiva e descartado).
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            if attempt:
+                self.retried += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+            self.requests += 1
+            try:
+                response = self.session.post(self.url, json=records, timeout=self.timeout)
+            except requests.RequestException:
+                self.failed_requests += 1
+                continue
+
+            if response.status_code < 300:
+                self.uploaded += len(records)
+                self._outage_delay = 0.0
+                self._retry_at = 0.0
+                return True
+            self.failed_requests += 1
+            if response.status_code not in RETRYABLE_STATUS:
+                # Erro definitivo (ex.: 400): repetir não adianta e travaria a fila
+                self.rejected += len(records)
+                return True
+
+        # Queda do servidor: espera crescente antes da próxima tentativa
+        self._outage_delay = min(max(self._outage_delay * 2, self.backoff), self.max_backoff)
+        self._retry_at = time.monotonic() + self._outage_delay
+        return False
+
+    def __spool_pending(self) -> None:
+        if self.spool is None:
+            self.__limit_pending()
+            return
+        self.spool.append(self._pending)
+        self.spooled += len(self._pending)
+        self._pending = []
+        self._oldest_pending = None
+
+    def __limit_pending(self) -> None:
+        excess = len(self._pending) - self.max_pending
+        if excess > 0:
+            del self._pending[:excess]
+            self.dropped += excess
+
+    def stats(self) -> dict:
+        return {
+            "uploaded": self.uploaded,
+            "requests": self.requests,
+            "failed_requests": self.failed_requests,
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "spooled": self.spooled,
+            "dropped": self.dropped,
+            "pending": len(self._pending),
+            "spool_bytes": self.spool.pending_bytes() if self.spool is not None else 0,
+            "spool_dropped": self.spool.dropped if self.spool is not None else 0,
+            "outage": self._retry_at > time.monotonic(),
+        }
+
+    def close(self) -> None:
+        # Uma última tentativa, sem repetições, para não atrasar o encerramento
+        if self._pending and time.monotonic() >= self._retry_at and self.__post(self._pending, retries=0):
+            self._pending = []
+        if self.spool is None:
+            self.dropped += len(self._pending)
+            self._pending = []
+        self.__spool_pending()
+        self.session.close()
@@ -0,0 +1,113 @@
+import json
+import threading
+
+from icecream import ic
+from typing import List, Optional
+
+from common import LiveFeedServer, StageProfiler
+from storage import BufferedReadingWriter, TimeSeriesStore
+from .base import Sink
+from .reading import Reading
+
+
+class CsvSink(Sink):
+    name = "csv"
+
+    def __init__(self, writer: BufferedReadingWriter, profiler: Optional[StageProfiler] = None):
+        """
+        Grava as leituras em `<unidade>.csv` através do gravador em lote.
+
+        O tempo de cada gravação (inclusive as descargas em disco) é medido na thread do sink,
+        no estágio "csv_write" de `profiler`.
+        """
+        self.writer = writer
+        self.profiler = profiler if profiler is not None else StageProfiler()
+
+    def handle(self, reading: Reading) -> None:
+        started = self.profiler.start()
+        self.writer.write(reading.unit, reading.to_row())
+        self.profiler.stop("csv_write", started)
+
+    def on_idle(self) -> None:
+        started, flushes = self.profiler.start(), self.writer.flushes
+        self.writer.flush_if_due()  # Não deixa linhas paradas em memória quando ocioso
+        if self.writer.flushes != flushes:  # Só conta as chamadas que gravaram algo
+            self.profiler.stop("csv_write", started)
+
+    def stats(self) -> dict:
+        return self.writer.stats()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ConsoleSink(Sink):
+    name = "console"
+
+    def handle(self, reading: Reading) -> None:
+        _unit_data_structure = {
+            f"{reading.unit}": {
+                "current": reading.current,
+                "min": reading.minimum,
+                "max": reading.maximum,
+                "mean": reading.mean,
+                "count": reading.count,
+                "window_min": reading.window_minimum,
+                "window_max": reading.window_maximum,
+            }
+        }
+        ic.configureOutput(prefix="[INFO] Unit Data Structure\t", includeContext=True)
+        ic(json.dumps(_unit_data_structure, indent=4))
+
+
+class LatestValueSink(Sink):
+    name = "latest"
+
+    def __init__(self):
+        """Mantém em memória a leitura mais recente de cada unidade, para consulta por outras threads."""
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def handle_batch(self, readings: List[Reading]) -> None:
+        with self._lock:
+            for reading in readings:
+                self._latest[reading.unit] = reading
+
+    def get(self, unit_name: str) -> Optional[Reading]:
+        with self._lock:
+            return self._latest.get(unit_name)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._latest)
+
+
+class LiveFeedSink(Sink):
+    name = "live_feed"
+
+    def __init__(self, server: LiveFeedServer):
+        """Envia as leituras aos clientes SSE (ex.: `RealTimePlotter`)."""
+        self.server = server
+
+    def handle(self, reading: Reading) -> None:
+        self.server.publish(reading.to_dict())
+
+    def close(self) -> None:
+        self.server.close()
+
+
+class TimeSeriesSink(Sink):
+    name = "timeseries"
+
+    def __init__(self, store: TimeSeriesStore):
+        """Armazenamento colunar com agregações 15s ... 24h (valor atual no fim de cada janela)."""
+        self.store = store
+
+    def handle(self, reading: Reading) -> None:
+        self.store.append(reading.unit, reading.timestamp, float(reading.current))
+
+    def on_idle(self) -> None:
+        self.store.flush()
+
+    def close(self) -> None:
+        self.store.close()
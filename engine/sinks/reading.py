@@ -0,0 +1,47 @@
+from typing import NamedTuple, Optional
+
+from common import WindowRecord
+
+READING_FIELDS = ("unit", "current", "min", "max", "time", "mean", "count", "window_min", "window_max",
+                  "timestamp")  # Colunas do CSV
+
+
+class Reading(NamedTuple):
+    """
+    Leitura publicada no barramento: resumo de uma janela de uma unidade.
+
+    `current` é o último valor do ROI principal na janela, `minimum`/`maximum` os últimos
+    limites lidos nos ROIs de mínimo e máximo (0 se ainda não lidos), `mean`/`count` a média e
+    a quantidade de leituras do ROI principal na janela e `window_minimum`/`window_maximum` o
+    menor e o maior valor do ROI principal na janela. `time` é o tempo em segundos desde o
+    início da sessão (o eixo do `RealTimePlotter`) e `timestamp` o instante absoluto do fim da
+    janela (segundos desde a época). `capture_time` é o instante da captura (time.monotonic) do
+    quadro mais novo da janela, para medir a latência da captura até a entrega; não é gravado.
+    """
+    unit: str
+    current: float
+    minimum: float
+    maximum: float
+    time: int
+    mean: float
+    count: int
+    window_minimum: float
+    window_maximum: float
+    timestamp: float
+    capture_time: Optional[float] = None
+
+    @classmethod
+    def from_window(cls, record: WindowRecord, session_start: float, minimum=0.0, maximum=0.0) -> "Reading":
+        return cls(record.unit, record.last, minimum, maximum, int(record.end - session_start),
+                   round(record.mean, 3), record.count, record.minimum, record.maximum, record.end,
+                   record.capture_time)
+
+    def to_row(self) -> tuple:
+        # Mesma ordem das colunas do CSV (READING_FIELDS). O instante absoluto identifica a leitura
+        # entre sessões: o `time` recomeça do zero a cada execução do motor
+        return (self.unit, self.current, self.minimum, self.maximum, self.time, self.mean, self.count,
+                self.window_minimum, self.window_maximum, self.timestamp)
+
+    def to_dict(self) -> dict:
+        # Payload do envio HTTP, da fila em disco e do canal SSE: os mesmos campos do CSV
+        return dict(zip(READING_FIELDS, self.to_row()))
@@ -0,0 +1,177 @@
+import threading
+import time
+
+from queue import Empty, Full
+
+from common import DroppingQueue
+from configurations.constants import DEFAULT_SINK_BATCH_SIZE, DEFAULT_SINK_BUFFER_SIZE, DEFAULT_SINK_IDLE_INTERVAL
+from .base import Sink
+
+
+class _Subscription:
+
+    def __init__(self, sink: Sink, buffer_size: int, batch_size: int, idle_interval: float):
+        self.sink = sink
+        self.name = sink.name or type(sink).__name__
+        self.queue = DroppingQueue(maxsize=buffer_size)
+        self.batch_size = batch_size
+        self.idle_interval = idle_interval
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stopping = threading.Event()  # Encerrar assim que a fila esvaziar
+        self.thread = threading.Thread(target=self.__run, name=f"sink-{self.name}")
+        self.thread.daemon = True
+
+    def __run(self) -> None:
+        running = True
+        while running:
+            try:
+                item = self.queue.get(timeout=self.idle_interval)
+            except Empty:
+                if self.stopping.is_set():
+                    break  # Encerramento: tudo o que estava na fila já foi entregue
+                self.__call(self.sink.on_idle)
+                continue
+            if item is None:  # Sinal de encerramento enviado por ResultBus.close(), atrás das pendentes
+                break
+
+            # Entrega em lote tudo o que já estiver na fila
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            if self.__call(self.sink.handle_batch, [reading for _published, reading in batch]):
+                self.processed += len(batch)
+            else:
+                self.failed += len(batch)
+            self.batches += 1
+            # Atraso do item mais antigo do lote, entre a publicação e o fim da entrega
+            self.last_lag = time.monotonic() - batch[0][0]
+            self.max_lag = max(self.max_lag, self.last_lag)
+        # Fechado pela própria thread, depois da última entrega: close() nunca concorre com handle_batch
+        self.__call(self.sink.close)
+
+    def __call(self, method, *args) -> bool:
+        # Uma falha no sink é contabilizada, mas não derruba a thread nem afeta os outros sinks
+        try:
+            method(*args)
+            return True
+        except Exception as error:
+            self.errors += 1
+            self.last_error = repr(error)
+            return False
+
+    def metrics(self) -> dict:
+        metrics = {
+            "pending": self.queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "dropped": self.queue.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "lag_ms": self.last_lag * 1000.0,
+            "max_lag_ms": self.max_lag * 1000.0,
+        }
+        sink_stats = self.sink.stats()
+        if sink_stats:
+            metrics["sink"] = sink_stats
+        return metrics
+
+
+class ResultBus:
+
+    def __init__(self):
+        """
+        Barramento publish/subscribe das leituras reconhecidas.
+
+        `publish()` apenas coloca a leitura na fila limitada de cada sink e retorna: um sink lento
+        ou travado perde as leituras mais antigas da própria fila (contabilizadas em `dropped`),
+        sem nunca bloquear o OCR nem os demais sinks.
+        """
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.published = 0
+
+    def register(self, sink: Sink, buffer_size=DEFAULT_SINK_BUFFER_SIZE, batch_size=DEFAULT_SINK_BATCH_SIZE,
+                 idle_interval=DEFAULT_SINK_IDLE_INTERVAL) -> Sink:
+        """
+        Registra um sink e inicia a sua thread de entrega.
+
+        Args:
+            sink (Sink): Destino das leituras.
+            buffer_size (int): Leituras pendentes mantidas para o sink.
+            batch_size (int): Máximo de leituras entregues por chamada de `handle_batch`.
+            idle_interval (float): Segundos sem leituras até chamar `on_idle`.
+        Returns:
+            Sink: O próprio sink.
+        """
+        subscription = _Subscription(sink, buffer_size, batch_size, idle_interval)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        subscription.thread.start()
+        return sink
+
+    def publish(self, reading) -> None:
+        published = time.monotonic()
+        with self._lock:
+            if self._closed:
+                return
+            subscriptions = list(self._subscriptions)
+            self.published += 1
+        for subscription in subscriptions:
+            subscription.queue.put_latest((published, reading))
+
+    def metrics(self) -> dict:
+        """
+        Métricas de cada sink: pendentes, entregues, com falha, descartados, erros e atraso (lag) da entrega.
+
+        Returns:
+            dict: {nome do sink: métricas}.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return {subscription.name: subscription.metrics() for subscription in subscriptions}
+
+    def close(self, timeout=2.0) -> None:
+        """
+        Entrega o que estiver pendente, encerra as threads e fecha os sinks.
+
+        Cada sink é fechado pela sua própria thread, depois de esvaziar a fila. Se a thread não
+        terminar dentro de `timeout` (sink travado), close() retorna sem fechar o sink, que só será
+        fechado pela thread se ela terminar depois; o caso é contabilizado como erro do sink.
+
+        Args:
+            timeout (float): Espera máxima, em segundos, por cada sink.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            subscriptions = list(self._subscriptions)  # Mantidas para consulta das métricas finais
+        for subscription in subscriptions:
+            subscription.stopping.set()
+            try:
+                # Só acorda a thread; com a fila cheia o sinal não é enviado (put_latest descartaria uma
+                # leitura) e a thread encerra ao encontrar a fila vazia
+                subscription.queue.put_nowait(None)
+            except Full:
+                pass
+        for subscription in subscriptions:
+            subscription.thread.join(timeout=timeout)
+            if subscription.thread.is_alive():
+                subscription.errors += 1
+                subscription.last_error = f"sink did not finish within {timeout}s"
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+
+from typing import List, Optional, Tuple
+
+from configurations.constants import DEFAULT_UPLOAD_SPOOL_MAX_BYTES
+
+
+class UploadSpool:
+
+    def __init__(self, path: str, max_bytes: Optional[int] = DEFAULT_UPLOAD_SPOOL_MAX_BYTES):
+        """
+        Fila em disco (JSONL, somente por anexação) das leituras que não puderam ser enviadas.
+
+        A posição de leitura fica em `<path>.offset` e só avança depois que o lote foi aceito pelo
+        servidor (`commit`), então uma queda do processo no meio do envio reenvia o lote em vez de
+        perdê-lo (entrega pelo menos uma vez). Quando tudo foi enviado, os dois arquivos são zerados.
+
+        Durante uma queda longa, as leituras pendentes ficam limitadas a `max_bytes`: ao passar do
+        limite, as mais antigas são descartadas (contadas em `dropped`) e o arquivo é reescrito só
+        com as restantes, de forma que o disco também não cresce além do limite.
+
+        Args:
+            path (str): Arquivo JSONL da fila.
+            max_bytes (int): Tamanho máximo das leituras pendentes, em bytes (None: sem limite).
+        """
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._offset = self.__load_offset()
+
+    def __load_offset(self) -> int:
+        try:
+            with open(self.offset_path, "r", encoding="utf-8") as offset_file:
+                return int(offset_file.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def __save_offset(self, offset: int) -> None:
+        temporary_path = f"{self.offset_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as offset_file:
+            offset_file.write(str(offset))
+        os.replace(temporary_path, self.offset_path)
+
+    def append(self, records: List[dict]) -> None:
+        if not records:
+            return
+        lines = [(json.dumps(record) + "\n").encode("utf-8") for record in records]
+        with self._lock:
+            size = self.__size()
+            if self.max_bytes is None or size - self._offset + sum(map(len, lines)) <= self.max_bytes:
+                with open(self.path, "ab") as spool_file:
+                    spool_file.writelines(lines)
+                return
+            self.__compact(lines)
+
+    def __size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def __compact(self, lines: List[bytes]) -> None:
+        # Pendentes + novas, sem as mais antigas que não cabem em `max_bytes`
+        try:
+            with open(self.path, "rb") as spool_file:
+                spool_file.seek(self._offset)
+                kept = [line for line in spool_file if line.endswith(b"\n")] + lines
+        except FileNotFoundError:
+            kept = list(lines)
+        total = sum(map(len, kept))
+        first = 0
+        while first < len(kept) and total > self.max_bytes:
+            total -= len(kept[first])
+            first += 1
+        self.dropped += first
+
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as spool_file:
+            spool_file.writelines(kept[first:])
+        # Posição zerada antes da troca: uma queda entre as duas reenvia leituras em vez de perdê-las
+        self._offset = 0
+        self.__save_offset(0)
+        os.replace(temporary_path, self.path)
+
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return max(self.__size() - self._offset, 0)
+
+    def read_batch(self, max_records: int) -> Tuple[List[dict], int]:
+        """
+        Lê as próximas leituras ainda não confirmadas, sem avançar a posição.
+
+        Returns:
+            Tuple[List[dict], int]: Leituras e a posição a passar para `commit` após o envio.
+        """
+        records = []
+        with self._lock:
+            try:
+                spool_file = open(self.path, "rb")
+            except FileNotFoundError:
+                return records, self._offset
+
+            with spool_file:
+                spool_file.seek(self._offset)
+                offset = self._offset
+                while len(records) < max_records:
+                    line = spool_file.readline()
+                    if not line.endswith(b"\n"):  # Fim do arquivo (ou linha incompleta)
+                        break
+                    offset += len(line)
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # Linha corrompida: descartada
+        return records, offset
+
+    def commit(self, offset: int) -> None:
+        with self._lock:
+            self._offset = offset
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if offset >= size:
+                # Tudo enviado: recomeça os arquivos do zero
+                open(self.path, "w").close()
+                self._offset = 0
+            self.__save_offset(self._offset)
@@ -0,0 +1,2 @@
+from .reading_writer import BufferedReadingWriter
+from .timeseries_store import TimeSeriesStore
@@ -0,0 +1,109 @@
+import csv
+import io
+import os
+import threading
+import time
+
+from typing import Sequence
+
+from configurations.constants import DEFAULT_WRITER_MAX_DELAY, DEFAULT_WRITER_MAX_ROWS
+
+
+class BufferedReadingWriter:
+
+    def __init__(self, directory=".", max_rows=DEFAULT_WRITER_MAX_ROWS, max_delay=DEFAULT_WRITER_MAX_DELAY):
+        """
+        Gravação em lote, somente por anexação, das leituras em `<unidade>.csv`.
+
+        Mantém um arquivo aberto por unidade e acumula as linhas em memória, gravando quando o
+        lote atinge `max_rows` linhas, quando `max_delay` segundos se passaram desde a última
+        gravação, ou no encerramento. O formato (sem cabeçalho: unit_name, current, min, max,
+        time, seguidos de colunas opcionais como mean, count, window_min, window_max e timestamp) é
+        o mesmo lido pelo `RealTimePlotter`.
+
+        Args:
+            directory (str): Diretório dos arquivos CSV.
+            max_rows (int): Linhas acumuladas que disparam a gravação.
+            max_delay (float): Tempo máximo, em segundos, que uma linha fica em memória.
+        """
+        self.directory = directory
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self._handles = {}  # unidade -> arquivo aberto
+        self._buffers = {}  # unidade -> linhas pendentes
+        self._buffered_rows = 0
+        self._started = time.monotonic()
+        self._last_flush = self._started
+        self._lock = threading.Lock()
+
+    def path_for(self, unit_name: str) -> str:
+        return os.path.join(self.directory, f"{unit_name}.csv")
+
+    def write(self, unit_name: str, row: Sequence) -> None:
+        """
+        Acrescenta uma linha ao lote da unidade, gravando o lote se algum limite foi atingido.
+
+        Args:
+            unit_name (str): Nome da unidade (define o arquivo).
+            row (Sequence): Valores na ordem unit_name, current, min, max, time[, ...].
+        """
+        with self._lock:
+            self._buffers.setdefault(unit_name, []).append(row)
+            self._buffered_rows += 1
+            if self._buffered_rows >= self.max_rows or time.monotonic() - self._last_flush >= self.max_delay:
+                self.__flush_locked()
+
+    def flush_if_due(self) -> None:
+        with self._lock:
+            if self._buffered_rows and time.monotonic() - self._last_flush >= self.max_delay:
+                self.__flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self.__flush_locked()
+
+    def __flush_locked(self) -> None:
+        for unit_name, rows in self._buffers.items():
+            if not rows:
+                continue
+
+            text = io.StringIO()
+            csv.writer(text, lineterminator="\n").writerows(rows)
+            data = text.getvalue()
+
+            handle = self._handles.get(unit_name)
+            if handle is None:
+                handle = self._handles[unit_name] = open(self.path_for(unit_name), "a", encoding="utf-8", newline="")
+            handle.write(data)
+            handle.flush()
+
+            self.rows_written += len(rows)
+            self.bytes_written += len(data.encode("utf-8"))
+            rows.clear()
+
+        self._buffered_rows = 0
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self.__flush_locked()
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "rows_written": self.rows_written,
+                "bytes_written": self.bytes_written,
+                "flushes": self.flushes,
+                "buffered_rows": self._buffered_rows,
+                "open_files": len(self._handles),
+                "rows_per_second": self.rows_written / elapsed,
+                "bytes_per_second": self.bytes_written / elapsed,
+            }
@@ -0,0 +1,241 @@
+import os
+import re
+import threading
+import numpy as np
+
+from typing import Optional
+
+from configurations.constants import DEFAULT_ROLLUP_INTERVALS
+
+RAW_COLUMNS = ("time", "value")
+ROLLUP_COLUMNS = ("time", "min", "max", "mean", "count")
+
+
+class _RollupAccumulator:
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self.start = None
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, timestamp: float, value: float) -> Optional[np.ndarray]:
+        """Acrescenta um valor; devolve o registro do intervalo anterior se ele acabou de fechar."""
+        bucket = timestamp - timestamp % self.interval
+        closed = None
+        if self.start is not None and bucket != self.start:
+            closed = self.record()
+            self.start = None
+
+        if self.start is None:
+            self.start, self.minimum, self.maximum, self.total, self.count = bucket, value, value, 0.0, 0
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.total += value
+        self.count += 1
+        return closed
+
+    def record(self) -> Optional[np.ndarray]:
+        if self.start is None or self.count == 0:
+            return None
+        return np.array([self.start, self.minimum, self.maximum, self.total / self.count, self.count])
+
+
+class TimeSeriesStore:
+
+    def __init__(self, directory: str, intervals=DEFAULT_ROLLUP_INTERVALS):
+        """
+        Armazenamento colunar das leituras com agregações (min/max/média) em várias resoluções.
+
+        Cada unidade tem um diretório com a série bruta (`raw.f64`: tempo, valor) e um arquivo
+        por intervalo de agregação (`rollup_<n>s.f64`: início, min, max, média, contagem), todos
+        em float64 contíguo e somente por anexação. As agregações são mantidas incrementalmente
+        conforme os dados chegam; o intervalo em aberto fica em memória e só vai para o disco
+        quando fecha (ou no `close()`). Ao abrir uma unidade, o último intervalo gravado e tudo o
+        que veio depois são recalculados a partir da série bruta, então uma queda do processo
+        não perde o intervalo em aberto (ex.: até 24 h na agregação diária).
+
+        As consultas abrem os arquivos com `np.memmap` e localizam o intervalo de tempo por busca
+        binária, então uma consulta de 24 h na resolução de 1 h lê poucos kilobytes.
+
+        Args:
+            directory (str): Diretório raiz do armazenamento.
+            intervals (Sequence[int]): Intervalos de agregação em segundos.
+        """
+        self.directory = directory
+        self.intervals = tuple(sorted(int(interval) for interval in intervals))
+        self._units = {}  # unidade -> {"raw": arquivo, "rollups": {intervalo: (arquivo, acumulador)}}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _safe_name(unit_name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", unit_name) or "_"
+
+    def _unit_directory(self, unit_name: str) -> str:
+        return os.path.join(self.directory, self._safe_name(unit_name))
+
+    def _rollup_path(self, unit_name: str, interval: int) -> str:
+        return os.path.join(self._unit_directory(unit_name), f"rollup_{interval}s.f64")
+
+    def _raw_path(self, unit_name: str) -> str:
+        return os.path.join(self._unit_directory(unit_name), "raw.f64")
+
+    @staticmethod
+    def _truncate_partial_record(path: str, record_size: int) -> int:
+        """
+        Descarta o registro incompleto no fim do arquivo (gravação interrompida por uma queda).
+
+        Sem isso, as próximas anexações ficariam desalinhadas e todas as linhas seguintes seriam
+        lidas com as colunas trocadas.
+
+        Returns:
+            int: Tamanho do arquivo após o ajuste (0 se ele não existir).
+        """
+        if not os.path.exists(path):
+            return 0
+        size = os.path.getsize(path)
+        if size % record_size:
+            size -= size % record_size
+            os.truncate(path, size)
+        return size
+
+    def __open_unit(self, unit_name: str) -> dict:
+        unit = self._units.get(unit_name)
+        if unit is not None:
+            return unit
+
+        os.makedirs(self._unit_directory(unit_name), exist_ok=True)
+        raw_path = self._raw_path(unit_name)
+        raw_rows = self._truncate_partial_record(raw_path, len(RAW_COLUMNS) * 8) // (len(RAW_COLUMNS) * 8)
+        raw = np.memmap(raw_path, dtype=np.float64, mode="r", shape=(raw_rows, len(RAW_COLUMNS))) \
+            if raw_rows else np.empty((0, len(RAW_COLUMNS)))
+
+        rollups = {}
+        for interval in self.intervals:
+            path = self._rollup_path(unit_name, interval)
+            accumulator = _RollupAccumulator(interval)
+            handle = open(path, "ab")
+
+            # O último intervalo gravado pode estar incompleto (gravado no close() e retomado) e os
+            # seguintes podem não ter sido gravados (queda): são descartados e recalculados da série bruta
+            record_size = len(ROLLUP_COLUMNS) * 8
+            size = self._truncate_partial_record(path, record_size)
+            replay_from = -np.inf
+            if size >= record_size:
+                replay_from = np.fromfile(path, dtype=np.float64, count=1, offset=size - record_size)[0]
+                os.truncate(path, size - record_size)
+
+            first = int(np.searchsorted(raw[:, 0], replay_from, side="left"))
+            for timestamp, value in raw[first:]:
+                closed = accumulator.add(float(timestamp), float(value))
+                if closed is not None:
+                    handle.write(closed.tobytes())
+            rollups[interval] = (handle, accumulator)
+        del raw
+
+        unit = {"raw": open(raw_path, "ab"), "rollups": rollups}
+        self._units[unit_name] = unit
+        return unit
+
+    def append(self, unit_name: str, timestamp: float, value: float) -> None:
+        """
+        Grava uma leitura bruta e atualiza todas as agregações da unidade.
+
+        Args:
+            unit_name (str): Nome da unidade.
+            timestamp (float): Instante da leitura (segundos desde a época, crescente).
+            value (float): Valor lido.
+        """
+        if not np.isfinite(value):
+            return
+
+        with self._lock:
+            unit = self.__open_unit(unit_name)
+            unit["raw"].write(np.array([timestamp, value], dtype=np.float64).tobytes())
+            for handle, accumulator in unit["rollups"].values():
+                closed = accumulator.add(timestamp, value)
+                if closed is not None:
+                    handle.write(closed.tobytes())
+
+    def flush(self) -> None:
+        with self._lock:
+            for unit in self._units.values():
+                unit["raw"].flush()
+                for handle, _accumulator in unit["rollups"].values():
+                    handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            for unit in self._units.values():
+                unit["raw"].close()
+                for handle, accumulator in unit["rollups"].values():
+                    record = accumulator.record()
+                    if record is not None:
+                        handle.write(record.tobytes())
+                    handle.close()
+            self._units.clear()
+
+    def units(self):
+        return sorted(name for name in os.listdir(self.directory)
+                      if os.path.isdir(os.path.join(self.directory, name)))
+
+    def __read_range(self, path: str, columns, start: float, end: float) -> np.ndarray:
+        width = len(columns)
+        if not os.path.exists(path) or os.path.getsize(path) < width * 8:
+            return np.empty((0, width))
+
+        rows = os.path.getsize(path) // (width * 8)
+        table = np.memmap(path, dtype=np.float64, mode="r", shape=(rows, width))
+        times = table[:, 0]
+        first, last = np.searchsorted(times, [start, end], side="left")
+        return np.array(table[first:last])
+
+    def query(self, unit_name: str, start: float, end: float, interval: Optional[int] = None) -> np.ndarray:
+        """
+        Lê as leituras de `[start, end)`, brutas ou agregadas.
+
+        Args:
+            unit_name (str): Nome da unidade.
+            start (float): Início do período.
+            end (float): Fim do período (exclusivo).
+            interval (int): Intervalo de agregação em segundos, ou None para a série bruta.
+        Returns:
+            np.ndarray: Linhas (time, value) para a série bruta ou (time, min, max, mean, count).
+        """
+        if interval is not None and interval not in self.intervals:
+            raise ValueError(f"Invalid rollup interval: {interval}. Expected one of {self.intervals}")
+        if interval is not None and os.path.isdir(self._unit_directory(unit_name)):
+            # Abre a unidade para recalcular da série bruta o intervalo em aberto (ex.: após uma queda)
+            with self._lock:
+                self.__open_unit(unit_name)
+
+        self.flush()
+        if interval is None:
+            return self.__read_range(self._raw_path(unit_name), RAW_COLUMNS, start, end)
+
+        rows = self.__read_range(self._rollup_path(unit_name, interval), ROLLUP_COLUMNS, start, end)
+
+        # Inclui o intervalo ainda aberto, mantido em memória
+        with self._lock:
+            unit = self._units.get(unit_name)
+            record = unit["rollups"][interval][1].record() if unit is not None else None
+        if record is not None and start <= record[0] < end:
+            rows = np.vstack([rows, record])
+        return rows
+
+    def best_interval(self, start: float, end: float, max_points: int) -> Optional[int]:
+        """
+        Menor intervalo de agregação que mantém o período com no máximo `max_points` pontos.
+
+        Returns:
+            int | None: Intervalo em segundos (o maior disponível se nenhum couber), ou None se não
+                houver intervalos configurados.
+        """
+        span = max(end - start, 0.0)
+        for interval in self.intervals:
+            if span / interval <= max_points:
+                return interval
+        return self.intervals[-1] if self.intervals else None
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Os módulos do motor importam uns aos outros a partir de engine/ (ex.: `from common import ...`)
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "engine")
+if ENGINE_DIR not in sys.path:
+    sys.path.insert(0, ENGINE_DIR)
@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from sinks import HttpSink, Reading, UploadSpool
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Mantém a conexão aberta, como o servidor real
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            status = server.statuses.pop(0) if server.statuses else 200
+            server.received.append((status, json.loads(body)))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _UploadServer(HTTPServer):
+    """Servidor local no lugar do destino das leituras: registra cada POST e responde `statuses` em ordem."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _UploadHandler)
+        self.lock = threading.Lock()
+        self.statuses = []
+        self.received = []  # (status respondido, lote recebido)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/readings"
+
+    def accepted(self):
+        with self.lock:
+            return [record for status, batch in self.received if status < 300 for record in batch]
+
+
+def _readings(first, count):
+    return [Reading("PULSE", float(index), 60.0, 120.0, index, float(index), 1, float(index), float(index),
+                    1700000000.0 + index)
+            for index in range(first, first + count)]
+
+
+class HttpSinkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _UploadServer()
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.sinks = []
+
+    def tearDown(self):
+        for sink in self.sinks:
+            sink.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def create_sink(self, **options):
+        options.setdefault("max_delay", 60.0)
+        options.setdefault("backoff", 0.01)
+        options.setdefault("max_backoff", 0.05)
+        sink = HttpSink(self.server.url, timeout=2.0, **options)
+        self.sinks.append(sink)
+        return sink
+
+    def test_batches_readings(self):
+        sink = self.create_sink(batch_size=3)
+
+        sink.handle_batch(_readings(0, 2))
+        self.assertEqual(self.server.received, [])  # Lote incompleto e dentro do max_delay
+
+        sink.handle_batch(_readings(2, 5))
+        self.assertEqual([len(batch) for _status, batch in self.server.received], [3, 3, 1])
+        self.assertEqual([record["time"] for record in self.server.accepted()], list(range(7)))
+        self.assertEqual(sink.stats()["uploaded"], 7)
+
+    def test_payload_has_absolute_timestamp(self):
+        sink = self.create_sink(batch_size=1)
+
+        sink.handle_batch(_readings(4, 1))
+        record, = self.server.accepted()
+        self.assertEqual(record, {"unit": "PULSE", "current": 4.0, "min": 60.0, "max": 120.0, "time": 4,
+                                  "mean": 4.0, "count": 1, "window_min": 4.0, "window_max": 4.0,
+                                  "timestamp": 1700000004.0})
+
+    def test_retries_on_503(self):
+        self.server.statuses = [503, 503]
+        sink = self.create_sink(batch_size=2, retries=2)
+
+        sink.handle_batch(_readings(0, 2))
+        self.assertEqual([status for status, _batch in self.server.received], [503, 503, 200])
+        self.assertEqual([record["time"] for record in self.server.accepted()], [0, 1])
+        stats = sink.stats()
+        self.assertEqual((stats["retried"], stats["uploaded"], stats["spooled"]), (2, 2, 0))
+
+    def test_spools_during_outage_and_replays_in_order(self):
+        spool_path = os.path.join(self.directory.name, "upload.jsonl")
+        self.server.statuses = [503] * 2
+        sink = self.create_sink(batch_size=2, retries=1, backoff=0.05, max_backoff=0.05, spool_path=spool_path)
+
+        sink.handle_batch(_readings(0, 2))  # Duas tentativas com 503: servidor fora do ar por 50 ms
+        sink.handle_batch(_readings(2, 2))  # Ainda dentro da espera: vai direto para o disco
+        stats = sink.stats()
+        self.assertEqual((stats["uploaded"], stats["spooled"], stats["pending"]), (0, 4, 0))
+        self.assertGreater(stats["spool_bytes"], 0)
+        self.assertEqual(len(self.server.received), 2)
+
+        time.sleep(0.2)  # Passa a espera da queda; o servidor voltou
+        sink.handle_batch(_readings(4, 2))
+        self.assertEqual([record["time"] for record in self.server.accepted()], list(range(6)))
+        stats = sink.stats()
+        self.assertEqual((stats["uploaded"], stats["spool_bytes"]), (6, 0))
+
+    def test_replays_spool_left_by_previous_run(self):
+        spool_path = os.path.join(self.directory.name, "upload.jsonl")
+        self.server.statuses = [503]
+        sink = self.create_sink(batch_size=3, retries=0, spool_path=spool_path)
+        sink.handle_batch(_readings(0, 3))
+        sink.close()  # Encerrado durante a queda: as leituras ficam no disco
+        self.sinks.remove(sink)
+        self.assertEqual(self.server.accepted(), [])
+
+        sink = self.create_sink(batch_size=3, spool_path=spool_path)
+        sink.on_idle()
+        sink.handle_batch(_readings(3, 3))
+        self.assertEqual([record["time"] for record in self.server.accepted()], list(range(6)))
+
+    def test_spool_drops_oldest_beyond_max_bytes(self):
+        spool_path = os.path.join(self.directory.name, "upload.jsonl")
+        records = [reading.to_dict() for reading in _readings(0, 10)]
+        record_size = len(json.dumps(records[0]) + "\n")
+        spool = UploadSpool(spool_path, max_bytes=4 * record_size)
+
+        spool.append(records[:3])
+        batch, offset = spool.read_batch(1)
+        spool.commit(offset)  # Uma já enviada: não conta para o limite
+        spool.append(records[3:6])
+        self.assertEqual(spool.dropped, 1)
+        self.assertLessEqual(os.path.getsize(spool_path), 4 * record_size)
+
+        batch, _offset = spool.read_batch(10)
+        self.assertEqual([record["time"] for record in batch], [2, 3, 4, 5])
+
+        sink = self.create_sink(batch_size=10, spool_path=spool_path, spool_max_bytes=4 * record_size)
+        sink.on_idle()
+        self.assertEqual([record["time"] for record in self.server.accepted()], [2, 3, 4, 5])
+        self.assertEqual(sink.stats()["spool_dropped"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
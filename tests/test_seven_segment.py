@@ -0,0 +1,115 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from ocr import SevenSegmentRecognizer
+
+DIGIT_WIDTH = 30
+DIGIT_HEIGHT = 60
+STROKE = 6
+GAP = 15  # Espaço entre os caracteres
+PADDING = 20  # Margem ao redor do texto
+
+# Retângulos (x0, x1, y0, y1) de cada segmento dentro da célula do dígito
+SEGMENTS = {
+    "a": (0, DIGIT_WIDTH, 0, STROKE),
+    "b": (DIGIT_WIDTH - STROKE, DIGIT_WIDTH, 0, DIGIT_HEIGHT // 2),
+    "c": (DIGIT_WIDTH - STROKE, DIGIT_WIDTH, DIGIT_HEIGHT // 2, DIGIT_HEIGHT),
+    "d": (0, DIGIT_WIDTH, DIGIT_HEIGHT - STROKE, DIGIT_HEIGHT),
+    "e": (0, STROKE, DIGIT_HEIGHT // 2, DIGIT_HEIGHT),
+    "f": (0, STROKE, 0, DIGIT_HEIGHT // 2),
+    "g": (0, DIGIT_WIDTH, (DIGIT_HEIGHT - STROKE) // 2, (DIGIT_HEIGHT + STROKE) // 2),
+}
+CHARACTER_SEGMENTS = {
+    "0": "abcdef",
+    "1": "bc",
+    "2": "abdeg",
+    "3": "abcdg",
+    "4": "bcfg",
+    "5": "acdfg",
+    "6": "acdefg",
+    "7": "abc",
+    "8": "abcdefg",
+    "9": "abcdfg",
+    "-": "g",
+}
+DOT = (0, STROKE, DIGIT_HEIGHT - STROKE, DIGIT_HEIGHT)
+
+
+def draw_display(text, ink=0, background=255):
+    """
+    Desenha `text` como um display de sete segmentos.
+
+    Returns:
+        Tuple[np.ndarray, list]: Imagem em tons de cinza e a bbox esperada do texto, no formato
+        do EasyOCR ([[esq, topo], [dir, topo], [dir, base], [esq, base]]).
+    """
+    slots = [STROKE if character == "." else DIGIT_WIDTH for character in text]
+    width = sum(slots) + GAP * (len(text) - 1)
+    image = np.full((DIGIT_HEIGHT + 2 * PADDING, width + 2 * PADDING), background, dtype=np.uint8)
+
+    left = right = None
+    x = PADDING
+    for character, slot in zip(text, slots):
+        rectangles = [DOT] if character == "." else [SEGMENTS[name] for name in CHARACTER_SEGMENTS[character]]
+        for x0, x1, y0, y1 in rectangles:
+            cv2.rectangle(image, (x + x0, PADDING + y0), (x + x1 - 1, PADDING + y1 - 1), ink, thickness=-1)
+            left = x + x0 if left is None else min(left, x + x0)
+            right = x + x1 if right is None else max(right, x + x1)
+        x += slot + GAP
+
+    top, bottom = PADDING, PADDING + DIGIT_HEIGHT
+    return image, [[left, top], [right, top], [right, bottom], [left, bottom]]
+
+
+class SevenSegmentRecognizerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recognizer = SevenSegmentRecognizer()
+
+    def assertReads(self, image, text, bbox):
+        results = self.recognizer.readtext(image)
+        self.assertEqual(len(results), 1)
+        result_bbox, result_text, confidence = results[0]
+        self.assertEqual(result_text, text)
+        self.assertEqual(result_bbox, bbox)
+        self.assertIsInstance(confidence, float)
+        self.assertGreater(confidence, 0.0)
+        self.assertLessEqual(confidence, 1.0)
+
+    def test_reads_each_digit(self):
+        for digit in "0123456789":
+            with self.subTest(digit=digit):
+                image, bbox = draw_display(digit)
+                self.assertReads(image, digit, bbox)
+
+    def test_reads_digit_sequence(self):
+        image, bbox = draw_display("0123456789")
+        self.assertReads(image, "0123456789", bbox)
+
+    def test_reads_sign_and_decimal_point(self):
+        for text in ("-8", "3.14", "-0.5", "12.0"):
+            with self.subTest(text=text):
+                image, bbox = draw_display(text)
+                self.assertReads(image, text, bbox)
+
+    def test_reads_light_segments_on_dark_background(self):
+        image, bbox = draw_display("-47.1", ink=255, background=0)
+        self.assertReads(image, "-47.1", bbox)
+
+    def test_reads_bgr_image(self):
+        image, bbox = draw_display("905")
+        self.assertReads(cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), "905", bbox)
+
+    def test_blank_image_has_no_text(self):
+        self.assertEqual(self.recognizer.readtext(np.full((80, 120), 255, dtype=np.uint8)), [])
+        self.assertEqual(self.recognizer.readtext(np.empty((0, 0), dtype=np.uint8)), [])
+
+    def test_discards_results_below_min_confidence(self):
+        image, _bbox = draw_display("8")
+        self.assertEqual(SevenSegmentRecognizer(min_confidence=1.01).readtext(image), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from storage import TimeSeriesStore
+
+DAY = 86400
+START = 1700006400.0  # Início de um dia (múltiplo de 86400)
+INTERVALS = (15, 3600, DAY)
+
+
+def _samples(first, count, step=10.0):
+    return [(START + (first + index) * step, float(first + index)) for index in range(count)]
+
+
+class TimeSeriesStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.directory.cleanup()
+
+    def open_store(self):
+        store = TimeSeriesStore(self.directory.name, intervals=INTERVALS)
+        self.stores.append(store)
+        return store
+
+    def crash(self, store):
+        # Queda do processo: o que foi para o disco fica, o intervalo em aberto em memória se perde
+        store.flush()
+        self.stores.remove(store)
+
+    def append_all(self, store, samples):
+        for timestamp, value in samples:
+            store.append("PULSE", timestamp, value)
+
+    def assertDailyRollup(self, store, samples):
+        rows = store.query("PULSE", START, START + DAY, interval=DAY)
+        values = [value for _timestamp, value in samples]
+        self.assertEqual(len(rows), 1)
+        start, minimum, maximum, mean, count = rows[0]
+        self.assertEqual((start, minimum, maximum, count), (START, min(values), max(values), len(values)))
+        self.assertAlmostEqual(mean, float(np.mean(values)))
+
+    def test_reopen_without_close_rebuilds_open_buckets(self):
+        samples = _samples(0, 130)
+        store = self.open_store()
+        self.append_all(store, samples)
+        self.crash(store)
+
+        store = self.open_store()
+        self.assertEqual(len(store.query("PULSE", START, START + DAY)), 130)
+        self.assertDailyRollup(store, samples)
+        hourly = store.query("PULSE", START, START + DAY, interval=3600)
+        self.assertEqual(hourly[:, 4].sum(), 130)
+
+    def test_crash_after_reopen_keeps_resumed_bucket(self):
+        first, second = _samples(0, 50), _samples(50, 80)
+        store = self.open_store()
+        self.append_all(store, first)
+        store.close()
+        self.stores.remove(store)
+
+        store = self.open_store()
+        self.append_all(store, second)  # O intervalo gravado no close() volta para memória
+        self.crash(store)
+
+        store = self.open_store()
+        self.assertDailyRollup(store, first + second)
+        rows = store.query("PULSE", START, START + DAY, interval=15)
+        self.assertEqual(rows[:, 4].sum(), 130)
+        self.assertTrue(np.all(np.diff(rows[:, 0]) > 0))  # Sem intervalos repetidos
+
+    def test_partial_raw_record_is_discarded(self):
+        store = self.open_store()
+        self.append_all(store, _samples(0, 3))
+        self.crash(store)
+        with open(os.path.join(self.directory.name, "PULSE", "raw.f64"), "ab") as raw_file:
+            raw_file.write(b"\0" * 8)  # Gravação interrompida no meio de um registro
+
+        store = self.open_store()
+        self.append_all(store, _samples(3, 2))
+        rows = store.query("PULSE", START, START + DAY)
+        np.testing.assert_array_equal(rows, np.array(_samples(0, 5)))
+
+
+if __name__ == "__main__":
+    unittest.main()